@@ -0,0 +1,199 @@
+"""Benchmark harness.
+
+Benchmarks are kept out of the default test run (see ``testpaths`` in
+pyproject.toml) and are run explicitly::
+
+    $ pytest benchmarks --benchmark-sizes=100,1000,10000 \\
+        --benchmark-json=.benchmarks/latest.json \\
+        --benchmark-baseline=.benchmarks/baseline.json
+
+Every measurement is keyed by ``name[size]``. When a baseline file is given,
+a benchmark whose median is slower than the baseline median by more than
+``--benchmark-max-regression`` fails.
+"""
+
+import json
+import platform
+import statistics
+import subprocess
+import time
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from financial_tracker.currencies.models import CrossRate
+from financial_tracker.currencies.models import Currency
+from financial_tracker.currencies.models import DailyRate
+from financial_tracker.currencies.models import ExchangeRate
+from financial_tracker.currencies.models import RateAnomaly
+from financial_tracker.currencies.models import RateStats
+from financial_tracker.income.models import EarnedIncome
+from financial_tracker.income.models import PassiveIncome
+from financial_tracker.income.models import PortfolioIncome
+from financial_tracker.users.models import User
+
+SEED = 20240101
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmark")
+    group.addoption(
+        "--benchmark-sizes",
+        default="100,1000,10000",
+        help="Comma separated income row counts to benchmark against.",
+    )
+    group.addoption("--benchmark-rounds", type=int, default=5)
+    group.addoption(
+        "--benchmark-json",
+        default=".benchmarks/latest.json",
+        help="Where to write the results.",
+    )
+    group.addoption(
+        "--benchmark-baseline",
+        default=None,
+        help="Results file to compare against.",
+    )
+    group.addoption(
+        "--benchmark-max-regression",
+        type=float,
+        default=0.25,
+        help="Allowed slowdown of the median against the baseline, as a fraction.",
+    )
+
+
+def pytest_generate_tests(metafunc):
+    if "dataset_size" in metafunc.fixturenames:
+        sizes = [
+            int(size)
+            for size in metafunc.config.getoption("--benchmark-sizes").split(",")
+        ]
+        metafunc.parametrize("dataset_size", sizes, indirect=True, scope="session")
+
+
+def pytest_configure(config):
+    config.benchmark_results = []
+
+
+def pytest_sessionfinish(session):
+    results = getattr(session.config, "benchmark_results", [])
+    if not results:
+        return
+    path = Path(session.config.getoption("--benchmark-json"))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        json.dumps(
+            {
+                "commit": git_revision(),
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "benchmarks": {result["key"]: result for result in results},
+            },
+            indent=2,
+        ),
+    )
+
+
+def git_revision():
+    try:
+        return subprocess.run(  # noqa: S603
+            ["git", "rev-parse", "HEAD"],  # noqa: S607
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def truncate_dataset():
+    tables = [
+        model._meta.db_table  # noqa: SLF001
+        for model in [
+            Currency,
+            ExchangeRate,
+            CrossRate,
+            DailyRate,
+            RateStats,
+            RateAnomaly,
+            EarnedIncome,
+            PortfolioIncome,
+            PassiveIncome,
+        ]
+    ]
+    with connection.cursor() as cursor:
+        cursor.execute(f"TRUNCATE {', '.join(tables)} RESTART IDENTITY")
+    User.objects.filter(username__startswith="seed-").delete()
+
+
+@pytest.fixture(scope="session")
+def dataset_size(request, django_db_setup, django_db_blocker):
+    """Seed ``request.param`` income rows outside the test transaction.
+
+    The data is committed so every benchmark for this size can read it, and is
+    removed again so ``--reuse-db`` does not leak it into the regular test run.
+    """
+    with django_db_blocker.unblock():
+        truncate_dataset()
+        call_command(
+            "seed_dataset",
+            seed=SEED,
+            users=20,
+            currencies=10,
+            days=30,
+            rates_per_day=2,
+            incomes=request.param,
+            workers=1,
+            stdout=StringIO(),
+        )
+    yield request.param
+    with django_db_blocker.unblock():
+        truncate_dataset()
+
+
+@pytest.fixture
+def benchmark(request):
+    """Time ``func`` and record the result; fail on a baseline regression."""
+    config = request.config
+    baseline_path = config.getoption("--benchmark-baseline")
+    baseline = {}
+    if baseline_path and Path(baseline_path).exists():
+        baseline = json.loads(Path(baseline_path).read_text())["benchmarks"]
+
+    def run(name, func, *, size=None, warmup=1):
+        for _ in range(warmup):
+            func()
+        timings = []
+        for _ in range(config.getoption("--benchmark-rounds")):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+
+        key = f"{name}[{size}]" if size is not None else name
+        result = {
+            "key": key,
+            "name": name,
+            "size": size,
+            "rounds": len(timings),
+            "min": min(timings),
+            "median": statistics.median(timings),
+            "mean": statistics.fmean(timings),
+            "max": max(timings),
+        }
+        config.benchmark_results.append(result)
+
+        reference = baseline.get(key)
+        if reference:
+            allowed = reference["median"] * (
+                1 + config.getoption("--benchmark-max-regression")
+            )
+            if result["median"] > allowed:
+                pytest.fail(
+                    f"{key} regressed: median {result['median'] * 1000:.2f}ms, "
+                    f"baseline {reference['median'] * 1000:.2f}ms",
+                )
+        return result
+
+    return run
@@ -0,0 +1,248 @@
+from datetime import date
+from datetime import timedelta
+from decimal import Decimal
+from io import BytesIO
+
+import pytest
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from financial_tracker.core.api.parsers import ORJSONParser
+from financial_tracker.core.api.renderers import ORJSONRenderer
+from financial_tracker.currencies.conversion import convert_batch
+from financial_tracker.currencies.models import Currency
+from financial_tracker.currencies.models import ExchangeRate
+from financial_tracker.currencies.reference_rates import RateLoader
+from financial_tracker.currencies.reference_rates import parse_ecb_xml
+from financial_tracker.income.api.serializers import EarnedIncomeSerializer
+from financial_tracker.income.api.serializers import PassiveIncomeSerializer
+from financial_tracker.income.api.serializers import PortfolioIncomeSerializer
+from financial_tracker.income.models import EarnedIncome
+from financial_tracker.users.models import User
+
+LIST_ENDPOINTS = [
+    "api:currencies:currency-list",
+    "api:currencies:exchangerate-list",
+    "api:income:earnedincome-list",
+    "api:income:portfolioincome-list",
+    "api:income:passiveincome-list",
+]
+
+INCOME_SERIALIZERS = [
+    EarnedIncomeSerializer,
+    PortfolioIncomeSerializer,
+    PassiveIncomeSerializer,
+]
+
+
+@pytest.fixture
+def api_client(db):
+    client = APIClient()
+    client.force_authenticate(
+        user=User.objects.filter(username__startswith="seed-").first(),
+    )
+    return client
+
+
+@pytest.fixture
+def income_list(db, dataset_size):
+    """Every seeded income row, serialized as the list endpoints hand them to a
+    renderer."""
+    rows: list = []
+    for serializer_class in INCOME_SERIALIZERS:
+        rows += serializer_class(
+            serializer_class.Meta.model.objects.all(),
+            many=True,
+        ).data
+    return rows
+
+
+@pytest.fixture
+def foreign_currency(db):
+    """A foreign currency with exactly one exchange rate to convert with."""
+    user = User.objects.filter(username__startswith="seed-").earliest("pk")
+    currency = Currency.objects.create(
+        code="XBM",
+        description="Benchmark currency",
+        is_local=False,
+        created_by=user,
+    )
+    ExchangeRate.objects.create(
+        currency=currency,
+        rate=Decimal("12.34"),
+        created_by=user,
+    )
+    return currency
+
+
+def test_convert_to_lcy(benchmark, dataset_size, foreign_currency):
+    income = EarnedIncome()
+
+    def convert():
+        for _ in range(100):
+            income.convert_to_lcy(Decimal("1234.56"), foreign_currency)
+
+    benchmark("convert_to_lcy x100", convert, size=dataset_size)
+
+
+def test_convert_batch(benchmark, db, dataset_size):
+    """100k amounts over every seeded currency and a spread of as-of dates."""
+    codes = list(Currency.objects.values_list("code", flat=True))
+    days = sorted(
+        {
+            created_at.date()
+            for created_at in ExchangeRate.objects.values_list("created_at", flat=True)
+        },
+    )
+    items = [
+        (Decimal(1234), codes[i % len(codes)], days[-1 - i % (len(days) - 1)])
+        for i in range(100_000)
+    ]
+
+    benchmark("convert_batch x100000", lambda: convert_batch(items), size=dataset_size)
+
+
+def test_load_reference_rates(benchmark, db, dataset_size):
+    """20 years of ECB-style daily rates for every seeded currency; rounds
+    after the first find every rate unchanged."""
+    codes = list(Currency.objects.values_list("code", flat=True))
+    user = (
+        User.objects.filter(username__startswith="seed-")
+        .values_list("pk", flat=True)
+        .first()
+    )
+    days = []
+    for offset in range(20 * 365):
+        rates = [
+            1 + (offset * 7 + index * 13) % 997 / 10 for index in range(len(codes))
+        ]
+        cubes = "".join(
+            f'<Cube currency="{code}" rate="{rate}"/>'
+            for code, rate in zip(codes, rates, strict=True)
+        )
+        days.append(
+            f'<Cube time="{date(2005, 1, 3) + timedelta(days=offset)}">{cubes}</Cube>',
+        )
+    xml = (
+        '<Envelope xmlns="http://www.ecb.int/vocabulary/2002-08-01/eurofxref"><Cube>'
+        f"{''.join(days)}</Cube></Envelope>"
+    ).encode()
+
+    benchmark(
+        f"RateLoader.load {len(days)} days",
+        lambda: RateLoader(user, base=codes[0]).load(parse_ecb_xml(BytesIO(xml))),
+        size=dataset_size,
+    )
+
+
+def test_base_income_save(benchmark, dataset_size, foreign_currency):
+    user = foreign_currency.created_by
+
+    def save():
+        for _ in range(20):
+            EarnedIncome(  # type: ignore[misc]
+                income_name="Benchmark",
+                currency=foreign_currency,
+                amount=Decimal(100),
+                created_by=user,
+            ).save()
+
+    benchmark("BaseIncome.save x20", save, size=dataset_size)
+
+
+@pytest.mark.parametrize("url_name", LIST_ENDPOINTS)
+def test_list_endpoint(benchmark, dataset_size, api_client, url_name):
+    url = reverse(url_name)
+
+    def fetch():
+        response = api_client.get(url)
+        assert response.status_code == 200  # noqa: PLR2004
+
+    # Uncached: the query and serialization cost, as in the earlier baselines.
+    with override_settings(RESPONSE_CACHE_TIMEOUT=0):
+        benchmark(url_name, fetch, size=dataset_size)
+
+
+@pytest.mark.parametrize("url_name", LIST_ENDPOINTS)
+def test_list_endpoint_cached(benchmark, dataset_size, api_client, url_name):
+    url = reverse(url_name)
+    api_client.get(url)
+
+    benchmark(f"{url_name} cached", lambda: api_client.get(url), size=dataset_size)
+
+
+@pytest.mark.parametrize("url_name", LIST_ENDPOINTS)
+def test_list_endpoint_not_modified(benchmark, dataset_size, api_client, url_name):
+    url = reverse(url_name)
+
+    def revalidate():
+        response = api_client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 304  # noqa: PLR2004
+
+    with override_settings(RESPONSE_CACHE_TIMEOUT=0):
+        etag = api_client.get(url)["ETag"]
+        benchmark(f"{url_name} revalidate", revalidate, size=dataset_size)
+
+
+def test_total_income(benchmark, dataset_size, api_client):
+    url = reverse("api:income:totalincome")
+    with override_settings(RESPONSE_CACHE_TIMEOUT=0):
+        benchmark(
+            "api:income:totalincome",
+            lambda: api_client.get(url),
+            size=dataset_size,
+        )
+
+
+def test_get_local_currency(benchmark, dataset_size, api_client):
+    url = reverse("api:currencies:get-localcurrency")
+    benchmark(
+        "api:currencies:get-localcurrency",
+        lambda: api_client.get(url),
+        size=dataset_size,
+    )
+
+
+def test_cross_rates(benchmark, dataset_size, api_client):
+    url = reverse("api:currencies:crossrates")
+    with override_settings(RESPONSE_CACHE_TIMEOUT=0):
+        benchmark(
+            "api:currencies:crossrates",
+            lambda: api_client.get(url),
+            size=dataset_size,
+        )
+
+
+def test_rate_series(benchmark, dataset_size, api_client):
+    code = ExchangeRate.objects.values_list("currency", flat=True).first()
+    url = reverse("api:currencies:exchangerate-series", kwargs={"code": code})
+    with override_settings(RESPONSE_CACHE_TIMEOUT=0):
+        benchmark(
+            "api:currencies:exchangerate-series",
+            lambda: api_client.get(url),
+            size=dataset_size,
+        )
+
+
+@pytest.mark.parametrize("renderer_class", [JSONRenderer, ORJSONRenderer])
+def test_render_income_list(benchmark, dataset_size, income_list, renderer_class):
+    renderer = renderer_class()
+    benchmark(
+        f"{renderer_class.__name__}.render",
+        lambda: renderer.render(income_list),
+        size=dataset_size,
+    )
+
+
+@pytest.mark.parametrize("parser_class", [JSONParser, ORJSONParser])
+def test_parse_income_list(benchmark, dataset_size, income_list, parser_class):
+    body = JSONRenderer().render(income_list)
+    parser = parser_class()
+    benchmark(
+        f"{parser_class.__name__}.parse",
+        lambda: parser.parse(BytesIO(body)),
+        size=dataset_size,
+    )
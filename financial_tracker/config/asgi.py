@@ -0,0 +1,33 @@
+"""
+ASGI config for Financial Tracker project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+Run it with gunicorn's uvicorn worker, as the ``Procfile`` does:
+
+    gunicorn config.asgi:application -k uvicorn_worker.UvicornWorker
+
+Read endpoints built on ``financial_tracker.core.api.views`` run natively on the
+event loop there; sync views keep working and are run in a thread per request.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/dev/howto/deployment/asgi/
+
+"""
+
+import os
+import sys
+from pathlib import Path
+
+from django.core.asgi import get_asgi_application
+
+# This allows easy placement of apps within the interior
+# financial_tracker directory.
+BASE_DIR = Path(__file__).resolve(strict=True).parent.parent
+sys.path.append(str(BASE_DIR / "financial_tracker"))
+# We defer to a DJANGO_SETTINGS_MODULE already in the environment.
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.production")
+# Settings that differ under ASGI, such as CONN_MAX_AGE, look for this.
+os.environ.setdefault("DJANGO_ASGI", "True")
+
+# This application object is used by any ASGI server configured to use this file.
+application = get_asgi_application()
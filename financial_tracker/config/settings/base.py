@@ -88,6 +88,7 @@ THIRD_PARTY_APPS = [
 LOCAL_APPS = [
     "financial_tracker.users",
     # Your stuff: custom apps go here
+    "financial_tracker.core",
     "financial_tracker.currencies",
     "financial_tracker.income",
 ]
@@ -137,9 +138,11 @@ AUTH_PASSWORD_VALIDATORS = [
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#middleware
 MIDDLEWARE = [
+    "financial_tracker.core.middleware.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "financial_tracker.core.middleware.CompressionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "financial_tracker.core.middleware.AsyncWhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.locale.LocaleMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -148,6 +151,7 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "allauth.account.middleware.AccountMiddleware",
+    "financial_tracker.core.middleware.ProfilingMiddleware",
 ]
 
 # STATIC
@@ -296,6 +300,15 @@ REST_FRAMEWORK = {
         "rest_framework.authentication.TokenAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
+    "DEFAULT_RENDERER_CLASSES": (
+        "financial_tracker.core.api.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "financial_tracker.core.api.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
 
@@ -313,3 +326,95 @@ SPECTACULAR_SETTINGS = {
 }
 # Your stuff...
 # ------------------------------------------------------------------------------
+# Metrics
+# Set PROMETHEUS_MULTIPROC_DIR in the environment to aggregate across workers.
+# /internal/metrics requires "Authorization: Bearer <token>"; with no token it
+# is only served when DEBUG is on.
+METRICS_AUTH_TOKEN = env("DJANGO_METRICS_AUTH_TOKEN", default="")
+# Profiling
+# Staff requests with ?profile=1 or "X-Profile: 1" are sampled and stored in the cache.
+PROFILING_SAMPLE_INTERVAL = env.float("DJANGO_PROFILING_SAMPLE_INTERVAL", default=0.005)
+PROFILING_CACHE_TIMEOUT = env.int("DJANGO_PROFILING_CACHE_TIMEOUT", default=60 * 60)
+# Slow queries
+# Statements slower than the threshold are aggregated in memory and added to
+# SlowQuery rows every SLOW_QUERY_FLUSH_INTERVAL seconds by a background
+# thread (0: only when flushed explicitly); a threshold of 0 disables capture.
+# The flush EXPLAINs a sample of them and keeps the plan, for
+# slow_queries --explain.
+SLOW_QUERY_THRESHOLD_MS = env.float("DJANGO_SLOW_QUERY_THRESHOLD_MS", default=200)
+SLOW_QUERY_EXPLAIN_SAMPLE_RATE = env.float("DJANGO_SLOW_QUERY_EXPLAIN_SAMPLE_RATE", default=0.1)
+SLOW_QUERY_FLUSH_INTERVAL = env.float("DJANGO_SLOW_QUERY_FLUSH_INTERVAL", default=10.0)
+# API schema
+# Release identifier, e.g. the commit SHA. Rendered OpenAPI schemas are shared
+# through the cache under it; when empty each process renders its own.
+CODE_VERSION = env("DJANGO_CODE_VERSION", default=env("HEROKU_SLUG_COMMIT", default=""))
+# Response compression
+# Responses under these prefixes of at least COMPRESSION_MIN_SIZE bytes are
+# compressed with the encoding the client prefers; ties go to the order below.
+COMPRESSION_PATH_PREFIXES = ["/api/"]
+COMPRESSION_MIN_SIZE = env.int("DJANGO_COMPRESSION_MIN_SIZE", default=1024)
+COMPRESSION_ENCODINGS = ["zstd", "br", "gzip"]
+# Under ASGI, bodies of at least this many bytes are compressed in a thread so
+# they do not hold up the event loop.
+COMPRESSION_OFFLOAD_SIZE = env.int("DJANGO_COMPRESSION_OFFLOAD_SIZE", default=64 * 1024)
+# Level per encoding by media type; "*" covers the rest.
+COMPRESSION_LEVELS = {
+    "*": {"zstd": 3, "br": 4, "gzip": 6},
+    # Large income and rate lists: gzip 5 is ~30% cheaper than 6 for ~3% more bytes.
+    "application/json": {"zstd": 3, "br": 4, "gzip": 5},
+}
+# Response cache
+# Seconds a cached list or report response lives; writes invalidate it sooner
+# through per-model version counters. 0 turns the cache off.
+RESPONSE_CACHE_TIMEOUT = env.int("DJANGO_RESPONSE_CACHE_TIMEOUT", default=60 * 60)
+# On a miss one request computes the response while holding a lock for at most
+# RESPONSE_CACHE_LOCK_TIMEOUT seconds. Concurrent requests get the previous
+# response if there is one, or wait up to RESPONSE_CACHE_WAIT seconds for the
+# new one before computing it themselves.
+RESPONSE_CACHE_LOCK_TIMEOUT = env.int("DJANGO_RESPONSE_CACHE_LOCK_TIMEOUT", default=30)
+RESPONSE_CACHE_WAIT = env.float("DJANGO_RESPONSE_CACHE_WAIT", default=5.0)
+# Batch currency conversion
+# Items accepted by one POST to /api/currencies/convert/batch/.
+CONVERSION_BATCH_MAX_ITEMS = env.int("DJANGO_CONVERSION_BATCH_MAX_ITEMS", default=100_000)
+# Exchange-rate triangulation
+# A currency with no rate against the local currency is converted through
+# others, over at most TRIANGULATION_MAX_HOPS rates; among equally short
+# paths, those through the preferred currencies win.
+TRIANGULATION_PREFERRED_CURRENCIES = env.list("DJANGO_TRIANGULATION_PREFERRED_CURRENCIES", default=["USD", "EUR"])
+TRIANGULATION_MAX_HOPS = env.int("DJANGO_TRIANGULATION_MAX_HOPS", default=3)
+# Exchange-rate retention
+# Days of exchange-rate ticks kept at full resolution; compact_rates collapses
+# older ones into daily rows.
+RATE_RETENTION_DAYS = env.int("DJANGO_RATE_RETENTION_DAYS", default=90)
+# Ticks of one currency compacted, and deleted, per transaction.
+RATE_COMPACTION_BATCH_SIZE = env.int("DJANGO_RATE_COMPACTION_BATCH_SIZE", default=10000)
+# Exchange-rate ingestion
+# Ticks posted to /api/currencies/exchangerates/ingest/ wait in a buffer,
+# "redis" (a stream shared by all processes, flushed by flush_rates) or
+# "local" (in the process, which flushes it itself), for at most about
+# RATE_INGEST_FLUSH_INTERVAL seconds. A flush writes up to
+# RATE_INGEST_BATCH_SIZE ticks, keeping the last per currency per
+# RATE_INGEST_COALESCE_SECONDS. Beyond RATE_INGEST_MAX_PENDING buffered ticks
+# posts are refused with a 503.
+RATE_INGEST_BUFFER = env("DJANGO_RATE_INGEST_BUFFER", default="local")
+RATE_INGEST_FLUSH_INTERVAL = env.float("DJANGO_RATE_INGEST_FLUSH_INTERVAL", default=1.0)
+RATE_INGEST_BATCH_SIZE = env.int("DJANGO_RATE_INGEST_BATCH_SIZE", default=10_000)
+RATE_INGEST_COALESCE_SECONDS = env.int("DJANGO_RATE_INGEST_COALESCE_SECONDS", default=10)
+RATE_INGEST_MAX_PENDING = env.int("DJANGO_RATE_INGEST_MAX_PENDING", default=100_000)
+# Reference-rate files
+# load_rates --watch polls REFERENCE_RATES_DROP_FOLDER every
+# REFERENCE_RATES_POLL_INTERVAL seconds for ECB XML or CSV files to load.
+REFERENCE_RATES_DROP_FOLDER = env("DJANGO_REFERENCE_RATES_DROP_FOLDER", default="")
+REFERENCE_RATES_POLL_INTERVAL = env.float("DJANGO_REFERENCE_RATES_POLL_INTERVAL", default=60.0)
+# Exchange-rate anomalies
+# Ingested rates more than RATE_ANOMALY_Z_THRESHOLD deviations from their
+# currency's exponentially weighted mean log rate (weight RATE_ANOMALY_ALPHA
+# per tick, deviation at least RATE_ANOMALY_MIN_STDDEV) go to the admin review
+# queue once RATE_ANOMALY_MIN_OBSERVATIONS rates have been seen.
+# RATE_ANOMALY_ACTION: "quarantine" holds them back until accepted, "flag"
+# writes them anyway and "off" skips the check.
+RATE_ANOMALY_ACTION = env("DJANGO_RATE_ANOMALY_ACTION", default="quarantine")
+RATE_ANOMALY_Z_THRESHOLD = env.float("DJANGO_RATE_ANOMALY_Z_THRESHOLD", default=6.0)
+RATE_ANOMALY_ALPHA = env.float("DJANGO_RATE_ANOMALY_ALPHA", default=0.05)
+RATE_ANOMALY_MIN_STDDEV = env.float("DJANGO_RATE_ANOMALY_MIN_STDDEV", default=0.01)
+RATE_ANOMALY_MIN_OBSERVATIONS = env.int("DJANGO_RATE_ANOMALY_MIN_OBSERVATIONS", default=10)
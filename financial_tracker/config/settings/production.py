@@ -15,7 +15,14 @@ ALLOWED_HOSTS = env.list("DJANGO_ALLOWED_HOSTS", default=["example.com"])
 
 # DATABASES
 # ------------------------------------------------------------------------------
-DATABASES["default"]["CONN_MAX_AGE"] = env.int("CONN_MAX_AGE", default=60)
+# Under ASGI (config.asgi, which sets DJANGO_ASGI) the ORM runs on per-request
+# executor threads, so persistent connections are not reused and only pile up;
+# keep them off there. WSGI workers and management commands keep theirs.
+# https://docs.djangoproject.com/en/dev/ref/databases/#persistent-connections
+DATABASES["default"]["CONN_MAX_AGE"] = env.int(
+    "CONN_MAX_AGE",
+    default=0 if env.bool("DJANGO_ASGI", default=False) else 60,
+)
 
 # CACHES
 # ------------------------------------------------------------------------------
@@ -31,6 +38,14 @@ CACHES = {
         },
     },
 }
+# Buffer rate ticks where every process and flush_rates can reach them.
+RATE_INGEST_BUFFER = env("DJANGO_RATE_INGEST_BUFFER", default="redis")
+
+# METRICS
+# ------------------------------------------------------------------------------
+# /internal/metrics exposes per-view latency, query counts and cache internals:
+# without a token, DEBUG being off, it answers 403 to everyone.
+METRICS_AUTH_TOKEN = env("DJANGO_METRICS_AUTH_TOKEN", default="")
 
 # SECURITY
 # ------------------------------------------------------------------------------
@@ -103,7 +118,7 @@ INSTALLED_APPS += ["anymail"]
 # https://anymail.readthedocs.io/en/stable/installation/#anymail-settings-reference
 # https://anymail.readthedocs.io/en/stable/esps
 EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
-ANYMAIL = {}
+ANYMAIL: dict[str, str] = {}
 
 
 # LOGGING
@@ -6,10 +6,12 @@ from django.urls import include
 from django.urls import path
 from django.views import defaults as default_views
 from django.views.generic import TemplateView
-from drf_spectacular.views import SpectacularAPIView
-from drf_spectacular.views import SpectacularSwaggerView
 from rest_framework.authtoken.views import obtain_auth_token
 
+from financial_tracker.core.views import lazy_view
+from financial_tracker.core.views import metrics_view
+from financial_tracker.core.views import profile_view
+
 urlpatterns = [
     path("", TemplateView.as_view(template_name="pages/home.html"), name="home"),
     path(
@@ -23,7 +25,8 @@ urlpatterns = [
     path("users/", include("financial_tracker.users.urls", namespace="users")),
     path("accounts/", include("allauth.urls")),
     # Your stuff: custom urls includes go here
-    # ...
+    path("internal/metrics", metrics_view, name="metrics"),
+    path("internal/profiles/<str:profile_id>/", profile_view, name="profile"),
     # Media files
     *static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT),
 ]
@@ -34,10 +37,14 @@ urlpatterns += [
     path("api/", include("config.api_router")),
     # DRF auth token
     path("api/auth-token/", obtain_auth_token),
-    path("api/schema/", SpectacularAPIView.as_view(), name="api-schema"),
+    path(
+        "api/schema/",
+        lazy_view("financial_tracker.core.api.schema.SchemaView"),
+        name="api-schema",
+    ),
     path(
         "api/docs/",
-        SpectacularSwaggerView.as_view(url_name="api-schema"),
+        lazy_view("drf_spectacular.views.SpectacularSwaggerView", url_name="api-schema"),
         name="api-docs",
     ),
 ]
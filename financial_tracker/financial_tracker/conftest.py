@@ -1,4 +1,5 @@
 import pytest
+from django.core.cache import cache
 
 from financial_tracker.users.models import User
 from financial_tracker.users.tests.factories import UserFactory
@@ -9,6 +10,13 @@ def _media_storage(settings, tmpdir) -> None:
     settings.MEDIA_ROOT = tmpdir.strpath
 
 
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    # Cache invalidation runs on commit, which never happens inside a test.
+    yield
+    cache.clear()
+
+
 @pytest.fixture
 def user(db) -> User:
     return UserFactory()
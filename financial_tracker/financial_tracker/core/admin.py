@@ -0,0 +1,30 @@
+from django.contrib import admin
+
+from .models import SlowQuery
+
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    list_display = [
+        "fingerprint",
+        "database",
+        "calls",
+        "mean_duration_ms",
+        "max_duration_ms",
+        "total_duration_ms",
+        "has_plan",
+        "last_seen",
+    ]
+    list_filter = ["database"]
+    search_fields = ["normalized_sql", "fingerprint"]
+    ordering = ["-total_duration_ms"]
+
+    @admin.display(boolean=True, description="Plan")
+    def has_plan(self, obj):
+        return bool(obj.explain_plan)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,32 @@
+import orjson
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+from .renderers import ORJSONRenderer
+
+
+class ORJSONParser(JSONParser):
+    """``JSONParser`` decoding with orjson.
+
+    orjson rejects ``NaN`` and ``Infinity`` like the strict stdlib parser, so a
+    non-strict ``STRICT_JSON`` setting falls back to the stdlib.
+    """
+
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if not self.strict:
+            return super().parse(stream, media_type, parser_context)
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+
+        try:
+            body = stream.read()
+            # orjson reads UTF-8 bytes; anything else is decoded first.
+            if encoding.lower().replace("_", "-") not in ("utf-8", "utf8"):
+                body = body.decode(encoding)
+            return orjson.loads(body)
+        except ValueError as exc:
+            msg = f"JSON parse error - {exc}"
+            raise ParseError(msg) from exc
@@ -0,0 +1,41 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+
+# DRF's encoder formats datetimes differently from orjson; let it handle them,
+# along with Decimal, lazy strings and the other types orjson doesn't know.
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+class ORJSONRenderer(JSONRenderer):
+    """``JSONRenderer`` producing the same bytes through orjson.
+
+    orjson only writes compact, unescaped UTF-8, so indented output (the
+    browsable API, ``Accept: application/json; indent=4``) and the non-default
+    ``UNICODE_JSON``/``COMPACT_JSON``/``STRICT_JSON`` settings go through the
+    stdlib encoder as before.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if (
+            indent is not None
+            or self.ensure_ascii
+            or not self.compact
+            or not self.strict
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(
+            data,
+            default=self.encoder_class().default,
+            option=ORJSON_OPTIONS,
+        )
+        # Keep the output a strict JavaScript subset, like JSONRenderer.
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+                b"\xe2\x80\xa9",
+                b"\\u2029",
+            )
+        return ret
@@ -0,0 +1,118 @@
+"""The OpenAPI schema, generated once per code version.
+
+Generating the schema introspects every view and serializer, which takes
+hundreds of milliseconds and grows with the API. Rendered documents are kept in
+process memory and, when ``CODE_VERSION`` is set, in the cache so that other
+processes of the same release reuse them. Without a version, a cached document
+could outlive the code it describes, so each process generates its own.
+
+This module imports drf-spectacular's generator; keep it out of the URLconf's
+import path (see ``lazy_view``).
+"""
+
+import hashlib
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.cache import patch_cache_control
+from drf_spectacular.generators import SchemaGenerator
+from drf_spectacular.renderers import OpenApiJsonRenderer
+from drf_spectacular.renderers import OpenApiYamlRenderer
+from drf_spectacular.views import SpectacularAPIView
+
+from financial_tracker.core.metrics import record_cache_lookup
+
+SCHEMA_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+RENDERERS = {
+    renderer.format: renderer for renderer in (OpenApiYamlRenderer, OpenApiJsonRenderer)
+}
+
+_documents = {}
+
+
+@dataclass(frozen=True)
+class SchemaDocument:
+    content: bytes
+    etag: str
+
+    @classmethod
+    def from_content(cls, content):
+        return cls(content, f'"{hashlib.sha256(content).hexdigest()[:32]}"')
+
+
+def render_schema_documents():
+    """Generate the public schema and render it in every format, by format."""
+    schema = SchemaGenerator().get_schema(request=None, public=True)
+    documents = {}
+    for schema_format, renderer_class in RENDERERS.items():
+        renderer = renderer_class()
+        content = renderer.render(schema, renderer.media_type, {})
+        documents[schema_format] = SchemaDocument.from_content(content)
+    return documents
+
+
+def prime_schema_documents():
+    """Render the schema into process memory only, e.g. before forking workers."""
+    for schema_format, document in render_schema_documents().items():
+        _documents[settings.CODE_VERSION, schema_format] = document
+
+
+def get_schema_document(schema_format):
+    document = _documents.get((settings.CODE_VERSION, schema_format))
+    if document is not None:
+        return document
+
+    if settings.CODE_VERSION:
+        content = cache.get(schema_cache_key(schema_format))
+        record_cache_lookup("api_schema", hit=content is not None)
+        if content is not None:
+            document = SchemaDocument.from_content(content)
+            _documents[settings.CODE_VERSION, schema_format] = document
+            return document
+
+    documents = render_schema_documents()
+    for other_format, other_document in documents.items():
+        _documents[settings.CODE_VERSION, other_format] = other_document
+    if settings.CODE_VERSION:
+        contents = {
+            schema_cache_key(other_format): rendered.content
+            for other_format, rendered in documents.items()
+        }
+        cache.set_many(contents, SCHEMA_CACHE_TIMEOUT)
+    return documents[schema_format]
+
+
+def schema_cache_key(schema_format):
+    return f"api-schema:{settings.CODE_VERSION}:{schema_format}"
+
+
+class SchemaView(SpectacularAPIView):
+    """``SpectacularAPIView`` serving the pre-rendered schema with an ETag.
+
+    Requests for another language or API version fall back to generating the
+    schema on every request, as the parent view does.
+    """
+
+    def _get_schema_response(self, request):
+        version = (
+            self.api_version or request.version or self._get_version_parameter(request)
+        )
+        if version or request.GET.get("lang") or self.urlconf or self.patterns:
+            return super()._get_schema_response(request)
+
+        renderer = request.accepted_renderer
+        document = get_schema_document(renderer.format)
+        content_type = request.accepted_media_type
+        if renderer.charset:
+            content_type = f"{content_type}; charset={renderer.charset}"
+        response = HttpResponse(document.content, content_type=content_type)
+        response["ETag"] = document.etag
+        response["Content-Disposition"] = (
+            f'inline; filename="{self._get_filename(request, version)}"'
+        )
+        # Clients revalidate every time; an unchanged schema costs a 304.
+        patch_cache_control(response, private=True, no_cache=True)
+        return get_conditional_response(request, etag=document.etag, response=response)
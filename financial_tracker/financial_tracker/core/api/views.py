@@ -0,0 +1,178 @@
+import hashlib
+from operator import attrgetter
+from typing import TYPE_CHECKING
+
+from adrf.views import APIView
+from adrf.viewsets import GenericViewSet
+from django.db import transaction
+from django.db.models import Aggregate
+from django.db.models import Count
+from django.db.models import Max
+from django.utils.cache import get_conditional_response
+from django.utils.cache import patch_cache_control
+from django.utils.decorators import classonlymethod
+from django.utils.http import http_date
+from rest_framework.mixins import CreateModelMixin
+from rest_framework.mixins import DestroyModelMixin
+from rest_framework.mixins import UpdateModelMixin
+from rest_framework.response import Response
+
+if TYPE_CHECKING:
+    from rest_framework.viewsets import ReadOnlyModelViewSet as ViewSetBase
+else:
+    ViewSetBase = object
+
+
+class AsyncAPIView(APIView):
+    """An ``APIView`` whose handlers are coroutines.
+
+    Django refuses to run async views inside ``ATOMIC_REQUESTS``, so these opt
+    out of it; use them for reads.
+    """
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        return transaction.non_atomic_requests(super().as_view(**initkwargs))
+
+
+class ConditionalGetMixin(ViewSetBase):
+    """Answer ``list`` and ``retrieve`` requests for unchanged data with a 304.
+
+    A list's ETag hashes the row count and the latest of each of
+    ``modified_fields`` over the filtered queryset, so revalidating costs one
+    aggregate query and serializes nothing. Lists get no ``Last-Modified``, since
+    deleting a row can leave the latest ``modified_at`` unchanged. A detail
+    response is validated by the instance's own ``modified_fields``.
+
+    Include related fields the serializer shows, e.g. ``currency__modified_at``.
+    Changes that skip ``auto_now``, like ``QuerySet.update()``, go unnoticed.
+    """
+
+    modified_fields: tuple[str, ...] = ("modified_at",)
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        etag = self.list_etag(queryset.order_by().aggregate(**self.list_aggregates()))
+        return self.not_modified(request, etag) or self.validated(
+            super().list(request, *args, **kwargs),
+            etag,
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        etag, last_modified = self.instance_validators(instance)
+        return self.not_modified(request, etag, last_modified) or self.validated(
+            Response(self.get_serializer(instance).data),
+            etag,
+            last_modified,
+        )
+
+    def list_aggregates(self):
+        aggregates: dict[str, Aggregate] = {"count": Count("pk")}
+        for index, field in enumerate(self.modified_fields):
+            aggregates[f"modified_{index}"] = Max(field)
+        return aggregates
+
+    def list_etag(self, aggregates):
+        return self.make_etag(
+            self.request.META.get("QUERY_STRING", ""),
+            *aggregates.values(),
+        )
+
+    def instance_validators(self, instance):
+        modified = [
+            attrgetter(field.replace("__", "."))(instance)
+            for field in self.modified_fields
+        ]
+        return self.make_etag(instance.pk, *modified), int(max(modified).timestamp())
+
+    def make_etag(self, *parts):
+        # Browsable API and JSON representations of the same rows differ.
+        parts = (
+            self.get_queryset().model._meta.label,  # noqa: SLF001
+            self.request.accepted_media_type,
+            *parts,
+        )
+        return f'"{hashlib.sha256(repr(parts).encode()).hexdigest()[:32]}"'
+
+    def not_modified(self, request, etag, last_modified=None):
+        response = get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=last_modified,
+        )
+        if response is not None:
+            response["ETag"] = etag
+        return response
+
+    def validated(self, response, etag, last_modified=None):
+        response["ETag"] = etag
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified)
+        # Clients revalidate every time rather than guess at freshness.
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+class AsyncReadModelViewSet(
+    ConditionalGetMixin,
+    CreateModelMixin,
+    UpdateModelMixin,
+    DestroyModelMixin,
+    GenericViewSet,
+):
+    """A model viewset with native async, conditional ``list`` and ``retrieve``.
+
+    Reads use the async ORM and serialize on the event loop, so ``get_queryset``
+    must ``select_related`` everything the serializer touches; a lazy query
+    raises ``SynchronousOnlyOperation``. Writes stay sync: adrf runs them in a
+    thread and each gets its own transaction in place of ``ATOMIC_REQUESTS``.
+    Sync ``@action`` methods must open theirs with ``transaction.atomic``.
+    """
+
+    @classonlymethod
+    def as_view(cls, actions=None, **initkwargs):  # noqa: N805
+        return transaction.non_atomic_requests(super().as_view(actions, **initkwargs))
+
+    async def list(self, request, *args, **kwargs):
+        queryset = await self.afilter_queryset(self.get_queryset())
+        etag = self.list_etag(
+            await queryset.order_by().aaggregate(**self.list_aggregates()),
+        )
+        if not_modified := self.not_modified(request, etag):
+            return not_modified
+        page = await self.apaginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.validated(
+                await self.get_apaginated_response(serializer.data),
+                etag,
+            )
+        serializer = self.get_serializer(
+            [instance async for instance in queryset],
+            many=True,
+        )
+        return self.validated(Response(serializer.data), etag)
+
+    async def retrieve(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        etag, last_modified = self.instance_validators(instance)
+        if not_modified := self.not_modified(request, etag, last_modified):
+            return not_modified
+        return self.validated(
+            Response(self.get_serializer(instance).data),
+            etag,
+            last_modified,
+        )
+
+    def create(self, request, *args, **kwargs):
+        with transaction.atomic():
+            return super().create(request, *args, **kwargs)
+
+    def update(self, request, *args, **kwargs):
+        with transaction.atomic():
+            return super().update(request, *args, **kwargs)
+
+    def destroy(self, request, *args, **kwargs):
+        with transaction.atomic():
+            return super().destroy(request, *args, **kwargs)
@@ -0,0 +1,18 @@
+from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+from django.utils.translation import gettext_lazy as _
+
+
+class CoreConfig(AppConfig):
+    name = "financial_tracker.core"
+    verbose_name = _("Core")
+
+    def ready(self):
+        from .db import install_query_observers
+        from .slow_queries import install_recorder
+
+        connection_created.connect(
+            install_query_observers,
+            dispatch_uid="core.query_observers",
+        )
+        connection_created.connect(install_recorder, dispatch_uid="core.slow_queries")
@@ -0,0 +1,32 @@
+"""Async access to the cache.
+
+Django's ``cache.aget``/``cache.aset`` exist for every backend, but for
+django-redis they only run the blocking client in a thread. When a cache is
+backed by django-redis, ``get_async_cache`` returns a client that talks to
+Redis through ``redis.asyncio`` instead, using django-redis' key format and
+serializer so values stay interchangeable with ``django.core.cache.cache``.
+"""
+
+from django.core.cache import DEFAULT_CACHE_ALIAS
+from django.core.cache import caches
+
+_async_caches = {}
+
+
+def get_async_cache(alias=DEFAULT_CACHE_ALIAS):
+    """Return an object with ``aget``, ``aget_many``, ``aset``, ``aadd`` and
+    ``adelete`` for ``alias``.
+
+    Backends other than django-redis are returned as they are and use Django's
+    own async methods.
+    """
+    from django_redis.cache import RedisCache
+
+    from .redis_cache import AsyncRedisCache
+
+    backend = caches[alias]
+    if not isinstance(backend, RedisCache):
+        return backend
+    if alias not in _async_caches:
+        _async_caches[alias] = AsyncRedisCache(alias)
+    return _async_caches[alias]
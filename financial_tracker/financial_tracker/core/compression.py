@@ -0,0 +1,165 @@
+"""Content-Encoding codecs and ``Accept-Encoding`` negotiation.
+
+gzip is always available. brotli and zstd are used when their packages are
+installed, and only for clients that ask for them.
+
+Each codec compresses a whole body with ``compress``; an instance compresses
+one streamed response. Bodies of cached responses are encoded once per codec
+and level, and the encoded bytes kept in the cache (``compress_cached``).
+Every streamed chunk is flushed so that the client receives it as soon as the
+view yields it, at some cost in ratio.
+"""
+
+import gzip
+import hashlib
+import zlib
+
+from django.conf import settings
+from django.core.cache import cache
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None  # type: ignore[assignment]
+
+
+class Gzip:
+    name = "gzip"
+
+    @staticmethod
+    def compress(data, level):
+        return gzip.compress(data, level, mtime=0)
+
+    def __init__(self, level):
+        # wbits=31 writes the gzip header and trailer around the deflate stream.
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress_chunk(self, chunk):
+        return self._compressor.compress(chunk) + self._compressor.flush(
+            zlib.Z_SYNC_FLUSH,
+        )
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+class Brotli:
+    name = "br"
+
+    @staticmethod
+    def compress(data, level):
+        return brotli.compress(data, quality=level)
+
+    def __init__(self, level):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress_chunk(self, chunk):
+        return self._compressor.process(chunk) + self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+class Zstd:
+    name = "zstd"
+
+    @staticmethod
+    def compress(data, level):
+        return zstandard.ZstdCompressor(level=level).compress(data)
+
+    def __init__(self, level):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress_chunk(self, chunk):
+        return self._compressor.compress(chunk) + self._compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_BLOCK,
+        )
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+CODECS = {
+    codec.name: codec
+    for codec, module in ((Gzip, zlib), (Brotli, brotli), (Zstd, zstandard))
+    if module is not None
+}
+
+
+def parse_accept_encoding(header):
+    """Map each coding in an ``Accept-Encoding`` header to its quality."""
+    qualities = {}
+    for item in header.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding] = quality
+    return qualities
+
+
+def negotiate_codec(header):
+    """The codec to encode a response with, or ``None`` to send it as is.
+
+    The client's highest quality wins; ties go to the order of
+    ``COMPRESSION_ENCODINGS``.
+    """
+    qualities = parse_accept_encoding(header)
+    wildcard = qualities.get("*", 0.0)
+    candidates = [
+        (qualities.get(name, wildcard), -preference, name)
+        for preference, name in enumerate(settings.COMPRESSION_ENCODINGS)
+        if name in CODECS
+    ]
+    candidates = [candidate for candidate in candidates if candidate[0] > 0]
+    if not candidates:
+        return None
+    return CODECS[max(candidates)[2]]
+
+
+def compression_level(content_type, codec):
+    """The level ``COMPRESSION_LEVELS`` sets for a content type and codec."""
+    media_type = content_type.split(";")[0].strip().lower()
+    levels = settings.COMPRESSION_LEVELS
+    return levels.get(media_type, levels["*"]).get(codec.name, levels["*"][codec.name])
+
+
+def compress_stream(compressor, chunks):
+    for chunk in chunks:
+        yield compressor.compress_chunk(chunk)
+    yield compressor.finish()
+
+
+async def acompress_stream(compressor, chunks):
+    async for chunk in chunks:
+        yield compressor.compress_chunk(chunk)
+    yield compressor.finish()
+
+
+def compress_cached(codec, data, level):
+    """``codec.compress(data, level)``, kept in the cache for
+    ``RESPONSE_CACHE_TIMEOUT`` under a digest of ``data``.
+
+    For responses replayed from the response cache, whose body is the same on
+    every hit: hashing is far cheaper than compressing again.
+    """
+    digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+    key = f"encoded-body:{codec.name}:{level}:{digest}"
+    encoded = cache.get(key)
+    if encoded is None:
+        encoded = codec.compress(data, level)
+        cache.set(key, encoded, settings.RESPONSE_CACHE_TIMEOUT)
+    return encoded
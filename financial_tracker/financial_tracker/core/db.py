@@ -0,0 +1,59 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
+
+from django.db import DEFAULT_DB_ALIAS
+from django.db import connections
+
+_query_observers: ContextVar[tuple] = ContextVar("query_observers", default=())
+
+
+@contextmanager
+def observe_queries(observer):
+    """Pass every statement executed in the current context through ``observer``.
+
+    ``observer`` has the signature of a database execute wrapper. Unlike
+    ``connection.execute_wrapper`` it is tracked in a context variable, so it also
+    sees the queries an async view runs on another thread via ``sync_to_async``.
+    """
+    token = _query_observers.set((*_query_observers.get(), observer))
+    try:
+        yield observer
+    finally:
+        _query_observers.reset(token)
+
+
+def run_query_observers(execute, sql, params, many, context):
+    for observer in reversed(_query_observers.get()):
+        execute = partial(observer, execute)
+    return execute(sql, params, many, context)
+
+
+def install_query_observers(sender, connection, **kwargs):
+    """``connection_created`` receiver; the wrapper list outlives reconnects."""
+    if run_query_observers not in connection.execute_wrappers:
+        connection.execute_wrappers.append(run_query_observers)
+
+
+def copy_rows(model, fields, rows, using=DEFAULT_DB_ALIAS) -> int:
+    """Stream ``rows`` into the table of ``model`` with PostgreSQL ``COPY``.
+
+    ``fields`` are model field names; each row is a sequence of Python values in
+    the same order. Unlike ``bulk_create`` this skips ``pre_save``, so
+    ``auto_now``/``auto_now_add`` columns must be supplied explicitly, and no
+    signals are sent. Returns the number of rows written.
+    """
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    meta = model._meta  # noqa: SLF001
+    table = quote(meta.db_table)
+    columns = ", ".join(quote(meta.get_field(name).column) for name in fields)
+    written = 0
+    with (
+        connection.cursor() as cursor,
+        cursor.cursor.copy(f"COPY {table} ({columns}) FROM STDIN") as copy,
+    ):
+        for row in rows:
+            copy.write_row(row)
+            written += 1
+    return written
@@ -0,0 +1,65 @@
+"""Parse the output of ``python -X importtime``.
+
+Each line reports the time spent in one module's own body and the cumulative
+time including the imports it triggered. Nested imports are printed before the
+module that triggered them, indented one level deeper. Modules loaded through
+``importlib.import_module``, such as apps and URLconfs, are not reported, so an
+import chain starts at the first plain ``import`` below them.
+"""
+
+from dataclasses import dataclass
+from dataclasses import field
+
+PREFIX = "import time:"
+
+
+@dataclass
+class ImportRecord:
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+    parent: "ImportRecord | None" = field(default=None, repr=False)
+
+    @property
+    def package(self) -> str:
+        return self.name.split(".")[0]
+
+    def chain(self) -> list["ImportRecord"]:
+        """This module and every importer above it, outermost first."""
+        records = []
+        record: ImportRecord | None = self
+        while record is not None:
+            records.append(record)
+            record = record.parent
+        return records[::-1]
+
+
+def parse_importtime(text: str) -> list[ImportRecord]:
+    records = []
+    # Children seen so far that are still waiting for their importer, by depth.
+    pending: dict[int, list[ImportRecord]] = {}
+    for line in text.splitlines():
+        if not line.startswith(PREFIX) or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix(PREFIX).split("|", 2)
+        depth = (len(name) - len(name.lstrip())) // 2
+        record = ImportRecord(name.strip(), int(self_us), int(cumulative_us), depth)
+        for child in pending.pop(depth + 1, []):
+            child.parent = record
+        pending.setdefault(depth, []).append(record)
+        records.append(record)
+    return records
+
+
+def by_package(records: list[ImportRecord]) -> list[tuple[str, int, int]]:
+    """``(package, total self us, module count)``, most expensive first."""
+    totals: dict[str, tuple[int, int]] = {}
+    for record in records:
+        self_us, count = totals.get(record.package, (0, 0))
+        totals[record.package] = (self_us + record.self_us, count + 1)
+    return sorted(
+        ((package, self_us, count) for package, (self_us, count) in totals.items()),
+        key=lambda row: row[1],
+        reverse=True,
+    )
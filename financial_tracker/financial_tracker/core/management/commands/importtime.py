@@ -0,0 +1,95 @@
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from financial_tracker.core.importtime import PREFIX
+from financial_tracker.core.importtime import by_package
+from financial_tracker.core.importtime import parse_importtime
+
+SETUP = "import django; django.setup()"
+# What the first request adds on top: the URLconf and through it every view.
+URLS = "; from django.urls import get_resolver; get_resolver().url_patterns"
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure what starting Django imports, using a fresh interpreter with "
+        "python -X importtime and the current settings."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=25)
+        parser.add_argument(
+            "--sort",
+            choices=["cumulative", "self"],
+            default="cumulative",
+            help="Order modules by time including or excluding their own imports.",
+        )
+        parser.add_argument(
+            "--by-package",
+            action="store_true",
+            help="Sum the time of each top-level package instead of listing modules.",
+        )
+        parser.add_argument(
+            "--urls",
+            action="store_true",
+            help="Also load the URLconf, as the first request does.",
+        )
+        parser.add_argument(
+            "--why",
+            metavar="MODULE",
+            help="Show the chain of imports that loaded MODULE.",
+        )
+
+    def handle(self, *args, **options):
+        script = SETUP + (URLS if options["urls"] else "")
+        result = subprocess.run(  # noqa: S603
+            [sys.executable, "-X", "importtime", "-c", script],
+            capture_output=True,
+            text=True,
+            cwd=settings.BASE_DIR,
+            check=False,
+        )
+        if result.returncode:
+            errors = [
+                line
+                for line in result.stderr.splitlines()
+                if line and not line.startswith(PREFIX)
+            ]
+            msg = errors[-1] if errors else f"Exited with status {result.returncode}."
+            raise CommandError(msg)
+        records = parse_importtime(result.stderr)
+        total_ms = sum(record.self_us for record in records) / 1000
+
+        if options["why"]:
+            self.show_chain(records, options["why"])
+        elif options["by_package"]:
+            self.stdout.write(f"{'self ms':>9}  {'modules':>7}  package")
+            for package, self_us, count in by_package(records)[: options["limit"]]:
+                self.stdout.write(f"{self_us / 1000:>9.1f}  {count:>7}  {package}")
+        else:
+            key = "self_us" if options["sort"] == "self" else "cumulative_us"
+            self.stdout.write(f"{'self ms':>9}  {'cumul ms':>9}  module")
+            ranked = sorted(records, key=lambda r: getattr(r, key), reverse=True)
+            for record in ranked[: options["limit"]]:
+                self_ms = record.self_us / 1000
+                cumulative_ms = record.cumulative_us / 1000
+                self.stdout.write(
+                    f"{self_ms:>9.1f}  {cumulative_ms:>9.1f}  {record.name}",
+                )
+        self.stdout.write(
+            self.style.SUCCESS(f"{len(records)} modules imported in {total_ms:.0f}ms."),
+        )
+
+    def show_chain(self, records, name):
+        record = next((record for record in records if record.name == name), None)
+        if record is None:
+            msg = f"{name} is not imported at startup."
+            raise CommandError(msg)
+        for depth, link in enumerate(record.chain()):
+            self.stdout.write(
+                f"{'  ' * depth}{link.name}  ({link.cumulative_us / 1000:.1f}ms)",
+            )
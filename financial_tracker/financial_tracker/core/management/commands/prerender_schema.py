@@ -0,0 +1,31 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from financial_tracker.core.api.schema import render_schema_documents
+
+
+class Command(BaseCommand):
+    help = (
+        "Render the OpenAPI schema into static files, so that collectstatic picks "
+        "them up and whitenoise serves them without generating the schema."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            type=Path,
+            default=settings.APPS_DIR / "static" / "api",
+            help="Directory for schema.yaml and schema.json.",
+        )
+
+    def handle(self, *args, **options):
+        output = options["output"]
+        output.mkdir(parents=True, exist_ok=True)
+        for schema_format, document in render_schema_documents().items():
+            path = output / f"schema.{schema_format}"
+            path.write_bytes(document.content)
+            self.stdout.write(
+                f"Wrote {path} ({len(document.content)} bytes, ETag {document.etag}).",
+            )
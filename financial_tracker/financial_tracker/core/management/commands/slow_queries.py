@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+
+from financial_tracker.core.models import SlowQuery
+from financial_tracker.core.slow_queries import recorder
+
+
+class Command(BaseCommand):
+    help = "List captured slow queries, worst total time first."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=20)
+        parser.add_argument(
+            "--explain",
+            action="store_true",
+            help="Print the plan of the latest sampled statement under each query.",
+        )
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Delete all captured queries instead of listing them.",
+        )
+
+    def handle(self, *args, **options):
+        if options["reset"]:
+            deleted, _ = SlowQuery.objects.all().delete()
+            self.stdout.write(f"Deleted {deleted} slow queries.")
+            return
+
+        recorder.flush()
+        queries = SlowQuery.objects.order_by("-total_duration_ms")[: options["limit"]]
+        for query in queries:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"{query.fingerprint[:12]}  calls={query.calls}  "
+                    f"total={query.total_duration_ms:.1f}ms  "
+                    f"mean={query.mean_duration_ms:.1f}ms  "
+                    f"max={query.max_duration_ms:.1f}ms",
+                ),
+            )
+            self.stdout.write(f"  {query.normalized_sql}")
+            if options["explain"] and query.explain_plan:
+                for line in query.explain_plan.splitlines():
+                    self.stdout.write(f"    {line}")
@@ -0,0 +1,84 @@
+"""Prometheus metrics shared by every worker process.
+
+When ``PROMETHEUS_MULTIPROC_DIR`` is set in the environment, ``prometheus_client``
+writes each sample to a memory-mapped file in that directory and the metrics view
+merges the files of all gunicorn workers, so counters and histograms aggregate
+across processes. Without it (runserver, tests) the in-process registry is used.
+"""
+
+import os
+
+from prometheus_client import CONTENT_TYPE_LATEST
+from prometheus_client import REGISTRY
+from prometheus_client import CollectorRegistry
+from prometheus_client import Counter
+from prometheus_client import Histogram
+from prometheus_client import generate_latest
+from prometheus_client import multiprocess
+
+REQUEST_LATENCY = Histogram(
+    "django_http_request_duration_seconds",
+    "Request latency by resolved view name.",
+    ["view", "method"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REQUESTS = Counter(
+    "django_http_requests_total",
+    "Requests by resolved view name and response status.",
+    ["view", "method", "status"],
+)
+DB_QUERIES = Counter(
+    "django_db_queries_total",
+    "Database queries executed while serving a view.",
+    ["view", "database"],
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "django_db_queries_per_request",
+    "Number of database queries executed per request.",
+    ["view"],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 250),
+)
+CACHE_REQUESTS = Counter(
+    "app_cache_requests_total",
+    "Application cache lookups; hit ratio is hit / (hit + miss).",
+    ["cache", "result"],
+)
+RESPONSE_CACHE_FILLS = Counter(
+    "app_response_cache_fills_total",
+    "How response cache misses were answered: computed, waited, stale or fallback.",
+    ["outcome"],
+)
+CURRENCY_CONVERSIONS = Counter(
+    "app_currency_conversions_total",
+    "Calls to convert_to_lcy by source currency and outcome.",
+    ["currency", "outcome"],
+)
+RATE_INGEST_TICKS = Counter(
+    "app_rate_ingest_ticks_total",
+    "Exchange-rate ticks through the ingestion buffer by outcome.",
+    ["outcome"],
+)
+
+UNRESOLVED_VIEW = "<unresolved>"
+
+
+def view_label(request) -> str:
+    """Return the url name of the view that served ``request``."""
+    match = getattr(request, "resolver_match", None)
+    if match is None or not match.url_name:
+        return UNRESOLVED_VIEW
+    return match.url_name
+
+
+def record_cache_lookup(cache: str, *, hit: bool) -> None:
+    CACHE_REQUESTS.labels(cache=cache, result="hit" if hit else "miss").inc()
+
+
+def render_latest() -> tuple[bytes, str]:
+    """Render all metrics in the Prometheus text exposition format."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
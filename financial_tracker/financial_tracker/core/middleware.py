@@ -0,0 +1,281 @@
+import threading
+import time
+import uuid
+
+from asgiref.sync import iscoroutinefunction
+from asgiref.sync import markcoroutinefunction
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from .compression import acompress_stream
+from .compression import compress_cached
+from .compression import compress_stream
+from .compression import compression_level
+from .compression import negotiate_codec
+from .db import observe_queries
+from .metrics import DB_QUERIES
+from .metrics import DB_QUERIES_PER_REQUEST
+from .metrics import REQUEST_LATENCY
+from .metrics import REQUESTS
+from .metrics import view_label
+from .profiling import QueryLog
+from .profiling import StackSampler
+from .profiling import is_staff
+from .profiling import store_profile
+
+
+class QueryCounter:
+    """Query observer that counts statements per connection alias."""
+
+    def __init__(self):
+        self.counts = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        alias = context["connection"].alias
+        self.counts[alias] = self.counts.get(alias, 0) + 1
+        return execute(sql, params, many, context)
+
+
+class HybridMiddleware:
+    """Base for middleware that runs natively under both WSGI and ASGI.
+
+    A sync-only middleware makes Django run everything below it in a thread
+    under ASGI, which defeats async views. Subclasses implement ``__call__``
+    for the sync chain and ``__acall__`` for the async one.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)  # type: ignore[type-var]
+
+
+class MetricsMiddleware(HybridMiddleware):
+    """Record latency, status and query counts for every request.
+
+    Should be the first entry in ``MIDDLEWARE`` so the timing covers the rest of
+    the middleware stack as well as the view.
+    """
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        start = time.perf_counter()
+        with observe_queries(QueryCounter()) as counter:
+            response = self.get_response(request)
+        self.record(request, response, counter, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        with observe_queries(QueryCounter()) as counter:
+            response = await self.get_response(request)
+        self.record(request, response, counter, time.perf_counter() - start)
+        return response
+
+    def record(self, request, response, counter, duration):
+        view = view_label(request)
+        REQUEST_LATENCY.labels(view=view, method=request.method).observe(duration)
+        REQUESTS.labels(
+            view=view,
+            method=request.method,
+            status=str(response.status_code),
+        ).inc()
+        for alias, count in counter.counts.items():
+            DB_QUERIES.labels(view=view, database=alias).inc(count)
+        DB_QUERIES_PER_REQUEST.labels(view=view).observe(sum(counter.counts.values()))
+
+
+class CompressionMiddleware(HybridMiddleware):
+    """Compress responses under ``COMPRESSION_PATH_PREFIXES`` with the best
+    encoding the client accepts.
+
+    Works like Django's ``GZipMiddleware``, with brotli and zstd, a size
+    threshold and a level per content type (``COMPRESSION_LEVELS``). Streaming
+    responses are compressed chunk by chunk. Place it right after
+    ``SecurityMiddleware`` so it sees the final body.
+
+    Under ASGI, bodies of at least ``COMPRESSION_OFFLOAD_SIZE`` bytes are
+    compressed in a worker thread rather than on the event loop. Responses
+    marked ``cache_encoded``, which the response cache serves, reuse their
+    encoded body.
+    """
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.compress(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if (
+            not response.streaming
+            and len(response.content) >= settings.COMPRESSION_OFFLOAD_SIZE
+        ):
+            return await sync_to_async(self.compress, thread_sensitive=False)(
+                request,
+                response,
+            )
+        return self.compress(request, response)
+
+    def compress(self, request, response):
+        if not request.path_info.startswith(tuple(settings.COMPRESSION_PATH_PREFIXES)):
+            return response
+        if response.has_header("Content-Encoding"):
+            return response
+        # Whether the body is encoded depends on Accept-Encoding even when it
+        # is too small this time: the same URL may return a larger body later.
+        patch_vary_headers(response, ("Accept-Encoding",))
+        if (
+            not response.streaming
+            and len(response.content) < settings.COMPRESSION_MIN_SIZE
+        ):
+            return response
+
+        codec = negotiate_codec(request.headers.get("Accept-Encoding", ""))
+        if codec is None:
+            return response
+        level = compression_level(response.get("Content-Type", ""), codec)
+
+        if response.streaming:
+            stream = acompress_stream if response.is_async else compress_stream
+            response.streaming_content = stream(
+                codec(level),
+                response.streaming_content,
+            )
+            del response["Content-Length"]
+        else:
+            if getattr(response, "cache_encoded", False):
+                compressed = compress_cached(codec, response.content, level)
+            else:
+                compressed = codec.compress(response.content, level)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response["Content-Length"] = str(len(compressed))
+
+        # The encoded bytes differ, so a strong validator no longer applies.
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = f"W/{etag}"
+        response["Content-Encoding"] = codec.name
+        return response
+
+
+class ProfilingMiddleware(HybridMiddleware):
+    """Profile a request when a staff user asks for it with ``?profile=1`` or an
+    ``X-Profile: 1`` header.
+
+    The collapsed stacks and the SQL executed are stored in the cache under an
+    id generated for the request, which is returned in the ``X-Profile-Id``
+    response header and can be fetched from ``/internal/profiles/<id>/``.
+    Requests without the trigger only pay for the two lookups in ``requested``.
+
+    Under ASGI the event loop thread is sampled, so stacks from other requests
+    served concurrently by the same worker show up as well, and ORM calls made
+    through ``sync_to_async`` appear as time spent waiting on the executor.
+    """
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.requested(request) or not is_staff(request):
+            return self.get_response(request)
+
+        sampler, query_log = self.start()
+        start = time.perf_counter()
+        try:
+            with observe_queries(query_log):
+                response = self.get_response(request)
+        finally:
+            sampler.stop()
+        self.store(request, response, time.perf_counter() - start, sampler, query_log)
+        return response
+
+    async def __acall__(self, request):
+        if not self.requested(request) or not await sync_to_async(is_staff)(request):
+            return await self.get_response(request)
+
+        sampler, query_log = self.start()
+        start = time.perf_counter()
+        try:
+            with observe_queries(query_log):
+                response = await self.get_response(request)
+        finally:
+            sampler.stop()
+        await sync_to_async(self.store)(
+            request,
+            response,
+            time.perf_counter() - start,
+            sampler,
+            query_log,
+        )
+        return response
+
+    def requested(self, request):
+        return (
+            request.GET.get("profile") == "1" or request.headers.get("X-Profile") == "1"
+        )
+
+    def start(self):
+        sampler = StackSampler(
+            threading.get_ident(),
+            settings.PROFILING_SAMPLE_INTERVAL,
+        )
+        sampler.start()
+        return sampler, QueryLog()
+
+    def store(self, request, response, duration, sampler, query_log):
+        # Always a fresh id: one taken from the client could overwrite
+        # another request's profile.
+        profile_id = uuid.uuid4().hex
+        store_profile(
+            profile_id,
+            {
+                "id": profile_id,
+                "method": request.method,
+                "path": request.get_full_path(),
+                "status": response.status_code,
+                "duration_ms": round(duration * 1000, 3),
+                "sample_interval_ms": settings.PROFILING_SAMPLE_INTERVAL * 1000,
+                "collapsed": sampler.collapsed(),
+                "queries": query_log.queries,
+            },
+            settings.PROFILING_CACHE_TIMEOUT,
+        )
+        response["X-Profile-Id"] = profile_id
+
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """WhiteNoise that can sit in an async middleware chain.
+
+    Upstream is sync-only; static file lookups are in-memory dictionary hits, so
+    only serving a file needs to leave the event loop.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
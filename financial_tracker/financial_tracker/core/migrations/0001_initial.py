@@ -0,0 +1,36 @@
+# Generated by Django 5.0.10 on 2026-10-19 14:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlowQuery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fingerprint', models.CharField(max_length=40, unique=True)),
+                ('database', models.CharField(max_length=100)),
+                ('normalized_sql', models.TextField()),
+                ('sample_sql', models.TextField(help_text='Most recent statement, without parameters.')),
+                ('calls', models.PositiveBigIntegerField(default=0)),
+                ('total_duration_ms', models.FloatField(default=0)),
+                ('max_duration_ms', models.FloatField(default=0)),
+                ('explain_plan', models.TextField(blank=True)),
+                ('explained_at', models.DateTimeField(blank=True, null=True)),
+                ('first_seen', models.DateTimeField(auto_now_add=True)),
+                ('last_seen', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': 'Slow query',
+                'verbose_name_plural': 'Slow queries',
+                'ordering': ['-total_duration_ms'],
+            },
+        ),
+    ]
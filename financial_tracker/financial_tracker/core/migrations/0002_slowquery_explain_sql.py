@@ -0,0 +1,18 @@
+# Generated by Django 5.0.10 on 2026-10-19 16:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='slowquery',
+            name='explain_sql',
+            field=models.TextField(blank=True, help_text='A sampled statement with its parameters, for slow_queries --explain.'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.0.10 on 2026-10-19 16:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_slowquery_explain_sql'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='slowquery',
+            name='explain_sql',
+        ),
+        migrations.AlterField(
+            model_name='slowquery',
+            name='explain_plan',
+            field=models.TextField(blank=True, help_text='Plan of a sampled statement.'),
+        ),
+    ]
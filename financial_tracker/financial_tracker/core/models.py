@@ -0,0 +1,36 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class SlowQuery(models.Model):
+    """Aggregated statistics for one normalized statement that exceeded
+    ``SLOW_QUERY_THRESHOLD_MS``."""
+
+    fingerprint = models.CharField(max_length=40, unique=True)
+    database = models.CharField(max_length=100)
+    normalized_sql = models.TextField()
+    sample_sql = models.TextField(
+        help_text=_("Most recent statement, without parameters."),
+    )
+    calls = models.PositiveBigIntegerField(default=0)
+    total_duration_ms = models.FloatField(default=0)
+    max_duration_ms = models.FloatField(default=0)
+    explain_plan = models.TextField(
+        blank=True,
+        help_text=_("Plan of a sampled statement."),
+    )
+    explained_at = models.DateTimeField(blank=True, null=True)
+    first_seen = models.DateTimeField(auto_now_add=True)
+    last_seen = models.DateTimeField()
+
+    class Meta:
+        ordering = ["-total_duration_ms"]
+        verbose_name = _("Slow query")
+        verbose_name_plural = _("Slow queries")
+
+    def __str__(self) -> str:
+        return f"{self.fingerprint[:12]} ({self.calls} calls)"
+
+    @property
+    def mean_duration_ms(self) -> float:
+        return self.total_duration_ms / self.calls if self.calls else 0.0
@@ -0,0 +1,97 @@
+"""On-demand request profiling.
+
+A sampling profiler is used instead of ``cProfile`` because it records whole call
+stacks, which is what flamegraph tools (flamegraph.pl, speedscope, inferno) need,
+and because its overhead does not depend on how many functions the request calls.
+"""
+
+import sys
+import threading
+import time
+from collections import Counter
+
+from django.core.cache import cache
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+
+CACHE_KEY = "profile:{}"
+
+
+def frame_label(frame) -> str:
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}.{frame.f_code.co_name}:{frame.f_lineno}"
+
+
+class StackSampler(threading.Thread):
+    """Sample the call stack of one thread at a fixed interval.
+
+    The result is available as collapsed stacks: one ``root;...;leaf count`` line
+    per distinct stack, the input format of flamegraph.pl and speedscope.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(name="stack-sampler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)  # noqa: SLF001
+            if frame is None:
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(frame_label(frame))
+                frame = frame.f_back
+            self.stacks[";".join(reversed(labels))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def collapsed(self) -> str:
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.items())
+
+
+class QueryLog:
+    """Query observer that records every statement and its duration."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append(
+                {
+                    "database": context["connection"].alias,
+                    "sql": sql,
+                    "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+                },
+            )
+
+
+def store_profile(profile_id: str, profile: dict, timeout: int) -> None:
+    cache.set(CACHE_KEY.format(profile_id), profile, timeout)
+
+
+def load_profile(profile_id: str) -> dict | None:
+    return cache.get(CACHE_KEY.format(profile_id))
+
+
+def is_staff(request) -> bool:
+    """Whether ``request`` comes from a staff user, logged in or holding an API
+    token; profiles are only taken and served for them."""
+    if request.user.is_staff:
+        return True
+    # API clients authenticate with a token, which DRF only resolves inside
+    # the view; resolve it here so they can be profiled too.
+    try:
+        result = TokenAuthentication().authenticate(request)
+    except AuthenticationFailed:
+        return False
+    return result is not None and result[0].is_staff
@@ -0,0 +1,113 @@
+"""Async client for caches backed by django-redis.
+
+Kept apart from ``financial_tracker.core.cache`` so that redis is only imported
+the first time a request reads the cache asynchronously, not by every process
+that loads the URLconf or runs a management command.
+"""
+
+import asyncio
+import logging
+import weakref
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncRedisCache:
+    """The async subset of the cache API on top of ``redis.asyncio``."""
+
+    def __init__(self, alias):
+        config = settings.CACHES[alias]
+        location = config["LOCATION"]
+        # With replicas the first location is the primary, like django-redis.
+        self.url = location[0] if isinstance(location, list | tuple) else location
+        self.alias = alias
+        self.ignore_exceptions = config.get("OPTIONS", {}).get(
+            "IGNORE_EXCEPTIONS",
+            False,
+        )
+        # redis.asyncio connections belong to the event loop that opened them.
+        self._clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    @property
+    def client(self):
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            client = self._clients[loop] = aioredis.Redis.from_url(self.url)
+        return client
+
+    @property
+    def codec(self):
+        # django-redis's client, for its keys, serializer and compressor.
+        return caches[self.alias].client  # type: ignore[attr-defined]
+
+    async def aget(self, key, default=None, version=None):
+        try:
+            value = await self.client.get(self.codec.make_key(key, version=version))
+        except RedisError:
+            if not self.ignore_exceptions:
+                raise
+            logger.warning("Cache get failed for %s", key, exc_info=True)
+            return default
+        return default if value is None else self.codec.decode(value)
+
+    async def aget_many(self, keys, version=None):
+        keys = list(keys)
+        try:
+            values = await self.client.mget(
+                [self.codec.make_key(key, version=version) for key in keys],
+            )
+        except RedisError:
+            if not self.ignore_exceptions:
+                raise
+            logger.warning("Cache get_many failed for %s", keys, exc_info=True)
+            return {}
+        return {
+            key: self.codec.decode(value)
+            for key, value in zip(keys, values, strict=True)
+            if value is not None
+        }
+
+    # Same signatures as Django's BaseCache.
+    async def aset(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):  # noqa: ASYNC109
+        await self._set(key, value, timeout, version)
+
+    async def aadd(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):  # noqa: ASYNC109
+        """Set ``key`` only if it is missing; return whether it was set."""
+        return await self._set(key, value, timeout, version, nx=True)
+
+    async def _set(self, key, value, timeout, version, *, nx=False):  # noqa: ASYNC109
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = caches[self.alias].default_timeout
+        if timeout is not None and timeout <= 0:
+            if not nx:
+                await self.adelete(key, version=version)
+            return False
+        try:
+            return bool(
+                await self.client.set(
+                    self.codec.make_key(key, version=version),
+                    self.codec.encode(value),
+                    ex=None if timeout is None else int(timeout),
+                    nx=nx,
+                ),
+            )
+        except RedisError:
+            if not self.ignore_exceptions:
+                raise
+            logger.warning("Cache set failed for %s", key, exc_info=True)
+            return False
+
+    async def adelete(self, key, version=None):
+        try:
+            await self.client.delete(self.codec.make_key(key, version=version))
+        except RedisError:
+            if not self.ignore_exceptions:
+                raise
+            logger.warning("Cache delete failed for %s", key, exc_info=True)
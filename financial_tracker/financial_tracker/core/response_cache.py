@@ -0,0 +1,198 @@
+"""Version-stamped cache for read-heavy API responses.
+
+Every model a cached response is built from has a version counter in the
+cache, bumped once a save or delete commits (``bump_version``). A response is
+cached together with the versions it was built under, so a write invalidates
+all of them with a single increment and no key scanning: later reads find the
+entry stale and rebuild it.
+
+Counters start from a timestamp rather than 1, so one that is evicted and
+recreated can never return to a version that has entries cached.
+
+Rebuilding is single-flight. The first request to find an entry missing or
+stale takes a lock in the cache and computes the response; concurrent requests
+for the same entry are answered with the stale response while there is one
+(stale-while-revalidate), or wait a bounded time for the new one. A request
+that gets no answer in time, or finds the cache unusable, computes the
+response itself, so the lock never makes a request fail.
+"""
+
+import asyncio
+import hashlib
+import time
+import uuid
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from rest_framework import status
+from rest_framework.response import Response
+
+from .cache import get_async_cache
+from .metrics import RESPONSE_CACHE_FILLS
+from .metrics import record_cache_lookup
+
+# Headers set by the view that are replayed with a cached response.
+CACHED_HEADERS = ("Cache-Control", "ETag", "Last-Modified")
+# Seconds between checks for the response another request is computing.
+POLL_INTERVAL = 0.05
+
+
+def version_key(model):
+    return f"model-version:{model._meta.label_lower}"  # noqa: SLF001
+
+
+def bump_version(model):
+    key = version_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), None)
+
+
+def bump_version_on_commit(sender, **kwargs):
+    """``post_save``/``post_delete`` receiver bumping the sender's version.
+
+    Only after commit: bumping earlier would let a concurrent read cache rows
+    from before the write under the new version.
+    """
+    transaction.on_commit(lambda: bump_version(sender))
+
+
+def get_versions(models):
+    """The versions of ``models``, for caches outside a response."""
+    keys = [version_key(model) for model in models]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            initial = time.time_ns()
+            found[key] = initial if cache.add(key, initial, None) else cache.get(key)
+    return [found[key] for key in keys]
+
+
+async def aget_versions(models, entry_key):
+    """The versions of ``models`` and the entry at ``entry_key``, fetched in a
+    single round trip once the counters exist."""
+    async_cache = get_async_cache()
+    keys = [version_key(model) for model in models]
+    found = await async_cache.aget_many([*keys, entry_key])
+    for key in keys:
+        if key not in found:
+            initial = time.time_ns()
+            added = await async_cache.aadd(key, initial, None)
+            found[key] = initial if added else await async_cache.aget(key)
+    return [found[key] for key in keys], found.get(entry_key)
+
+
+def response_key(request, *, per_user):
+    scope = request.user.pk if per_user else None
+    parts = (request.get_full_path(), request.accepted_media_type, scope)
+    return f"response:{hashlib.sha256(repr(parts).encode()).hexdigest()[:32]}"
+
+
+async def single_flight(key, versions, compute):
+    """Return ``(data, headers)`` for the entry at ``key``, awaiting
+    ``compute()`` in at most one request at a time to refresh it.
+
+    ``compute`` returns ``(data, headers)``, or ``None`` for a response that
+    must not be cached.
+    """
+    async_cache = get_async_cache()
+    lock_key = f"{key}:lock"
+    token = uuid.uuid4().hex
+    if await async_cache.aadd(lock_key, token, settings.RESPONSE_CACHE_LOCK_TIMEOUT):
+        try:
+            result = await compute()
+            if result is not None:
+                await async_cache.aset(
+                    key,
+                    (versions, *result),
+                    settings.RESPONSE_CACHE_TIMEOUT,
+                )
+        finally:
+            # The lock may have expired and been taken by another request.
+            if await async_cache.aget(lock_key) == token:
+                await async_cache.adelete(lock_key)
+        RESPONSE_CACHE_FILLS.labels(outcome="computed").inc()
+        return result
+
+    deadline = time.monotonic() + settings.RESPONSE_CACHE_WAIT
+    while True:
+        # Lock before entry: a holder that releases in between has stored its
+        # result by then.
+        locked = await async_cache.aget(lock_key) is not None
+        entry = await async_cache.aget(key)
+        if entry is not None:
+            entry_versions, data, headers = entry
+            RESPONSE_CACHE_FILLS.labels(
+                outcome="waited" if entry_versions == versions else "stale",
+            ).inc()
+            return data, headers
+        if not locked or time.monotonic() >= deadline:
+            break
+        await asyncio.sleep(POLL_INTERVAL)
+
+    RESPONSE_CACHE_FILLS.labels(outcome="fallback").inc()
+    return await compute()
+
+
+def cache_response(*models, per_user=True):
+    """Cache the data of an async handler's successful responses until any of
+    ``models`` changes.
+
+    Entries are keyed by path and query string, the negotiated media type and
+    the user unless ``per_user`` is off, and hold the models' versions. An
+    ``ETag`` the handler set is kept, so a revalidation served from the cache
+    is a 304 with no query at all. Responses are marked ``cache_encoded`` so
+    that ``CompressionMiddleware`` compresses each body once. Only
+    ``RESPONSE_CACHE_TIMEOUT`` bounds how long an entry lives; set it to 0 to
+    turn the cache off.
+    """
+
+    def decorator(handler):
+        @wraps(handler)
+        async def wrapper(view, request, *args, **kwargs):
+            if not settings.RESPONSE_CACHE_TIMEOUT:
+                return await handler(view, request, *args, **kwargs)
+            key = response_key(request, per_user=per_user)
+            versions, entry = await aget_versions(models, key)
+            fresh = entry is not None and entry[0] == versions
+            record_cache_lookup("response", hit=fresh)
+            if fresh:
+                return replay(request, *entry[1:])
+
+            response = None
+
+            async def compute():
+                nonlocal response
+                response = await handler(view, request, *args, **kwargs)
+                if response.status_code != status.HTTP_200_OK or response.exception:
+                    return None
+                return response.data, {
+                    header: response[header]
+                    for header in CACHED_HEADERS
+                    if header in response
+                }
+
+            result = await single_flight(key, versions, compute)
+            if response is None:
+                return replay(request, *result)
+            # Its body is the one later hits replay; encode it once.
+            response.cache_encoded = result is not None
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def replay(request, data, headers):
+    response = Response(data, headers=headers)
+    response.cache_encoded = True  # type: ignore[attr-defined]
+    return get_conditional_response(
+        request,
+        etag=headers.get("ETag"),
+        response=response,
+    )
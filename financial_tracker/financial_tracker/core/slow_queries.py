@@ -0,0 +1,220 @@
+"""Capture statements that exceed ``SLOW_QUERY_THRESHOLD_MS``.
+
+``SlowQueryRecorder`` is installed as a permanent execute wrapper on every
+database connection. Slow statements are fingerprinted by their normalized SQL
+(literals and parameters replaced by ``?``, ``IN`` and ``VALUES`` lists folded)
+and aggregated in memory; nothing is written on the connection or in the
+transaction the statement ran in, so requests neither wait on each other's
+``SlowQuery`` rows nor lose their records when they roll back. A daemon thread
+adds the aggregates to ``SlowQuery`` rows every ``SLOW_QUERY_FLUSH_INTERVAL``
+seconds over its own connection.
+
+A sample of the statements is kept in memory with its parameters, which can
+hold secrets such as session keys and API tokens. The flush re-runs each
+sample under ``EXPLAIN`` (``EXPLAIN ANALYZE`` for ``SELECT`` on PostgreSQL),
+off the request path, and stores only the plan with its string literals
+redacted: parameters are never written to the database.
+"""
+
+import hashlib
+import logging
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.db import IntegrityError
+from django.db import connections
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+COMMENT_RE = re.compile(r"/\*.*?\*/|--[^\n]*", re.DOTALL)
+STRING_RE = re.compile(r"'(?:[^']|'')*'")
+PARAM_RE = re.compile(r"%(?:\(\w+\))?s")
+NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+IN_LIST_RE = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+VALUES_RE = re.compile(
+    r"(\(\s*\?(?:\s*,\s*\?)*\s*\))(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))+",
+)
+WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_sql(sql: str) -> str:
+    sql = COMMENT_RE.sub(" ", sql)
+    sql = STRING_RE.sub("?", sql)
+    sql = PARAM_RE.sub("?", sql)
+    sql = NUMBER_RE.sub("?", sql)
+    sql = IN_LIST_RE.sub("IN (...)", sql)
+    sql = VALUES_RE.sub(r"\1, ...", sql)
+    return WHITESPACE_RE.sub(" ", sql).strip()
+
+
+def fingerprint(normalized_sql: str) -> str:
+    return hashlib.sha1(normalized_sql.encode(), usedforsecurity=False).hexdigest()
+
+
+class SlowQueryRecorder:
+    """Execute wrapper that records statements slower than the threshold."""
+
+    def __init__(self):
+        self._state = threading.local()
+        self._lock = threading.Lock()
+        # Aggregates by fingerprint since the last flush.
+        self._pending = {}
+        self._flusher = None
+
+    def __call__(self, execute, sql, params, many, context):
+        threshold = settings.SLOW_QUERY_THRESHOLD_MS
+        if threshold <= 0 or getattr(self._state, "paused", False):
+            return execute(sql, params, many, context)
+
+        start = time.perf_counter()
+        result = execute(sql, params, many, context)
+        duration_ms = (time.perf_counter() - start) * 1000
+        if duration_ms >= threshold:
+            self.record(context, sql, params, many, duration_ms)
+        return result
+
+    @contextmanager
+    def paused(self):
+        """Leave this thread's own statements unrecorded."""
+        self._state.paused = True
+        try:
+            yield
+        finally:
+            self._state.paused = False
+
+    def record(self, context, sql, params, many, duration_ms):
+        connection = context["connection"]
+        normalized = normalize_sql(sql)
+        key = fingerprint(normalized)
+        sample = None
+        if not many and random.random() < settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE:  # noqa: S311
+            sample = (sql, params)
+        with self._lock:
+            entry = self._pending.setdefault(
+                key,
+                {
+                    "database": connection.alias,
+                    "normalized_sql": normalized,
+                    "calls": 0,
+                    "total_duration_ms": 0.0,
+                    "max_duration_ms": 0.0,
+                    "sample": None,
+                },
+            )
+            entry["calls"] += 1
+            entry["total_duration_ms"] += duration_ms
+            entry["max_duration_ms"] = max(entry["max_duration_ms"], duration_ms)
+            entry["sample_sql"] = sql
+            entry["last_seen"] = timezone.now()
+            entry["sample"] = sample or entry["sample"]
+            if settings.SLOW_QUERY_FLUSH_INTERVAL > 0 and not (
+                self._flusher and self._flusher.is_alive()
+            ):
+                # Started lazily: a thread started before gunicorn forks would
+                # not survive into the workers.
+                self._flusher = threading.Thread(
+                    target=self._flush_periodically,
+                    name="slow-queries",
+                    daemon=True,
+                )
+                self._flusher.start()
+
+    def _flush_periodically(self):
+        while True:
+            time.sleep(settings.SLOW_QUERY_FLUSH_INTERVAL)
+            self.flush()
+            # This thread's connections, opened for the flush only.
+            connections.close_all()
+
+    def flush(self):
+        """Add the pending aggregates to ``SlowQuery`` rows; returns how many
+        statements they covered."""
+        from .models import SlowQuery
+
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        with self.paused():
+            for key, entry in pending.items():
+                manager = SlowQuery.objects.using(entry["database"])
+                changes = {
+                    "calls": F("calls") + entry["calls"],
+                    "total_duration_ms": F("total_duration_ms")
+                    + entry["total_duration_ms"],
+                    "max_duration_ms": Greatest(
+                        F("max_duration_ms"),
+                        entry["max_duration_ms"],
+                    ),
+                    "sample_sql": entry["sample_sql"],
+                    "last_seen": entry["last_seen"],
+                }
+                sample = entry.pop("sample")
+                if sample:
+                    try:
+                        entry["explain_plan"] = explain(entry["database"], *sample)
+                        entry["explained_at"] = timezone.now()
+                    except DatabaseError:
+                        logger.warning(
+                            "Could not explain slow query %s",
+                            key,
+                            exc_info=True,
+                        )
+                    else:
+                        changes["explain_plan"] = entry["explain_plan"]
+                        changes["explained_at"] = entry["explained_at"]
+                try:
+                    with transaction.atomic(using=entry["database"]):
+                        if not manager.filter(fingerprint=key).update(**changes):
+                            manager.create(
+                                fingerprint=key,
+                                **{
+                                    field: value
+                                    for field, value in entry.items()
+                                    if field != "database"
+                                },
+                                database=entry["database"],
+                            )
+                except IntegrityError:
+                    # Another process created the row first.
+                    manager.filter(fingerprint=key).update(**changes)
+                except DatabaseError:
+                    logger.warning("Could not record slow query %s", key, exc_info=True)
+        return sum(entry["calls"] for entry in pending.values())
+
+
+def explain(database, sql, params) -> str:
+    """Run ``EXPLAIN`` on a sampled statement; returns the plan with its string
+    literals redacted."""
+    connection = connections[database]
+    if connection.vendor == "postgresql" and sql.lstrip()[:6].upper() == "SELECT":
+        prefix = connection.ops.explain_query_prefix(analyze=True, buffers=True)
+    else:
+        prefix = connection.ops.explain_query_prefix()
+    with (
+        recorder.paused(),
+        transaction.atomic(using=database),
+        connection.cursor() as cursor,
+    ):
+        cursor.execute(f"{prefix} {sql}", params)
+        # Plans quote the parameters back in filter conditions.
+        plan = STRING_RE.sub("?", "\n".join(str(row[0]) for row in cursor.fetchall()))
+        # EXPLAIN ANALYZE executes the statement: keep none of its effects.
+        transaction.set_rollback(True, using=database)
+    return plan
+
+
+recorder = SlowQueryRecorder()
+
+
+def install_recorder(sender, connection, **kwargs):
+    """``connection_created`` receiver; the wrapper list outlives reconnects."""
+    if recorder not in connection.execute_wrappers:
+        connection.execute_wrappers.append(recorder)
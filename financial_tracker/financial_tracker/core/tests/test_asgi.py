@@ -0,0 +1,40 @@
+import logging
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.handlers.asgi import ASGIHandler
+from django.urls import reverse
+from prometheus_client import REGISTRY
+
+from financial_tracker.currencies.models import Currency
+
+
+def test_middleware_runs_natively_under_asgi(caplog, settings):
+    # With DEBUG on, Django logs every sync-only middleware it has to wrap.
+    settings.DEBUG = True
+    caplog.set_level(logging.DEBUG, logger="django.request")
+
+    ASGIHandler().load_middleware(is_async=True)
+
+    assert "adapted" not in caplog.text
+
+
+@pytest.mark.django_db
+def test_async_view_queries_are_counted(async_client, user):
+    Currency.objects.create(
+        code="KES",
+        description="Kenyan Shilling",
+        is_local=True,
+        created_by=user,
+    )
+    labels = {"view": "currency-list", "database": "default"}
+    before = REGISTRY.get_sample_value("django_db_queries_total", labels) or 0
+
+    response = async_to_sync(async_client.get)(reverse("api:currencies:currency-list"))
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()[0]["created_by"] == user.username
+    # The validator aggregate and the rows, run on an executor thread rather
+    # than the one the middleware runs on.
+    assert REGISTRY.get_sample_value("django_db_queries_total", labels) == before + 2
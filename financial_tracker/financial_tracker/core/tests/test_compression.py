@@ -0,0 +1,187 @@
+import gzip
+import json
+import threading
+import zlib
+from unittest.mock import patch
+
+import brotli
+import pytest
+import zstandard
+from asgiref.sync import async_to_sync
+from django.http import HttpResponse
+from django.http import StreamingHttpResponse
+from django.test import RequestFactory
+from django.urls import reverse
+
+from financial_tracker.core.compression import Gzip
+from financial_tracker.core.compression import compression_level
+from financial_tracker.core.compression import negotiate_codec
+from financial_tracker.core.middleware import CompressionMiddleware
+from financial_tracker.currencies.models import Currency
+
+BODY = b'{"amount":"1234.56","income_name":"Salary"},' * 100
+
+DECOMPRESS = {
+    "gzip": gzip.decompress,
+    "br": brotli.decompress,
+    "zstd": lambda data: zstandard.ZstdDecompressor().decompressobj().decompress(data),
+}
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        ("gzip, deflate, br, zstd", "zstd"),
+        ("gzip, br", "br"),
+        ("gzip;q=1.0, br;q=0.5", "gzip"),
+        ("*", "zstd"),
+        ("*, zstd;q=0", "br"),
+        ("GZIP", "gzip"),
+        ("identity", None),
+        ("gzip;q=0", None),
+        ("", None),
+    ],
+)
+def test_negotiate_codec(header, expected):
+    codec = negotiate_codec(header)
+
+    assert (codec and codec.name) == expected
+
+
+def test_compression_level_by_content_type(settings):
+    settings.COMPRESSION_LEVELS = {
+        "*": {"gzip": 6, "br": 4},
+        "application/json": {"gzip": 1},
+    }
+    gzip_codec = negotiate_codec("gzip")
+
+    assert compression_level("application/json; charset=utf-8", gzip_codec) == 1
+    assert compression_level("application/json", negotiate_codec("br")) == 4  # noqa: PLR2004
+    assert compression_level("text/html", gzip_codec) == 6  # noqa: PLR2004
+
+
+def compress(response, path="/api/incomes/", accept_encoding="gzip, br, zstd"):
+    request = RequestFactory().get(path, headers={"Accept-Encoding": accept_encoding})
+    return CompressionMiddleware(lambda request: response)(request)
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "br", "zstd"])
+def test_response_compressed(encoding):
+    response = compress(
+        HttpResponse(BODY, content_type="application/json"),
+        accept_encoding=encoding,
+    )
+
+    assert response["Content-Encoding"] == encoding
+    assert response["Vary"] == "Accept-Encoding"
+    assert int(response["Content-Length"]) == len(response.content) < len(BODY)
+    assert DECOMPRESS[encoding](response.content) == BODY
+
+
+def test_response_not_compressed():
+    small = compress(HttpResponse(b"{}"))
+    outside_api = compress(HttpResponse(BODY), path="/users/")
+    encoded = HttpResponse(BODY)
+    encoded["Content-Encoding"] = "br"
+
+    assert "Content-Encoding" not in small
+    # A larger body at the same URL would be encoded, so caches must know.
+    assert small["Vary"] == "Accept-Encoding"
+    assert "Content-Encoding" not in outside_api
+    assert not outside_api.has_header("Vary")
+    assert compress(encoded).content == BODY
+
+
+def test_strong_etag_weakened():
+    response = HttpResponse(BODY)
+    response["ETag"] = '"abc"'
+
+    assert compress(response, accept_encoding="gzip")["ETag"] == 'W/"abc"'
+
+
+def test_streaming_response_compressed_per_chunk():
+    response = compress(StreamingHttpResponse([BODY, BODY]), accept_encoding="gzip")
+    decompressor = zlib.decompressobj(31)
+
+    # Every chunk can be decoded as soon as it arrives.
+    chunks = list(response.streaming_content)
+    assert decompressor.decompress(chunks[0]) == BODY
+    assert decompressor.decompress(b"".join(chunks[1:])) == BODY
+    assert "Content-Length" not in response
+
+
+def test_async_streaming_response_compressed():
+    async def chunks():
+        yield BODY
+        yield BODY
+
+    async def get_response(request):
+        return StreamingHttpResponse(chunks())
+
+    async def fetch():
+        request = RequestFactory().get(
+            "/api/incomes/",
+            headers={"Accept-Encoding": "br"},
+        )
+        response = await CompressionMiddleware(get_response)(request)
+        return b"".join([chunk async for chunk in response.streaming_content])
+
+    assert brotli.decompress(async_to_sync(fetch)()) == BODY + BODY
+
+
+def test_async_large_response_compressed_in_thread(settings):
+    settings.COMPRESSION_OFFLOAD_SIZE = len(BODY)
+    loop_thread = None
+
+    async def get_response(request):
+        nonlocal loop_thread
+        loop_thread = threading.get_ident()
+        return HttpResponse(BODY)
+
+    async def fetch():
+        request = RequestFactory().get(
+            "/api/incomes/",
+            headers={"Accept-Encoding": "gzip"},
+        )
+        return await CompressionMiddleware(get_response)(request)
+
+    with patch.object(Gzip, "compress", side_effect=Gzip.compress) as gzip_compress:
+        response = async_to_sync(fetch)()
+
+    assert gzip.decompress(response.content) == BODY
+    assert gzip_compress.call_count == 1
+    # Compressed off the event loop.
+    assert threading.get_ident() != loop_thread
+
+
+def test_cache_encoded_response_compressed_once():
+    with patch.object(Gzip, "compress", side_effect=Gzip.compress) as gzip_compress:
+        for _ in range(2):
+            response = HttpResponse(BODY)
+            response.cache_encoded = True  # type: ignore[attr-defined]
+            assert (
+                gzip.decompress(compress(response, accept_encoding="gzip").content)
+                == BODY
+            )
+
+    assert gzip_compress.call_count == 1
+
+
+@pytest.mark.django_db
+def test_api_list_compressed(client, user, settings):
+    settings.COMPRESSION_MIN_SIZE = 0
+    Currency.objects.create(
+        code="KES",
+        description="Kenyan Shilling",
+        is_local=True,
+        created_by=user,
+    )
+    client.force_login(user)
+
+    response = client.get(
+        reverse("api:currencies:currency-list"),
+        headers={"Accept-Encoding": "gzip"},
+    )
+
+    assert response["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(response.content))[0]["code"] == "KES"
@@ -0,0 +1,126 @@
+from decimal import Decimal
+from http import HTTPStatus
+
+import pytest
+from django.urls import reverse
+
+from financial_tracker.currencies.models import Currency
+from financial_tracker.currencies.models import ExchangeRate
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def currency(user):
+    Currency.objects.create(
+        code="KES",
+        description="Kenyan Shilling",
+        is_local=True,
+        created_by=user,
+    )
+    return Currency.objects.create(
+        code="USD",
+        description="US Dollar",
+        is_local=False,
+        created_by=user,
+    )
+
+
+def test_unchanged_list_not_serialized(
+    client,
+    currency,
+    settings,
+    django_assert_num_queries,
+):
+    settings.RESPONSE_CACHE_TIMEOUT = 0
+    url = reverse("api:currencies:currency-list")
+    response = client.get(url)
+    assert response["Cache-Control"] == "private, no-cache"
+    assert "Last-Modified" not in response
+
+    # Only the validator aggregate runs.
+    with django_assert_num_queries(1):
+        revalidated = client.get(url, headers={"If-None-Match": response["ETag"]})
+
+    assert revalidated.status_code == HTTPStatus.NOT_MODIFIED
+    assert revalidated["ETag"] == response["ETag"]
+    assert not revalidated.content
+
+
+def test_list_etag_changes_with_rows_and_query(
+    client,
+    currency,
+    user,
+    django_capture_on_commit_callbacks,
+):
+    url = reverse("api:currencies:currency-list")
+    etag = client.get(url)["ETag"]
+
+    assert client.get(url, {"is_local": "true"})["ETag"] != etag
+
+    with django_capture_on_commit_callbacks(execute=True):
+        currency.description = "United States Dollar"
+        currency.save()
+    changed = client.get(url)["ETag"]
+    assert changed != etag
+
+    # A delete leaves MAX(modified_at) as it was; the count changes.
+    with django_capture_on_commit_callbacks(execute=True):
+        Currency.objects.filter(is_local=True).delete()
+    assert (
+        client.get(url, headers={"If-None-Match": changed}).status_code == HTTPStatus.OK
+    )
+
+
+def test_detail_validators(client, currency):
+    url = reverse("api:currencies:currency-detail", args=[currency.pk])
+    response = client.get(url)
+
+    assert response["Last-Modified"]
+    assert (
+        client.get(url, headers={"If-None-Match": response["ETag"]}).status_code
+        == HTTPStatus.NOT_MODIFIED
+    )
+    since = client.get(url, headers={"If-Modified-Since": response["Last-Modified"]})
+    assert since.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_exchange_rate_validators_follow_currency(
+    client,
+    currency,
+    user,
+    django_capture_on_commit_callbacks,
+):
+    rate = ExchangeRate.objects.create(
+        currency=currency,
+        rate=Decimal("150.00"),
+        created_by=user,
+    )
+    list_url = reverse("api:currencies:exchangerate-list")
+    detail_url = reverse("api:currencies:exchangerate-detail", args=[rate.pk])
+    list_etag = client.get(list_url)["ETag"]
+    detail_etag = client.get(detail_url)["ETag"]
+
+    # The rate shows the currency's description.
+    with django_capture_on_commit_callbacks(execute=True):
+        currency.description = "United States Dollar"
+        currency.save()
+
+    assert (
+        client.get(list_url, headers={"If-None-Match": list_etag}).status_code
+        == HTTPStatus.OK
+    )
+    assert (
+        client.get(detail_url, headers={"If-None-Match": detail_etag}).status_code
+        == HTTPStatus.OK
+    )
+
+
+def test_sync_viewset_list(client):
+    url = reverse("api:income:earnedincome-list")
+    etag = client.get(url)["ETag"]
+
+    assert (
+        client.get(url, headers={"If-None-Match": etag}).status_code
+        == HTTPStatus.NOT_MODIFIED
+    )
@@ -0,0 +1,59 @@
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from financial_tracker.core.importtime import by_package
+from financial_tracker.core.importtime import parse_importtime
+
+OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:        40 |         40 |     redis.exceptions
+import time:       300 |        340 |   redis.client
+import time:       500 |        840 | redis
+import time:        20 |         20 |   encodings.idna
+import time:       100 |        120 | financial_tracker.core.cache
+not an importtime line
+"""
+
+
+def test_parse_importtime_links_importers():
+    records = {record.name: record for record in parse_importtime(OUTPUT)}
+
+    assert list(records) == [
+        "redis.exceptions",
+        "redis.client",
+        "redis",
+        "encodings.idna",
+        "financial_tracker.core.cache",
+    ]
+    assert records["redis.client"].self_us == 300  # noqa: PLR2004
+    assert records["redis.client"].cumulative_us == 340  # noqa: PLR2004
+    assert [record.name for record in records["redis.exceptions"].chain()] == [
+        "redis",
+        "redis.client",
+        "redis.exceptions",
+    ]
+    assert records["encodings.idna"].parent is records["financial_tracker.core.cache"]
+    assert records["redis"].parent is None
+
+
+def test_by_package_sums_self_time():
+    assert by_package(parse_importtime(OUTPUT)) == [
+        ("redis", 840, 3),
+        ("financial_tracker", 100, 1),
+        ("encodings", 20, 1),
+    ]
+
+
+def test_importtime_command(capsys):
+    call_command("importtime", "--urls", "--limit", "5")
+    out = capsys.readouterr().out
+
+    assert "modules imported in" in out
+    assert len(out.splitlines()) == 7  # noqa: PLR2004
+
+
+def test_schema_machinery_not_imported_by_urlconf():
+    # Only /api/schema/ and /api/docs/ need it; see lazy_view.
+    with pytest.raises(CommandError, match="not imported at startup"):
+        call_command("importtime", "--urls", "--why", "drf_spectacular.generators")
@@ -0,0 +1,58 @@
+from http import HTTPStatus
+
+import pytest
+from django.urls import reverse
+
+from financial_tracker.core.metrics import record_cache_lookup
+
+TOKEN = "s3cret"  # noqa: S105
+
+
+@pytest.fixture
+def metrics_client(client, settings):
+    settings.METRICS_AUTH_TOKEN = TOKEN
+    client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {TOKEN}"
+    return client
+
+
+@pytest.mark.django_db
+def test_metrics_exposes_view_latency(metrics_client):
+    metrics_client.get(reverse("api:currencies:currency-list"))
+
+    response = metrics_client.get(reverse("metrics"))
+
+    assert response.status_code == HTTPStatus.OK
+    body = response.content.decode()
+    assert (
+        'django_http_request_duration_seconds_count{method="GET",view="currency-list"}'
+        in body
+    )
+    assert 'django_db_queries_total{database="default",view="currency-list"}' in body
+
+
+def test_metrics_counts_cache_lookups(metrics_client):
+    record_cache_lookup("test-cache", hit=True)
+    record_cache_lookup("test-cache", hit=False)
+
+    body = metrics_client.get(reverse("metrics")).content.decode()
+
+    assert 'app_cache_requests_total{cache="test-cache",result="hit"}' in body
+    assert 'app_cache_requests_total{cache="test-cache",result="miss"}' in body
+
+
+def test_metrics_requires_token_when_configured(client, settings):
+    settings.METRICS_AUTH_TOKEN = TOKEN
+    url = reverse("metrics")
+
+    assert client.get(url).status_code == HTTPStatus.FORBIDDEN
+    response = client.get(url, headers={"Authorization": f"Bearer {TOKEN}"})
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_metrics_closed_without_token_unless_debug(client, settings):
+    settings.METRICS_AUTH_TOKEN = ""
+    url = reverse("metrics")
+
+    assert client.get(url).status_code == HTTPStatus.FORBIDDEN
+    settings.DEBUG = True
+    assert client.get(url).status_code == HTTPStatus.OK
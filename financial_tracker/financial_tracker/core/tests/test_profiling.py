@@ -0,0 +1,68 @@
+from http import HTTPStatus
+
+import pytest
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+
+@pytest.mark.django_db
+def test_profile_stored_for_staff(admin_client):
+    url = reverse("api:currencies:currency-list")
+
+    # The client's request id is not trusted as a storage key.
+    response = admin_client.get(
+        url,
+        {"profile": "1"},
+        headers={"X-Request-ID": "req-1"},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    profile_id = response["X-Profile-Id"]
+    assert profile_id != "req-1"
+    profile = admin_client.get(reverse("profile", args=[profile_id])).json()
+    assert profile["path"] == f"{url}?profile=1"
+    assert any("currencies_currency" in query["sql"] for query in profile["queries"])
+
+    collapsed = admin_client.get(
+        reverse("profile", args=[profile_id]),
+        {"format": "collapsed"},
+    )
+    assert collapsed["Content-Type"] == "text/plain"
+
+
+@pytest.mark.django_db
+def test_profile_for_token_authenticated_staff(client, admin_user):
+    token = Token.objects.create(user=admin_user)
+    headers = {"Authorization": f"Token {token.key}"}
+
+    response = client.get(
+        reverse("api:currencies:currency-list"),
+        {"profile": "1"},
+        headers=headers,
+    )
+
+    profile_id = response["X-Profile-Id"]
+    assert (
+        client.get(reverse("profile", args=[profile_id]), headers=headers).status_code
+        == HTTPStatus.OK
+    )
+
+
+@pytest.mark.django_db
+def test_profile_ignored_for_non_staff(client, user):
+    client.force_login(user)
+
+    response = client.get(reverse("api:currencies:currency-list"), {"profile": "1"})
+
+    assert response.status_code == HTTPStatus.OK
+    assert "X-Profile-Id" not in response
+    assert (
+        client.get(reverse("profile", args=["any"])).status_code == HTTPStatus.FORBIDDEN
+    )
+
+
+@pytest.mark.django_db
+def test_profile_without_trigger(admin_client):
+    response = admin_client.get(reverse("api:currencies:currency-list"))
+
+    assert "X-Profile-Id" not in response
@@ -0,0 +1,86 @@
+import datetime
+import uuid
+from decimal import Decimal
+from io import BytesIO
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnList
+
+from financial_tracker.core.api.parsers import ORJSONParser
+from financial_tracker.core.api.renderers import ORJSONRenderer
+
+DATA = ReturnList(  # type: ignore[call-overload]
+    [
+        {
+            "id": 1,
+            "amount": "1234.56",
+            "total": Decimal("0.1"),
+            "created_at": datetime.datetime(
+                2024,
+                1,
+                2,
+                3,
+                4,
+                5,
+                678901,
+                tzinfo=datetime.UTC,
+            ),
+            "date": datetime.date(2024, 1, 2),
+            "time": datetime.time(3, 4, 5, 678901),
+            "duration": datetime.timedelta(hours=1),
+            "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+            "label": gettext_lazy("Income"),
+            "name": "Zoë €\u2028",
+            "nested": {1: [None, True, 1.5]},
+        },
+    ],
+    serializer=None,
+)
+
+
+def test_orjson_renderer_matches_json_renderer():
+    assert ORJSONRenderer().render(DATA) == JSONRenderer().render(DATA)
+
+
+@pytest.mark.parametrize(
+    ("accepted_media_type", "renderer_context"),
+    [("application/json; indent=4", None), ("application/json", {"indent": 2})],
+)
+def test_orjson_renderer_indents_like_json_renderer(
+    accepted_media_type,
+    renderer_context,
+):
+    expected = JSONRenderer().render(DATA, accepted_media_type, renderer_context)
+
+    assert (
+        ORJSONRenderer().render(DATA, accepted_media_type, renderer_context) == expected
+    )
+
+
+def test_orjson_renderer_renders_none_as_empty():
+    assert ORJSONRenderer().render(None) == b""
+
+
+def test_orjson_parser_matches_json_parser():
+    body = JSONRenderer().render({"amount": "10.50", "rate": 1.25, "name": "Zoë"})
+
+    assert ORJSONParser().parse(BytesIO(body)) == JSONParser().parse(BytesIO(body))
+
+
+@pytest.mark.parametrize("body", [b"{", b'{"rate": NaN}', b"\xff"])
+def test_orjson_parser_rejects_invalid_json(body):
+    with pytest.raises(ParseError, match="JSON parse error"):
+        ORJSONParser().parse(BytesIO(body))
+
+
+def test_orjson_parser_decodes_other_charsets():
+    body = '{"name": "Zoë"}'.encode("latin-1")
+
+    assert ORJSONParser().parse(
+        BytesIO(body),
+        parser_context={"encoding": "latin-1"},
+    ) == {"name": "Zoë"}
@@ -0,0 +1,158 @@
+import asyncio
+from decimal import Decimal
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.urls import reverse
+
+from financial_tracker.core.response_cache import bump_version
+from financial_tracker.core.response_cache import single_flight
+from financial_tracker.core.response_cache import version_key
+from financial_tracker.currencies.models import Currency
+from financial_tracker.income.models import EarnedIncome
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def currency(user):
+    Currency.objects.create(
+        code="KES",
+        description="Kenyan Shilling",
+        is_local=True,
+        created_by=user,
+    )
+    return Currency.objects.create(
+        code="USD",
+        description="US Dollar",
+        is_local=False,
+        created_by=user,
+    )
+
+
+def descriptions(response):
+    return {currency["description"] for currency in response.json()}
+
+
+def test_list_served_from_cache(client, currency, django_assert_num_queries):
+    url = reverse("api:currencies:currency-list")
+    response = client.get(url)
+
+    with django_assert_num_queries(0):
+        cached = client.get(url)
+        revalidated = client.get(url, headers={"If-None-Match": response["ETag"]})
+
+    assert cached.json() == response.json()
+    assert cached["ETag"] == response["ETag"]
+    assert cached["Cache-Control"] == "private, no-cache"
+    assert revalidated.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_write_invalidates_after_commit(
+    client,
+    currency,
+    django_capture_on_commit_callbacks,
+):
+    url = reverse("api:currencies:currency-list")
+    client.get(url)
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        currency.description = "United States Dollar"
+        currency.save()
+    # Not yet committed: readers keep the old version.
+    assert "US Dollar" in descriptions(client.get(url))
+
+    for callback in callbacks:
+        callback()
+    assert "United States Dollar" in descriptions(client.get(url))
+
+
+def test_total_income_cached_per_user(
+    client,
+    user,
+    django_user_model,
+    django_capture_on_commit_callbacks,
+):
+    url = reverse("api:income:totalincome")
+    kes = Currency.objects.create(
+        code="KES",
+        description="Kenyan Shilling",
+        is_local=True,
+        created_by=user,
+    )
+    client.force_login(user)
+    assert client.get(url).json() == {"total_income": 0}
+
+    with django_capture_on_commit_callbacks():
+        EarnedIncome.objects.create(  # type: ignore[misc]
+            income_name="Salary",
+            currency=kes,
+            amount=Decimal("100.00"),
+            created_by=user,
+        )
+
+    # Without a bump, the first user's entry stands; another user has none yet.
+    assert client.get(url).json() == {"total_income": 0}
+    client.force_login(django_user_model.objects.create(username="other"))
+    assert Decimal(client.get(url).json()["total_income"]) == Decimal("100.00")
+
+
+def test_bump_version():
+    bump_version(Currency)
+    initial = cache.get(version_key(Currency))
+    assert initial
+
+    bump_version(Currency)
+    assert cache.get(version_key(Currency)) == initial + 1
+
+
+class Compute:
+    def __init__(self, result=("data", {}), delay=0.1):
+        self.result = result
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.result
+
+
+def test_single_flight_coalesces_concurrent_misses():
+    compute = Compute()
+
+    async def requests():
+        return await asyncio.gather(
+            *(single_flight("response:key", [1], compute) for _ in range(10)),
+        )
+
+    assert async_to_sync(requests)() == [("data", {})] * 10
+    assert compute.calls == 1
+
+
+def test_single_flight_serves_stale_while_recomputing():
+    cache.set("response:key", ([1], "old", {}))
+    compute = Compute(("new", {}))
+
+    async def requests():
+        recompute = asyncio.ensure_future(single_flight("response:key", [2], compute))
+        await asyncio.sleep(0)
+        stale = await single_flight("response:key", [2], compute)
+        return stale, await recompute
+
+    assert async_to_sync(requests)() == (("old", {}), ("new", {}))
+    assert compute.calls == 1
+    assert cache.get("response:key") == ([2], "new", {})
+
+
+def test_single_flight_wait_is_bounded(settings):
+    settings.RESPONSE_CACHE_WAIT = 0.1
+    # Another process holds the lock and never finishes.
+    cache.set("response:key:lock", "token")
+    compute = Compute(delay=0)
+
+    assert async_to_sync(single_flight)("response:key", [1], compute) == ("data", {})
+    assert compute.calls == 1
+    assert cache.get("response:key:lock") == "token"
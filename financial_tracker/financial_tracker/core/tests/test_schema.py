@@ -0,0 +1,68 @@
+import json
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.urls import reverse
+
+from financial_tracker.core.api import schema
+
+
+@pytest.fixture(autouse=True)
+def _documents(monkeypatch):
+    monkeypatch.setattr(schema, "_documents", {})
+
+
+def test_schema_served_with_etag(admin_client):
+    url = reverse("api-schema")
+    response = admin_client.get(url)
+
+    assert response.status_code == HTTPStatus.OK
+    assert response["ETag"]
+    assert "no-cache" in response["Cache-Control"]
+    assert response["Content-Type"] == "application/vnd.oai.openapi; charset=utf-8"
+
+    response = admin_client.get(url, headers={"If-None-Match": response["ETag"]})
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_schema_formats_have_their_own_etag(admin_client):
+    url = reverse("api-schema")
+    yaml_response = admin_client.get(url)
+    json_response = admin_client.get(url, {"format": "json"})
+
+    assert json.loads(json_response.content)["info"]["title"] == "Financial Tracker API"
+    assert json_response["ETag"] != yaml_response["ETag"]
+
+
+def test_schema_shared_through_cache_by_code_version(
+    admin_client,
+    settings,
+    monkeypatch,
+):
+    settings.CODE_VERSION = "abc123"
+    first = admin_client.get(reverse("api-schema"))
+    assert cache.get("api-schema:abc123:json")
+
+    # Another process of the same release reads it instead of generating it.
+    monkeypatch.setattr(schema, "_documents", {})
+    monkeypatch.setattr(schema, "render_schema_documents", pytest.fail)
+    second = admin_client.get(reverse("api-schema"))
+
+    assert second.content == first.content
+    assert second["ETag"] == first["ETag"]
+
+
+@pytest.mark.django_db
+def test_schema_requires_admin(client):
+    response = client.get(reverse("api-schema"))
+
+    assert response.status_code == HTTPStatus.FORBIDDEN
+
+
+def test_prerender_schema(tmp_path):
+    call_command("prerender_schema", "--output", tmp_path)
+
+    assert (tmp_path / "schema.yaml").read_text().startswith("openapi:")
+    assert "paths" in json.loads((tmp_path / "schema.json").read_bytes())
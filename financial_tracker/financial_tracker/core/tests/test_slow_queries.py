@@ -0,0 +1,64 @@
+import pytest
+from django.core.management import call_command
+
+from financial_tracker.core.models import SlowQuery
+from financial_tracker.core.slow_queries import fingerprint
+from financial_tracker.core.slow_queries import normalize_sql
+from financial_tracker.core.slow_queries import recorder
+from financial_tracker.currencies.models import Currency
+
+
+def test_normalize_sql_folds_literals_and_lists():
+    sql = (
+        "SELECT * FROM t WHERE a = 'x''y' AND b = 42 /* hint */ "
+        "AND c IN (%s, %s, %s) AND d = %(name)s"
+    )
+
+    assert (
+        normalize_sql(sql)
+        == "SELECT * FROM t WHERE a = ? AND b = ? AND c IN (...) AND d = ?"
+    )
+
+
+def test_fingerprint_ignores_parameter_values():
+    first = normalize_sql("SELECT 1 FROM t WHERE id IN (1, 2)")
+    second = normalize_sql("SELECT 1 FROM t WHERE id IN (3, 4, 5)")
+
+    assert fingerprint(first) == fingerprint(second)
+
+
+def test_normalize_sql_folds_values_lists():
+    sql = "INSERT INTO t (a, b) VALUES (%s, %s), (%s, %s), (%s, %s)"
+
+    assert normalize_sql(sql) == "INSERT INTO t (a, b) VALUES (?, ?), ..."
+
+
+@pytest.mark.django_db
+def test_slow_query_recorded_with_plan(settings, capsys, django_assert_num_queries):
+    settings.SLOW_QUERY_THRESHOLD_MS = 1e-9
+    settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE = 1.0
+    settings.SLOW_QUERY_FLUSH_INTERVAL = 0
+
+    # Recording adds no statements to the request's connection.
+    with django_assert_num_queries(2):
+        list(Currency.objects.filter(code="USD"))
+        list(Currency.objects.filter(code="EUR"))
+    assert not SlowQuery.objects.exists()
+
+    settings.SLOW_QUERY_THRESHOLD_MS = 0
+    assert recorder.flush() >= 2  # noqa: PLR2004
+    query = SlowQuery.objects.get(
+        normalized_sql__contains='FROM "currencies_currency" WHERE',
+    )
+    assert query.calls == 2  # noqa: PLR2004
+    assert "Scan" in query.explain_plan
+    # Parameters, which may be tokens or session keys, are never stored.
+    stored = SlowQuery.objects.values_list(
+        "normalized_sql",
+        "sample_sql",
+        "explain_plan",
+    )
+    assert not any("EUR" in value for row in stored for value in row)
+
+    call_command("slow_queries", "--explain")
+    assert query.fingerprint[:12] in capsys.readouterr().out
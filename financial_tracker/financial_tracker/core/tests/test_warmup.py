@@ -0,0 +1,15 @@
+from financial_tracker.core.warmup import project_templates
+from financial_tracker.core.warmup import warm_up
+
+
+def test_warm_up_does_not_use_the_database():
+    # Runs in the gunicorn master before forking; pytest-django fails any
+    # query made outside a test marked for database access.
+    warm_up()
+
+
+def test_project_templates():
+    templates = set(project_templates())
+
+    assert "base.html" in templates
+    assert "pages/home.html" in templates
@@ -0,0 +1,68 @@
+from functools import cache
+
+from django.conf import settings
+from django.db import transaction
+from django.http import Http404
+from django.http import HttpResponse
+from django.http import HttpResponseForbidden
+from django.http import JsonResponse
+from django.utils.crypto import constant_time_compare
+from django.utils.module_loading import import_string
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET
+
+from .metrics import render_latest
+from .profiling import is_staff
+from .profiling import load_profile
+
+
+@transaction.non_atomic_requests
+@require_GET
+def metrics_view(request):
+    """Expose Prometheus metrics to holders of the bearer token. Without a
+    token configured they are only served with ``DEBUG`` on."""
+    token = settings.METRICS_AUTH_TOKEN
+    if not token:
+        if not settings.DEBUG:
+            return HttpResponseForbidden()
+    else:
+        supplied = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        if not constant_time_compare(supplied, token):
+            return HttpResponseForbidden()
+    body, content_type = render_latest()
+    return HttpResponse(body, content_type=content_type)
+
+
+@require_GET
+def profile_view(request, profile_id):
+    """Return a stored request profile.
+
+    ``?format=collapsed`` returns only the collapsed stacks as plain text so the
+    response can be piped straight into a flamegraph tool.
+    """
+    if not is_staff(request):
+        return HttpResponseForbidden()
+    profile = load_profile(profile_id)
+    if profile is None:
+        raise Http404
+    if request.GET.get("format") == "collapsed":
+        return HttpResponse(profile["collapsed"], content_type="text/plain")
+    return JsonResponse(profile)
+
+
+def lazy_view(view_class, **initkwargs):
+    """Route to the class-based view at ``view_class``, imported on first use.
+
+    For views that pull in heavy modules nothing else needs, like the schema
+    views, so that loading the URLconf does not import them.
+    """
+
+    @cache
+    def load():
+        return import_string(view_class).as_view(**initkwargs)
+
+    @csrf_exempt
+    def view(request, *args, **kwargs):
+        return load()(request, *args, **kwargs)
+
+    return view
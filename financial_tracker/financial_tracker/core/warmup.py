@@ -0,0 +1,53 @@
+"""Work done once in the gunicorn master before workers are forked.
+
+Whatever is imported, compiled or cached here sits in memory pages the workers
+share copy-on-write, instead of being rebuilt by every worker while it serves
+its first requests. See ``gunicorn.conf.py``.
+"""
+
+import logging
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+from django.template import TemplateDoesNotExist
+from django.template.loader import get_template
+from django.urls import get_resolver
+from drf_spectacular.drainage import GENERATOR_STATS
+
+from financial_tracker.core.api.schema import prime_schema_documents
+
+logger = logging.getLogger(__name__)
+
+
+def project_templates():
+    """Names of the templates in the project's own template directories."""
+    for directory in settings.TEMPLATES[0]["DIRS"]:  # type: ignore[attr-defined]
+        root = Path(directory)
+        for path in root.rglob("*.html"):
+            yield path.relative_to(root).as_posix()
+
+
+def warm_up():
+    started = time.perf_counter()
+
+    # Builds the reverse lookup tables of every URLconf, importing all views.
+    get_resolver().reverse_dict  # noqa: B018
+
+    # Schema generation walks every API view and builds its serializer fields,
+    # which imports and caches the DRF and drf-spectacular machinery. The
+    # rendered schema is kept for /api/schema/ to serve.
+    with GENERATOR_STATS.silence():
+        prime_schema_documents()
+
+    # Only the cached loader keeps compiled templates, i.e. when DEBUG is off.
+    for name in project_templates():
+        try:
+            get_template(name)
+        except TemplateDoesNotExist:
+            continue
+
+    # Sockets must not be shared with forked workers.
+    connections.close_all()
+    logger.info("Warm-up finished in %.0fms", (time.perf_counter() - started) * 1000)
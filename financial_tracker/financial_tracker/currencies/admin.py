@@ -1,6 +1,47 @@
 from django.contrib import admin
-from .models import Currency, ExchangeRate
+
+from .anomalies import accept
+from .anomalies import reject
+from .models import CrossRate
+from .models import Currency
+from .models import DailyRate
+from .models import ExchangeRate
+from .models import RateAnomaly
+from .models import RateStats
 
 # Register your models here.
 admin.site.register(Currency)
-admin.site.register(ExchangeRate)
\ No newline at end of file
+admin.site.register(ExchangeRate)
+admin.site.register(CrossRate)
+admin.site.register(DailyRate)
+admin.site.register(RateStats)
+
+
+@admin.register(RateAnomaly)
+class RateAnomalyAdmin(admin.ModelAdmin):
+    """The review queue of anomalous ingested rates."""
+
+    list_display = [
+        "currency",
+        "rate",
+        "expected",
+        "z_score",
+        "quoted_at",
+        "quarantined",
+        "status",
+        "reviewed_by",
+    ]
+    list_filter = ["status", "quarantined", "currency"]
+    readonly_fields = [field.name for field in RateAnomaly._meta.fields]  # noqa: SLF001
+    actions = ["accept_rates", "reject_rates"]
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.action(description="Accept selected rates, writing quarantined ones")
+    def accept_rates(self, request, queryset):
+        self.message_user(request, f"Accepted {accept(queryset, request.user)} rates.")
+
+    @admin.action(description="Reject selected rates, deleting flagged ones")
+    def reject_rates(self, request, queryset):
+        self.message_user(request, f"Rejected {reject(queryset, request.user)} rates.")
@@ -0,0 +1,232 @@
+"""Catch mistyped exchange rates, a misplaced decimal point say, as they are
+ingested, before they reprice income.
+
+Every currency keeps an exponentially weighted mean and variance of its log
+rate in ``RateStats``; in logs a tenfold slip is the same size whatever the
+currency's magnitude. Checking a tick is constant work: its z-score against
+those figures and, when it passes, one incremental update of them. A tick
+beyond ``RATE_ANOMALY_Z_THRESHOLD`` is recorded as a ``RateAnomaly`` for
+review and left out of the statistics. ``RATE_ANOMALY_ACTION`` decides what
+happens to its rate meanwhile: ``"quarantine"`` holds it back until it is
+accepted, ``"flag"`` writes it anyway, and ``"off"`` skips the check.
+
+Rates written one at a time through the API go through ``screen`` in the
+transaction that writes them, with the same outcomes.
+
+Reference rates loaded from files by ``load_rates`` are not screened: they are
+published figures, and years of history loaded at once would drag the
+statistics of the live rates back to old levels.
+
+Nothing is flagged before a currency has ``RATE_ANOMALY_MIN_OBSERVATIONS``
+rates, and the deviation is taken as at least ``RATE_ANOMALY_MIN_STDDEV``, so
+the first move of a rate that has sat still is not an anomaly.
+"""
+
+import math
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from financial_tracker.core.db import copy_rows
+from financial_tracker.core.response_cache import bump_version
+
+from .fixedpoint import RATE_SCALE
+from .fixedpoint import from_scaled_rate
+from .fixedpoint import to_scaled_rate
+from .models import ExchangeRate
+from .models import RateAnomaly
+from .models import RateStats
+
+
+class RateMonitor:
+    """The statistics of ``codes``, locked until the transaction ends, to
+    check a batch of scaled rates against in time order; ``save`` writes them
+    back."""
+
+    def __init__(self, codes):
+        self.alpha = settings.RATE_ANOMALY_ALPHA
+        self.threshold = settings.RATE_ANOMALY_Z_THRESHOLD
+        self.min_observations = settings.RATE_ANOMALY_MIN_OBSERVATIONS
+        self.min_stddev = settings.RATE_ANOMALY_MIN_STDDEV
+        self.stats = {
+            stats.currency_id: (stats.mean, stats.variance, stats.count)
+            for stats in RateStats.objects.select_for_update().filter(
+                currency__in=codes,
+            )
+        }
+        self.changed = set()
+
+    def check(self, code, rate):
+        """``(z-score, expected scaled rate)`` if ``rate`` is an anomaly;
+        otherwise ``None``, after taking it into the statistics."""
+        value = math.log(rate / RATE_SCALE)
+        if code not in self.stats:
+            self.stats[code] = (value, 0.0, 1)
+            self.changed.add(code)
+            return None
+        mean, variance, count = self.stats[code]
+        z_score = (value - mean) / max(math.sqrt(variance), self.min_stddev)
+        if count >= self.min_observations and abs(z_score) > self.threshold:
+            return z_score, round(math.exp(mean) * RATE_SCALE)
+        # Incremental EWMA: no history is read back.
+        difference = value - mean
+        increment = self.alpha * difference
+        self.stats[code] = (
+            mean + increment,
+            (1 - self.alpha) * (variance + difference * increment),
+            count + 1,
+        )
+        self.changed.add(code)
+        return None
+
+    def recentre(self, code, rate):
+        """Take ``rate`` as the currency's level from now on, keeping its
+        variance: a reviewer confirmed the rate really moved."""
+        _, variance, count = self.stats.get(code, (None, 0.0, 0))
+        self.stats[code] = (math.log(rate / RATE_SCALE), variance, count + 1)
+        self.changed.add(code)
+
+    def save(self):
+        RateStats.objects.bulk_create(
+            [
+                RateStats(currency_id=code, mean=mean, variance=variance, count=count)
+                for code, (mean, variance, count) in self.stats.items()
+                if code in self.changed
+            ],
+            update_conflicts=True,
+            unique_fields=["currency"],
+            update_fields=["mean", "variance", "count", "updated_at"],
+        )
+        self.changed.clear()
+
+
+def screen(currency_id, rate, user):
+    """Check a rate about to be written through the API; returns its unsaved
+    ``RateAnomaly`` if it is one, else ``None``. A quarantined rate must not be
+    written. Call it in the transaction that writes the rate, which holds the
+    currency's statistics until it ends."""
+    action = settings.RATE_ANOMALY_ACTION
+    if action == "off":
+        return None
+    scaled = to_scaled_rate(rate)
+    monitor = RateMonitor([currency_id])
+    outcome = monitor.check(currency_id, scaled)
+    monitor.save()
+    if outcome is None:
+        return None
+    z_score, expected = outcome
+    return RateAnomaly(
+        currency_id=currency_id,
+        rate=from_scaled_rate(scaled),
+        expected=from_scaled_rate(expected),
+        z_score=z_score,
+        quarantined=action == "quarantine",
+        created_by=user,
+    )
+
+
+@transaction.atomic
+def accept(anomalies, user):
+    """Accept the pending ``anomalies``, writing those quarantined; returns
+    how many."""
+    pending = list(
+        anomalies.select_for_update()
+        .filter(status=RateAnomaly.PENDING)
+        .order_by("quoted_at"),
+    )
+    now = timezone.now()
+    quarantined = [anomaly for anomaly in pending if anomaly.quarantined]
+    copy_rows(
+        ExchangeRate,
+        ["currency", "rate", "created_by", "created_at", "modified_at"],
+        [
+            (
+                anomaly.currency_id,
+                to_scaled_rate(anomaly.rate),
+                anomaly.created_by_id,
+                anomaly.quoted_at,
+                now,
+            )
+            for anomaly in quarantined
+            if anomaly.effective_date is None
+        ],
+    )
+    # Dated rates replace their day's rate, from when the PUT was made; the
+    # last one quoted wins. A day's rate written since the anomaly was caught,
+    # by a later PUT or load_rates, is newer than it and is kept.
+    days = [
+        (anomaly.currency_id, anomaly.effective_date)
+        for anomaly in quarantined
+        if anomaly.effective_date
+    ]
+    written = {}
+    if days:
+        stored = ExchangeRate.objects.select_for_update().filter(
+            reduce(or_, [Q(currency=code, effective_date=day) for code, day in days]),
+        )
+        written = {
+            (code, day): at
+            for code, day, at in stored.values_list(
+                "currency",
+                "effective_date",
+                "modified_at",
+            )
+        }
+    dated = {}
+    for anomaly in quarantined:
+        key = (anomaly.currency_id, anomaly.effective_date)
+        if (
+            anomaly.effective_date is None
+            or written.get(key, anomaly.created_at) > anomaly.created_at
+        ):
+            continue
+        dated[key] = ExchangeRate(
+            currency_id=anomaly.currency_id,
+            effective_date=anomaly.effective_date,
+            rate=anomaly.rate,
+            created_by_id=anomaly.created_by_id,
+            created_at=anomaly.quoted_at,
+            modified_by_id=anomaly.created_by_id,
+        )
+    ExchangeRate.objects.bulk_create(
+        dated.values(),
+        update_conflicts=True,
+        unique_fields=["currency", "effective_date"],
+        update_fields=["rate", "created_at", "modified_by", "modified_at"],
+    )
+    monitor = RateMonitor({anomaly.currency_id for anomaly in pending})
+    for anomaly in pending:
+        monitor.recentre(anomaly.currency_id, to_scaled_rate(anomaly.rate))
+    monitor.save()
+    RateAnomaly.objects.filter(pk__in=[anomaly.pk for anomaly in pending]).update(
+        status=RateAnomaly.ACCEPTED,
+        reviewed_by=user,
+        reviewed_at=now,
+    )
+    # COPY and bulk_create send no signals.
+    transaction.on_commit(lambda: bump_version(ExchangeRate))
+    return len(pending)
+
+
+@transaction.atomic
+def reject(anomalies, user):
+    """Reject the pending ``anomalies``, deleting the rates of those only
+    flagged; returns how many."""
+    pending = list(anomalies.select_for_update().filter(status=RateAnomaly.PENDING))
+    flagged = [
+        Q(currency=anomaly.currency_id, created_at=anomaly.quoted_at, rate=anomaly.rate)
+        for anomaly in pending
+        if not anomaly.quarantined
+    ]
+    if flagged:
+        ExchangeRate.objects.filter(reduce(or_, flagged)).delete()
+    RateAnomaly.objects.filter(pk__in=[anomaly.pk for anomaly in pending]).update(
+        status=RateAnomaly.REJECTED,
+        reviewed_by=user,
+        reviewed_at=timezone.now(),
+    )
+    return len(pending)
@@ -1,33 +1,160 @@
+from decimal import Decimal
+
 from rest_framework import serializers
-from ..models import Currency, ExchangeRate
+
+from financial_tracker.currencies.fixedpoint import RATE_PLACES
+from financial_tracker.currencies.models import Currency
+from financial_tracker.currencies.models import ExchangeRate
+from financial_tracker.currencies.models import RateAnomaly
+
+
+class RateField(serializers.DecimalField):
+    """A rate with up to eight decimal places, shown with as few as it needs
+    but at least two, as when rates were stored with two."""
+
+    def __init__(self, **kwargs):
+        # 18 digits always fit the scaled BIGINT column.
+        super().__init__(max_digits=18, decimal_places=RATE_PLACES, **kwargs)
+
+    def to_representation(self, value):
+        value = Decimal(value)
+        places = max(2, -value.normalize().as_tuple().exponent)
+        return f"{value:.{places}f}"
+
 
 class CurrencySerializer(serializers.ModelSerializer):
-    created_by = serializers.ReadOnlyField(source='created_by.username')
-    modified_by = serializers.ReadOnlyField(source='modified_by.username')
+    created_by = serializers.ReadOnlyField(source="created_by.username")
+    modified_by = serializers.ReadOnlyField(source="modified_by.username")
+
     def validate(self, data):
         if data.get("is_local", False):
-            if Currency.objects.exclude(pk=self.instance.pk if self.instance else None).filter(is_local=True).exists():
+            if (
+                Currency.objects.exclude(pk=self.instance.pk if self.instance else None)
+                .filter(is_local=True)
+                .exists()
+            ):
                 raise serializers.ValidationError("Only one local currency can exist.")
         elif not Currency.objects.filter(is_local=True).exists():
-            raise serializers.ValidationError("Cannot set this currency as foreign; no local currency exists.")
+            raise serializers.ValidationError(
+                "Cannot set this currency as foreign; no local currency exists.",
+            )
+        if self.instance is not None and "exponent" in data:
+            changed = Currency(
+                code=self.instance.code,  # type: ignore[union-attr]
+                is_local=self.instance.is_local,  # type: ignore[union-attr]
+                exponent=data["exponent"],
+            )
+            if changed.exponent_locked():
+                raise serializers.ValidationError(
+                    {
+                        "exponent": "The exponent cannot change once amounts "
+                        "are stored in minor units of this currency.",
+                    },
+                )
         return data
-    
+
     class Meta:
         model = Currency
-        fields = ['code', 'description', 'is_local','created_by', 'created_at', 'modified_by', 'modified_at']
+        fields = [
+            "code",
+            "description",
+            "is_local",
+            "exponent",
+            "created_by",
+            "created_at",
+            "modified_by",
+            "modified_at",
+        ]
+
 
 class ExchangeRateSerializer(serializers.ModelSerializer):
-    created_by = serializers.ReadOnlyField(source='created_by.username')
-    modified_by = serializers.ReadOnlyField(source='modified_by.username')
-    currency_description = serializers.CharField(source='currency.description', read_only=True)
-    currency_is_local = serializers.CharField(source='currency.is_local', read_only=True)
-    
+    rate = RateField(
+        validators=ExchangeRate._meta.get_field("rate").validators,  # noqa: SLF001
+    )
+    created_by = serializers.ReadOnlyField(source="created_by.username")
+    modified_by = serializers.ReadOnlyField(source="modified_by.username")
+    currency_description = serializers.CharField(
+        source="currency.description",
+        read_only=True,
+    )
+    currency_is_local = serializers.CharField(
+        source="currency.is_local",
+        read_only=True,
+    )
+
     def validate(self, data):
         # Ensure the currency is not local
-        if data['currency'].is_local:
-            raise serializers.ValidationError("Cannot assign exchange rates to the local currency.")
+        if data["currency"].is_local:
+            raise serializers.ValidationError(
+                "Cannot assign exchange rates to the local currency.",
+            )
         return data
 
     class Meta:
         model = ExchangeRate
-        fields = ['id', 'currency', 'currency_description', 'currency_is_local', 'rate', 'created_by', 'created_at', 'modified_by', 'modified_at']
\ No newline at end of file
+        fields = [
+            "id",
+            "currency",
+            "currency_description",
+            "currency_is_local",
+            "rate",
+            "effective_date",
+            "created_by",
+            "created_at",
+            "modified_by",
+            "modified_at",
+        ]
+        # Set through PUT /exchangerates/{code}/{date}/ only.
+        read_only_fields = ["effective_date"]
+
+
+class RateSeriesSerializer(serializers.Serializer):
+    """One bucket of ``series.rate_series``."""
+
+    start = serializers.DateTimeField()
+    open = RateField()
+    high = RateField()
+    low = RateField()
+    close = RateField()
+    mean = RateField()
+    count = serializers.IntegerField()
+
+
+class RateTickSerializer(serializers.Serializer):
+    """One tick posted for buffered ingestion; the view checks the codes."""
+
+    currency = serializers.CharField(max_length=5)
+    rate = RateField(
+        validators=ExchangeRate._meta.get_field("rate").validators,  # noqa: SLF001
+    )
+    at = serializers.DateTimeField(required=False)
+
+
+class DatedRateSerializer(serializers.Serializer):
+    """The body of a PUT of a currency's rate for one day."""
+
+    rate = RateField(
+        validators=ExchangeRate._meta.get_field("rate").validators,  # noqa: SLF001
+    )
+
+
+class RateAnomalySerializer(serializers.ModelSerializer):
+    """A rate written through the API that ``anomalies.screen`` caught."""
+
+    rate = RateField(read_only=True)
+    expected = RateField(read_only=True)
+
+    class Meta:
+        model = RateAnomaly
+        fields = [
+            "id",
+            "currency",
+            "rate",
+            "effective_date",
+            "quoted_at",
+            "expected",
+            "z_score",
+            "quarantined",
+            "status",
+        ]
+        read_only_fields = fields
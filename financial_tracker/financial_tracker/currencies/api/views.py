@@ -1,32 +1,72 @@
-from ..models import Currency, ExchangeRate
-from rest_framework import viewsets
-from .serializers import CurrencySerializer, ExchangeRateSerializer
-from rest_framework.views import APIView
-from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated, AllowAny
-from django_filters.rest_framework import DjangoFilterBackend
-from django.db import IntegrityError
+import logging
+import math
+
+from django.conf import settings
 from django.core.exceptions import ValidationError
-from rest_framework.exceptions import APIException
+from django.db import IntegrityError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from django.utils.dateparse import parse_datetime
+from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import status
-import logging
+from rest_framework.decorators import action
+from rest_framework.exceptions import APIException
+from rest_framework.exceptions import NotFound
+from rest_framework.permissions import AllowAny
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from rest_framework.response import Response
+from rest_framework.serializers import ListSerializer
+from rest_framework.views import APIView
+
+from financial_tracker.core.api.views import AsyncAPIView
+from financial_tracker.core.api.views import AsyncReadModelViewSet
+from financial_tracker.core.response_cache import bump_version
+from financial_tracker.core.response_cache import cache_response
+from financial_tracker.currencies.anomalies import screen
+from financial_tracker.currencies.cache import aget_local_currency_code
+from financial_tracker.currencies.conversion import alatest_rates
+from financial_tracker.currencies.conversion import convert_batch
+from financial_tracker.currencies.conversion import cross_rates
+from financial_tracker.currencies.ingest import BufferFull
+from financial_tracker.currencies.ingest import enqueue
+from financial_tracker.currencies.models import Currency
+from financial_tracker.currencies.models import ExchangeRate
+from financial_tracker.currencies.series import SERIES_INTERVALS
+from financial_tracker.currencies.series import dated_rate_at
+from financial_tracker.currencies.series import rate_series
+
+from .serializers import CurrencySerializer
+from .serializers import DatedRateSerializer
+from .serializers import ExchangeRateSerializer
+from .serializers import RateAnomalySerializer
+from .serializers import RateSeriesSerializer
+from .serializers import RateTickSerializer
 
 logger = logging.getLogger(__name__)
 # Create your views here.
 
-class CurrencyViewSet(viewsets.ModelViewSet):
-    queryset = Currency.objects.all()
+
+class CurrencyViewSet(AsyncReadModelViewSet):
+    queryset = Currency.objects.select_related("created_by", "modified_by")
     serializer_class = CurrencySerializer
     permission_classes = [AllowAny]
     filter_backends = [DjangoFilterBackend]
-    filterset_fields = ['is_local']  # Enable filtering by `is_local`
-    #lookup_field = 'code'  # Use the `code` field as the lookup field
+    filterset_fields = ["is_local"]  # Enable filtering by `is_local`
+    # lookup_field = 'code'  # Use the `code` field as the lookup field
+
+    @cache_response(Currency, per_user=False)
+    async def list(self, request, *args, **kwargs):
+        return await super().list(request, *args, **kwargs)
 
     def perform_create(self, serializer):
         try:
             serializer.save(created_by=self.request.user)
         except IntegrityError:
-            raise APIException("Only one local currency can exist.")  # Use DRF's APIException for a unified response
+            raise APIException(
+                "Only one local currency can exist.",
+            )  # Use DRF's APIException for a unified response
         except ValidationError as e:
             raise APIException(e.message_dict if hasattr(e, "message_dict") else str(e))
 
@@ -38,12 +78,200 @@ class CurrencyViewSet(viewsets.ModelViewSet):
         except ValidationError as e:
             raise APIException(e.message_dict if hasattr(e, "message_dict") else str(e))
 
-class ExchangeRateViewSet(viewsets.ModelViewSet):
-    queryset = ExchangeRate.objects.all()
+
+def screened_response(data, anomaly, status_code=status.HTTP_200_OK, **kwargs):
+    """The response to a rate written through the API: a 202 with the
+    anomaly when the rate was quarantined, otherwise ``data``, with the
+    anomaly it was flagged as if any."""
+    if anomaly is None:
+        return Response(data, status=status_code, **kwargs)
+    if anomaly.quarantined:
+        return Response(
+            {
+                "detail": "The rate is held for review as an anomaly.",
+                "anomaly": RateAnomalySerializer(anomaly).data,
+            },
+            status=status.HTTP_202_ACCEPTED,
+        )
+    return Response(
+        {**data, "anomaly": RateAnomalySerializer(anomaly).data},
+        status=status_code,
+        **kwargs,
+    )
+
+
+class ExchangeRateViewSet(AsyncReadModelViewSet):
+    queryset = ExchangeRate.objects.select_related(
+        "currency",
+        "created_by",
+        "modified_by",
+    )
     serializer_class = ExchangeRateSerializer
+    modified_fields = (
+        "modified_at",
+        "currency__modified_at",
+    )  # The currency's description is shown too.
+
+    @cache_response(ExchangeRate, Currency, per_user=False)
+    async def list(self, request, *args, **kwargs):
+        return await super().list(request, *args, **kwargs)
+
+    @action(detail=False, url_path=r"(?P<code>[A-Z]{3})/series", url_name="series")
+    @cache_response(ExchangeRate, per_user=False)
+    async def series(self, request, code):
+        """Open, high, low, close and mean rate of ``code`` per ``interval``
+        (day, week or month), optionally from ``start`` to ``end`` dates."""
+        interval = request.query_params.get("interval", "day")
+        if interval not in SERIES_INTERVALS:
+            return Response(
+                {"interval": [f'Expected one of {", ".join(SERIES_INTERVALS)}.']},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        bounds = {}
+        for param in ("start", "end"):
+            value = request.query_params.get(param)
+            if value:
+                bounds[param] = parse_date(value)
+                if bounds[param] is None:
+                    return Response(
+                        {param: ["Expected a date, YYYY-MM-DD."]},
+                        status=status.HTTP_400_BAD_REQUEST,
+                    )
+        if not await Currency.objects.filter(code=code).aexists():
+            msg = f"No currency {code}."
+            raise NotFound(msg)
+        buckets = await rate_series(code, interval, **bounds)
+        return Response(
+            {
+                "currency": code,
+                "interval": interval,
+                "buckets": RateSeriesSerializer(buckets, many=True).data,
+            },
+        )
+
+    @action(detail=False, methods=["post"], permission_classes=[IsAuthenticated])
+    @transaction.atomic
+    def ingest(self, request):
+        """Buffer a burst of ``[{"currency", "rate", "at"}, ...]`` ticks to be
+        written in bulk shortly; answers 202, or 503 while the buffer is full.
+        A burst larger than the whole buffer could never fit: 400."""
+        serializer: ListSerializer = ListSerializer(
+            child=RateTickSerializer(),
+            data=request.data,
+            max_length=settings.RATE_INGEST_MAX_PENDING,
+        )
+        serializer.is_valid(raise_exception=True)
+        ticks = serializer.validated_data
+        codes = {tick["currency"] for tick in ticks}
+        foreign = set(
+            Currency.objects.filter(code__in=codes, is_local=False).values_list(
+                "code",
+                flat=True,
+            ),
+        )
+        if unknown := sorted(codes - foreign):
+            return Response(
+                {"currency": [f'No foreign currency {", ".join(unknown)}.']},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            enqueue(ticks, request.user.pk)
+        except BufferFull:
+            return Response(
+                {"detail": "Too many rates waiting to be written; retry shortly."},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={
+                    "Retry-After": str(math.ceil(settings.RATE_INGEST_FLUSH_INTERVAL)),
+                },
+            )
+        return Response({"queued": len(ticks)}, status=status.HTTP_202_ACCEPTED)
+
+    @action(
+        detail=False,
+        methods=["get", "put"],
+        permission_classes=[IsAuthenticatedOrReadOnly],
+        url_path=r"(?P<code>[A-Z]{3})/(?P<effective_date>\d{4}-\d{2}-\d{2})",
+        url_name="dated",
+    )
+    @transaction.atomic
+    def dated(self, request, code, effective_date):
+        """The rate of ``code`` for one day. ``PUT {"rate": ...}`` inserts or
+        updates it in one statement, so repeating a PUT changes nothing."""
+        try:
+            day = parse_date(effective_date)
+        except ValueError:
+            day = None
+        if day is None:
+            return Response(
+                {"effective_date": ["Expected a date, YYYY-MM-DD."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        dated = self.get_queryset().filter(currency=code, effective_date=day)
+        if request.method == "GET":
+            exchange_rate = dated.first()
+            if exchange_rate is None:
+                msg = f"No rate for {code} on {day}."
+                raise NotFound(msg)
+            return Response(self.get_serializer(exchange_rate).data)
+
+        currency = Currency.objects.filter(code=code).first()
+        if currency is None:
+            msg = f"No currency {code}."
+            raise NotFound(msg)
+        if currency.is_local:
+            return Response(
+                {
+                    "currency": [
+                        "Exchange rates cannot be assigned to local currencies.",
+                    ],
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        today = timezone.localdate()
+        if day > today:
+            return Response(
+                {"effective_date": ["Rates cannot be set for future days."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        serializer = DatedRateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        rate = serializer.validated_data["rate"]
+        # Every PUT for today moves the rate to now: a correction is the
+        # latest rate.
+        created_at = dated_rate_at(day)
+        anomaly = screen(code, rate, request.user)
+        if anomaly and anomaly.quarantined:
+            anomaly.quoted_at, anomaly.effective_date = created_at, day
+            anomaly.save()
+            return screened_response(None, anomaly)
+        # INSERT ... ON CONFLICT (currency, effective_date) DO UPDATE.
+        ExchangeRate.objects.bulk_create(
+            [
+                ExchangeRate(
+                    currency=currency,
+                    effective_date=day,
+                    rate=rate,
+                    created_by=request.user,
+                    created_at=created_at,
+                    modified_by=request.user,
+                ),
+            ],
+            update_conflicts=True,
+            unique_fields=["currency", "effective_date"],
+            update_fields=["rate", "created_at", "modified_by", "modified_at"],
+        )
+        # bulk_create sends no signals.
+        transaction.on_commit(lambda: bump_version(ExchangeRate))
+        exchange_rate = dated.get()
+        if anomaly:
+            # Rejecting it deletes the day's rate.
+            anomaly.quoted_at, anomaly.effective_date = exchange_rate.created_at, day
+            anomaly.save()
+        return screened_response(self.get_serializer(exchange_rate).data, anomaly)
+
     permission_classes = [AllowAny]
     filter_backends = [DjangoFilterBackend]
-    filterset_fields = ['currency']  # Enable filtering by `currency`
+    filterset_fields = ["currency"]  # Enable filtering by `currency`
 
     # def perform_create(self, serializer):
     #     # Check if the currency is local before saving
@@ -51,30 +279,213 @@ class ExchangeRateViewSet(viewsets.ModelViewSet):
     #     if currency.is_local:
     #         raise ValidationError("Exchange rates cannot be assigned to local currencies.")
     #     serializer.save(created_by=self.request.user)
-    
+
+    def create(self, request, *args, **kwargs):
+        """Like ``CreateModelMixin.create``, with the rate screened for
+        anomalies: see ``screened_response``."""
+        with transaction.atomic():
+            serializer = self.get_serializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+            anomaly = self.perform_create(serializer)
+        if anomaly and anomaly.quarantined:
+            return screened_response(None, anomaly)
+        return screened_response(
+            serializer.data,
+            anomaly,
+            status.HTTP_201_CREATED,
+            headers=self.get_success_headers(serializer.data),
+        )
+
+    def update(self, request, *args, **kwargs):
+        """Like ``UpdateModelMixin.update``, with a changed rate screened for
+        anomalies: see ``screened_response``."""
+        with transaction.atomic():
+            instance = self.get_object()
+            serializer = self.get_serializer(
+                instance,
+                data=request.data,
+                partial=kwargs.pop("partial", False),
+            )
+            serializer.is_valid(raise_exception=True)
+            anomaly = self.perform_update(serializer)
+        if anomaly and anomaly.quarantined:
+            return screened_response(None, anomaly)
+        return screened_response(serializer.data, anomaly)
+
     def perform_create(self, serializer):
-        currency = serializer.validated_data.get('currency')
+        """Save the rate unless it is quarantined; returns its anomaly, if any."""
+        currency = serializer.validated_data.get("currency")
         if currency.is_local:
-            raise ValidationError({"non_field_errors": ["Exchange rates cannot be assigned to local currencies."]})
-        serializer.save(created_by=self.request.user)
+            raise ValidationError(
+                {
+                    "non_field_errors": [
+                        "Exchange rates cannot be assigned to local currencies.",
+                    ],
+                },
+            )
+        anomaly = screen(
+            currency.pk,
+            serializer.validated_data["rate"],
+            self.request.user,
+        )
+        if anomaly and anomaly.quarantined:
+            anomaly.quoted_at = timezone.now()
+        else:
+            exchange_rate = serializer.save(created_by=self.request.user)
+            if anomaly:
+                anomaly.quoted_at = exchange_rate.created_at
+        if anomaly:
+            anomaly.save()
+        return anomaly
 
     def perform_update(self, serializer):
+        """Save the rate unless a changed rate is quarantined; returns its
+        anomaly, if any. An accepted rate is written as a new one, or as its
+        day's rate for a dated one."""
+        exchange_rate = serializer.instance
+        currency = serializer.validated_data.get("currency", exchange_rate.currency)
         # Check if the currency is local before updating
-        currency = serializer.validated_data.get('currency')
         if currency.is_local:
-            raise ValidationError("Exchange rates cannot be assigned to local currencies.")
-        serializer.save(modified_by=self.request.user)
+            raise ValidationError(
+                "Exchange rates cannot be assigned to local currencies.",
+            )
+        rate = serializer.validated_data.get("rate", exchange_rate.rate)
+        anomaly = None
+        if rate != exchange_rate.rate:
+            anomaly = screen(currency.pk, rate, self.request.user)
+        if anomaly and anomaly.quarantined:
+            anomaly.quoted_at = (
+                exchange_rate.created_at
+                if exchange_rate.effective_date
+                else timezone.now()
+            )
+        else:
+            serializer.save(modified_by=self.request.user)
+            if anomaly:
+                # Rejecting it deletes the rate.
+                anomaly.quoted_at = exchange_rate.created_at
+        if anomaly:
+            anomaly.effective_date = exchange_rate.effective_date
+            anomaly.save()
+        return anomaly
 
-class GetLocalCurrencyAPIView(APIView):
-    def get(self, request):
+
+class GetLocalCurrencyAPIView(AsyncAPIView):
+    async def get(self, request):
         try:
-            local_currency = Currency.objects.get(is_local=True)
-            local_currency_code = local_currency.code
+            local_currency_code = await aget_local_currency_code()
             return Response({"local_currency_code": local_currency_code})
         except Currency.DoesNotExist:
-            #error_message = "No local currency is set in the system."
-            #logger.error(f"GetLocalCurrencyAPIView: {error_message}")
-            return Response({"error": "No local currency is set in the system."}, status=404)
-        except Exception as e:
+            # error_message = "No local currency is set in the system."
+            # logger.error(f"GetLocalCurrencyAPIView: {error_message}")
+            return Response(
+                {"error": "No local currency is set in the system."},
+                status=404,
+            )
+        except Exception:
             logger.exception("Unexpected error in GetLocalCurrencyAPIView")
-            return Response({"error": "An unexpected error occurred."}, status=500)
\ No newline at end of file
+            return Response({"error": "An unexpected error occurred."}, status=500)
+
+
+class CrossRatesAPIView(AsyncAPIView):
+    """Rates between every pair of currencies, through the local currency.
+
+    ``?codes=EUR,GBP,USD`` limits the matrix to those currencies; by default
+    it covers every currency with a rate. ``rates[a][b]`` is how many units of
+    ``b`` one unit of ``a`` buys at the latest rates.
+    """
+
+    permission_classes = [AllowAny]
+
+    @cache_response(ExchangeRate, Currency, per_user=False)
+    async def get(self, request):
+        codes = request.query_params.get("codes")
+        if codes is not None:
+            codes = list(
+                dict.fromkeys(
+                    code.strip().upper() for code in codes.split(",") if code.strip()
+                ),
+            )
+        latest = await alatest_rates(codes)
+        if codes is not None:
+            missing = [code for code in codes if code not in latest]
+            if missing:
+                return Response(
+                    {"codes": [f'No exchange rate for {", ".join(missing)}.']},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            latest = {code: latest[code] for code in codes}
+        else:
+            latest = dict(sorted(latest.items()))
+        matrix = cross_rates(latest)
+        return Response(
+            {
+                "codes": list(latest),
+                "rates": {
+                    source: {target: str(rate) for target, rate in row.items()}
+                    for source, row in matrix.items()
+                },
+            },
+        )
+
+
+def parse_as_of(value):
+    if value is None:
+        return None
+    # A bare date means the rate at the end of that day, so try it first:
+    # parse_datetime would read it as midnight.
+    parsed = parse_date(value) or parse_datetime(value)
+    if parsed is None:
+        raise ValueError
+    return parsed
+
+
+class ConvertBatchAPIView(APIView):
+    """Convert a batch of amounts into the local currency.
+
+    Takes ``{"items": [{"amount": "12.50", "currency": "USD", "as_of":
+    "2025-01-31"}, ...]}``; ``as_of`` is optional and may also be a datetime.
+    Answers with the local amounts in the same order, or a 400 with the errors
+    by item index.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        items = request.data.get("items") if isinstance(request.data, dict) else None
+        if not isinstance(items, list):
+            return Response(
+                {"items": ["Expected a list of items."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        limit = settings.CONVERSION_BATCH_MAX_ITEMS
+        if len(items) > limit:
+            return Response(
+                {"items": [f"At most {limit} items per batch."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        parsed, errors, as_of_values = [], {}, {}
+        for index, item in enumerate(items):
+            try:
+                as_of = item.get("as_of")
+                if as_of not in as_of_values:
+                    as_of_values[as_of] = parse_as_of(as_of)
+                parsed.append((item["amount"], item["currency"], as_of_values[as_of]))
+            except (AttributeError, KeyError, TypeError, ValueError):
+                errors[str(index)] = [
+                    "Expected an object with amount, currency and optionally as_of.",
+                ]
+        if errors:
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            results = convert_batch(parsed)
+        except ValidationError as e:
+            return Response(
+                e.message_dict
+                if hasattr(e, "error_dict")
+                else {"non_field_errors": e.messages},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response({"results": [str(amount) for amount in results]})
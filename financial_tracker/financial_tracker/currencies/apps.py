@@ -1,8 +1,14 @@
+import contextlib
+
 from django.apps import AppConfig
 from django.utils.translation import gettext_lazy as _
 
 
 class CurrenciesConfig(AppConfig):
-    default_auto_field = 'django.db.models.BigAutoField'
-    name = 'financial_tracker.currencies'
-    verbose_name = _("Currencies")
\ No newline at end of file
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "financial_tracker.currencies"
+    verbose_name = _("Currencies")
+
+    def ready(self):
+        with contextlib.suppress(ImportError):
+            import financial_tracker.currencies.signals  # noqa: F401
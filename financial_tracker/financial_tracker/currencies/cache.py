@@ -0,0 +1,39 @@
+from django.core.cache import cache as default_cache
+
+from financial_tracker.core.cache import get_async_cache
+from financial_tracker.core.metrics import record_cache_lookup
+
+from .models import Currency
+
+LOCAL_CURRENCY_KEY = "currencies:local-currency"
+LOCAL_EXPONENT_KEY = "currencies:local-exponent"
+LOCAL_CURRENCY_TIMEOUT = 60 * 60
+
+
+async def aget_local_currency_code():
+    """Code of the local currency, cached until any currency is saved or deleted.
+
+    Raises ``Currency.DoesNotExist`` when no local currency is set.
+    """
+    cache = get_async_cache()
+    code = await cache.aget(LOCAL_CURRENCY_KEY)
+    record_cache_lookup("local_currency", hit=code is not None)
+    if code is None:
+        code = (await Currency.objects.only("code").aget(is_local=True)).code
+        await cache.aset(LOCAL_CURRENCY_KEY, code, LOCAL_CURRENCY_TIMEOUT)
+    return code
+
+
+def get_local_currency_exponent():
+    """Minor-unit exponent of the local currency, cached like its code.
+
+    Raises ``Currency.DoesNotExist`` when no local currency is set.
+    """
+    exponent = default_cache.get(LOCAL_EXPONENT_KEY)
+    record_cache_lookup("local_currency_exponent", hit=exponent is not None)
+    if exponent is None:
+        exponent = Currency.objects.values_list("exponent", flat=True).get(
+            is_local=True,
+        )
+        default_cache.set(LOCAL_EXPONENT_KEY, exponent, LOCAL_CURRENCY_TIMEOUT)
+    return exponent
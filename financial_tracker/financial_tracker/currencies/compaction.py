@@ -0,0 +1,171 @@
+"""Collapse exchange-rate ticks past the retention window into daily rows.
+
+Every batch covers up to ``batch_size`` ticks of one currency, a range of
+``created_at``, and commits on its own: it summarises the ticks into
+``DailyRate`` rows, merging with any row already there for the day, and
+deletes the range. The state lives entirely in the tables, so an interrupted
+run resumes where it stopped. Each currency's latest tick is never
+compacted: conversions at the latest rate read it. Nor are dated rates, those
+with an ``effective_date``.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection
+from django.db import transaction
+from django.utils import timezone
+
+from financial_tracker.core.response_cache import bump_version
+
+from .fixedpoint import divide
+from .fixedpoint import from_scaled_rate
+from .fixedpoint import to_scaled_rate
+from .models import DailyRate
+from .models import ExchangeRate
+from .series import day_start
+from .series import merge_buckets
+from .series import tick_buckets
+
+SUMMARY_FIELDS = [
+    "open",
+    "high",
+    "low",
+    "close",
+    "mean",
+    "count",
+    "opened_at",
+    "closed_at",
+]
+
+
+def retention_cutoff(keep_days):
+    """Start of the oldest day whose ticks are kept."""
+    return day_start(timezone.localdate() - timedelta(days=keep_days))
+
+
+def latest_ticks():
+    """The pk of each currency's latest tick, by currency code."""
+    latest = ExchangeRate.objects.order_by("currency", "-created_at", "-pk").distinct(
+        "currency",
+    )
+    return dict(latest.values_list("currency", "pk"))
+
+
+def compactable(code, latest, cutoff):
+    # Dated rates are one a day already, and stay upsertable by their date.
+    return ExchangeRate.objects.filter(
+        currency=code,
+        created_at__lt=cutoff,
+        effective_date=None,
+    ).exclude(pk=latest)
+
+
+def compact(cutoff, *, batch_size=None):
+    """Compact every tick before ``cutoff`` batch by batch, yielding
+    ``(code, first day, last day, ticks)`` after each commit."""
+    batch_size = batch_size or settings.RATE_COMPACTION_BATCH_SIZE
+    # Ticks only arrive after the latest, so one look at the table is enough:
+    # each window starts after the previous one.
+    for code, latest in sorted(latest_ticks().items()):
+        ticks = compactable(code, latest, cutoff).order_by("created_at")
+        start = ticks.values_list("created_at", flat=True).first()
+        while start is not None:
+            # The window ends at the batch_size-th tick, or with the ticks.
+            window = ticks.filter(created_at__gte=start).values_list(
+                "created_at",
+                flat=True,
+            )
+            end = window[batch_size - 1 : batch_size].first() or cutoff - timedelta(
+                microseconds=1,
+            )
+            count = compact_batch(code, latest, start, end)
+            yield code, timezone.localdate(start), timezone.localdate(end), count
+            start = (
+                ticks.filter(created_at__gt=end)
+                .values_list("created_at", flat=True)
+                .first()
+            )
+
+
+def summary(row):
+    """A ``tick_buckets`` or ``DailyRate`` row in bucket form, scaled."""
+    return {
+        "bucket": row["bucket"],
+        "open": to_scaled_rate(row["open"]),
+        "high": to_scaled_rate(row["high"]),
+        "low": to_scaled_rate(row["low"]),
+        "close": to_scaled_rate(row["close"]),
+        "total": int(row["total"]),
+        "count": row["count"],
+        "opened_at": row["opened_at"],
+        "closed_at": row["closed_at"],
+    }
+
+
+@transaction.atomic
+def compact_batch(code, latest, start, end):
+    """Compact ``code``'s ticks from ``start`` to ``end``, both included, but
+    ``latest``; returns how many."""
+    ticks = ExchangeRate.objects.filter(
+        currency=code,
+        created_at__range=(start, end),
+        effective_date=None,
+    )
+    ticks = ticks.exclude(pk=latest)
+    days = {}
+    for row in tick_buckets(ticks, "day"):
+        days[timezone.localdate(row["bucket"])] = summary(row)
+    existing = DailyRate.objects.select_for_update().filter(
+        currency=code,
+        date__in=list(days),
+    )
+    for daily in existing:
+        row = {field: getattr(daily, field) for field in SUMMARY_FIELDS}
+        row.update(bucket=daily.date, total=to_scaled_rate(daily.mean) * daily.count)
+        days[daily.date] = merge_buckets(days[daily.date], summary(row))
+
+    DailyRate.objects.bulk_create(
+        [
+            DailyRate(
+                currency_id=code,
+                date=date,
+                open=from_scaled_rate(row["open"]),
+                high=from_scaled_rate(row["high"]),
+                low=from_scaled_rate(row["low"]),
+                close=from_scaled_rate(row["close"]),
+                mean=from_scaled_rate(divide(row["total"], row["count"])),
+                count=row["count"],
+                opened_at=row["opened_at"],
+                closed_at=row["closed_at"],
+            )
+            for date, row in days.items()
+        ],
+        update_conflicts=True,
+        unique_fields=["currency", "date"],
+        update_fields=SUMMARY_FIELDS,
+    )
+    # Plain SQL: a queryset delete would send a post_delete signal per tick,
+    # so cached responses are invalidated once here instead. The ticks go as
+    # a range on the (currency, created_at) index, rather than a list of pks.
+    meta = ExchangeRate._meta  # noqa: SLF001
+    table = connection.ops.quote_name(meta.db_table)
+    currency, created_at, effective_date, pk = (
+        connection.ops.quote_name(column)
+        for column in (
+            meta.get_field("currency").column,
+            meta.get_field("created_at").column,
+            meta.get_field("effective_date").column,
+            meta.pk.column,
+        )
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {table} WHERE {currency} = %s "  # noqa: S608
+            f"AND {created_at} BETWEEN %s AND %s "
+            f"AND {effective_date} IS NULL AND {pk} <> %s",
+            [code, start, end, latest],
+        )
+        count = cursor.rowcount
+    transaction.on_commit(lambda: bump_version(ExchangeRate))
+    return count
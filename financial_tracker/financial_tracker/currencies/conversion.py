@@ -0,0 +1,252 @@
+"""Convert many amounts into the local currency at once.
+
+``convert_batch`` loads every rate a batch needs with a single query, then
+converts the amounts group by group: all items in a group share a rate and
+exponents, so each needs one multiplication and one rounded division on
+Python integers. Integers rather than NumPy arrays, because minor units times
+scaled rates overflow 64 bits long before amounts get unrealistic.
+
+``cross_rates`` derives the rate between any two currencies from their latest
+rates against the local currency, which every stored rate is quoted in.
+"""
+
+import operator
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import date
+from datetime import datetime
+from datetime import time
+from datetime import timedelta
+from decimal import InvalidOperation
+from functools import reduce
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.db.models import Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .fixedpoint import RATE_SCALE
+from .fixedpoint import divide
+from .fixedpoint import from_minor
+from .fixedpoint import from_scaled_rate
+from .fixedpoint import to_minor
+from .fixedpoint import to_scaled_rate
+from .models import Currency
+from .models import DailyRate
+from .models import ExchangeRate
+from .triangulation import conversion_path
+
+
+def rate_cutoff(as_of, now):
+    """The latest ``created_at`` of a rate that applies ``as_of``: a date means
+    its end in the current time zone, ``None`` means ``now``."""
+    if as_of is None:
+        return now
+    if isinstance(as_of, datetime):
+        return as_of if timezone.is_aware(as_of) else timezone.make_aware(as_of)
+    if isinstance(as_of, date):
+        return timezone.make_aware(
+            datetime.combine(as_of + timedelta(days=1), time.min),
+        ) - timedelta(microseconds=1)
+    msg = f"as_of must be a date, a datetime or None, not {type(as_of).__name__}."
+    raise TypeError(msg)
+
+
+def load_rates(cutoffs_by_currency):
+    """Scaled rates by ``(code, cutoff)`` for ``{code: {cutoff, ...}}``.
+
+    One query fetches, per currency, the rates from the one in effect at its
+    earliest cutoff up to its latest, and another the days compacted into
+    ``DailyRate`` rows over the same span: a compacted day's open applies from
+    its first tick and its close from its last. Pairs with no rate yet are
+    left out.
+    """
+    tick_conditions, day_conditions = [], []
+    for code, cutoffs in cutoffs_by_currency.items():
+        first, last = min(cutoffs), max(cutoffs)
+        tick_in_effect = (
+            ExchangeRate.objects.filter(
+                currency=code,
+                created_at__lte=first,
+            )
+            .order_by("-created_at", "-pk")
+            .values("created_at")[:1]
+        )
+        tick_conditions.append(
+            Q(
+                currency=code,
+                created_at__lte=last,
+                created_at__gte=Coalesce(Subquery(tick_in_effect), first),
+            ),
+        )
+        day_in_effect = (
+            DailyRate.objects.filter(
+                currency=code,
+                closed_at__lte=first,
+            )
+            .order_by("-closed_at")
+            .values("closed_at")[:1]
+        )
+        day_conditions.append(
+            Q(
+                currency=code,
+                opened_at__lte=last,
+                closed_at__gte=Coalesce(Subquery(day_in_effect), first),
+            ),
+        )
+    if not tick_conditions:
+        return {}
+
+    points = defaultdict(list)
+    ticks = (
+        ExchangeRate.objects.filter(reduce(operator.or_, tick_conditions))
+        .order_by("currency", "created_at", "pk")
+        .values_list("currency", "created_at", "rate")
+    )
+    for code, created_at, rate in ticks.iterator(chunk_size=10_000):
+        points[code].append((created_at, to_scaled_rate(rate)))
+    days = (
+        DailyRate.objects.filter(reduce(operator.or_, day_conditions))
+        .order_by()
+        .values_list("currency", "opened_at", "open", "closed_at", "close")
+    )
+    for code, opened_at, open_rate, closed_at, close_rate in days.iterator(
+        chunk_size=10_000,
+    ):
+        points[code] += [
+            (opened_at, to_scaled_rate(open_rate)),
+            (closed_at, to_scaled_rate(close_rate)),
+        ]
+
+    resolved = {}
+    for code, cutoffs in cutoffs_by_currency.items():
+        # Stable, so the later of two rates at the same instant wins as before.
+        series = sorted(points[code], key=operator.itemgetter(0))
+        times = [created_at for created_at, _ in series]
+        for cutoff in cutoffs:
+            index = bisect_right(times, cutoff) - 1
+            if index >= 0:
+                resolved[code, cutoff] = series[index][1]
+    return resolved
+
+
+def convert_batch(items):  # noqa: C901, PLR0912, PLR0915
+    """Convert ``(amount, currency code, as_of)`` items into local currency.
+
+    ``as_of`` is a date, a datetime or ``None`` for the latest rate. Returns
+    ``Decimal`` amounts in input order. Raises ``ValidationError`` with a
+    message per failing item index, e.g. an unknown currency, an amount with
+    too many decimal places or no rate in effect at ``as_of``. A currency with
+    no rate of its own is converted at the latest rates through others, see
+    ``triangulation``, but only when ``as_of`` is ``None``.
+    """
+    items = list(items)
+    codes = {code for _, code, _ in items}
+    currencies = {
+        currency.code: currency for currency in Currency.objects.filter(code__in=codes)
+    }
+    try:
+        local = Currency.objects.only("exponent").get(is_local=True)
+    except Currency.DoesNotExist:
+        msg = "No local currency is set."
+        raise ValidationError(msg) from None
+
+    now = timezone.now()
+    cutoffs: dict = {}
+    errors = {}
+    units = [0] * len(items)
+    groups = defaultdict(list)
+    for index, (amount, code, as_of) in enumerate(items):
+        currency = currencies.get(code)
+        if currency is None:
+            errors[str(index)] = [f"Unknown currency {code!r}."]
+            continue
+        try:
+            units[index] = to_minor(amount, currency.exponent)
+            if currency.is_local:
+                cutoff = None
+            elif as_of in cutoffs:
+                cutoff = cutoffs[as_of]
+            else:
+                cutoff = cutoffs[as_of] = rate_cutoff(as_of, now)
+        except (InvalidOperation, TypeError, ValueError) as error:
+            errors[str(index)] = [str(error) or f"Invalid amount {amount!r}."]
+            continue
+        groups[code, cutoff].append(index)
+
+    cutoffs_by_currency = defaultdict(set)
+    for code, cutoff in groups:
+        if cutoff is not None:
+            cutoffs_by_currency[code].add(cutoff)
+    rates = load_rates(cutoffs_by_currency)
+
+    results = [None] * len(items)
+    for (code, cutoff), indexes in groups.items():
+        if cutoff is None:
+            for index in indexes:
+                results[index] = from_minor(units[index], local.exponent)
+            continue
+        rate = rates.get((code, cutoff))
+        if rate is None and cutoff == now:
+            # Like CurrencyConversionMixin: through other currencies. Their
+            # paths use the latest rates, so only the latest conversions can.
+            path = conversion_path(code)
+            rate = path and path[1]
+        if rate is None:
+            for index in indexes:
+                errors[str(index)] = [
+                    f"No exchange rate for {code} as of {cutoff:%Y-%m-%d %H:%M:%S}.",
+                ]
+            continue
+        # convert() with the exponent shift folded into one factor per group.
+        shift = local.exponent - currencies[code].exponent
+        multiplier = rate * 10 ** max(shift, 0)
+        denominator = RATE_SCALE * 10 ** max(-shift, 0)
+        for index in indexes:
+            results[index] = from_minor(
+                divide(units[index] * multiplier, denominator),
+                local.exponent,
+            )
+
+    if errors:
+        raise ValidationError(errors)
+    return results
+
+
+async def alatest_rates(codes=None):
+    """Latest scaled rate per currency, ``{code: rate}``, for ``codes`` or all
+    currencies; the local currency is at ``RATE_SCALE`` and currencies with no
+    rate yet are left out."""
+    currencies = Currency.objects.filter(is_local=True)
+    rates = ExchangeRate.objects.order_by("currency", "-created_at", "-pk").distinct(
+        "currency",
+    )
+    if codes is not None:
+        currencies = currencies.filter(code__in=codes)
+        rates = rates.filter(currency__in=codes)
+    latest = {
+        code: RATE_SCALE async for code in currencies.values_list("code", flat=True)
+    }
+    async for code, rate in rates.values_list("currency", "rate"):
+        latest[code] = to_scaled_rate(rate)
+    return latest
+
+
+def cross_rates(latest):
+    """Units of each currency per unit of each other, ``{from: {to: rate}}``,
+    from ``{code: scaled rate}`` against the local currency.
+
+    Each rate is ``from``'s rate over ``to``'s, rounded half to even to the
+    eight places rates are stored with.
+    """
+    codes = list(latest)
+    numerators = [latest[code] * RATE_SCALE for code in codes]
+    denominators = [latest[code] for code in codes]
+    return {
+        source: {
+            target: from_scaled_rate(divide(numerator, denominator))
+            for target, denominator in zip(codes, denominators, strict=False)
+        }
+        for source, numerator in zip(codes, numerators, strict=False)
+    }
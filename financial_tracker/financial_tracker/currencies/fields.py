@@ -0,0 +1,62 @@
+from decimal import Decimal
+from decimal import InvalidOperation
+
+from django import forms
+from django.core.exceptions import ValidationError
+from django.db import models
+from django.db.models.expressions import Combinable
+from django.utils.functional import cached_property
+
+from .fixedpoint import RATE_PLACES
+from .fixedpoint import from_scaled_rate
+from .fixedpoint import to_decimal
+from .fixedpoint import to_scaled_rate
+
+
+class RateField(models.BigIntegerField):
+    """An exchange rate, read and written as a ``Decimal`` with ``RATE_PLACES``
+    decimal places and stored as a scaled integer.
+
+    Lookups such as ``rate__gte=Decimal('1.5')`` and ``Min``/``Max`` work in
+    rate units; ``Sum`` and ``Avg`` see the scaled integers.
+    """
+
+    description = "Exchange rate stored as a scaled integer"
+    # Read by django-stubs: model attributes hold Decimals, not integers.
+    _pyi_private_set_type: Decimal | float | str | Combinable  # type: ignore[assignment]
+    _pyi_private_get_type: Decimal  # type: ignore[assignment]
+    _pyi_lookup_exact_type: Decimal | int | str  # type: ignore[assignment]
+
+    def from_db_value(self, value, expression, connection):
+        return None if value is None else from_scaled_rate(value)
+
+    def to_python(self, value):
+        if value is None:
+            return value
+        try:
+            return to_decimal(value)
+        except (InvalidOperation, TypeError, ValueError) as err:
+            raise ValidationError(
+                self.error_messages["invalid"],
+                code="invalid",
+                params={"value": value},
+            ) from err
+
+    def get_prep_value(self, value):
+        value = models.Field.get_prep_value(self, value)
+        return None if value is None else to_scaled_rate(self.to_python(value))
+
+    @cached_property
+    def validators(self):
+        # Not BigIntegerField's range validators: they would compare rates
+        # with the bounds of the scaled column.
+        return [*self.default_validators, *self._validators]  # type: ignore[attr-defined]
+
+    def formfield(self, **kwargs):  # type: ignore[override]
+        return super().formfield(
+            **{
+                "form_class": forms.DecimalField,
+                "decimal_places": RATE_PLACES,
+                **kwargs,
+            },
+        )
@@ -0,0 +1,65 @@
+"""Exact money arithmetic on integers.
+
+Amounts are stored as integer minor units of their currency: cents for a
+currency with an exponent of 2, whole yen for JPY's 0. Exchange rates are
+stored as integers scaled by ``RATE_SCALE``. A conversion multiplies and
+divides integers only and rounds once, half to even, which is also how the
+old ``DecimalField`` columns rounded on save.
+
+``Decimal`` only appears at the edges: parsing input and showing amounts.
+"""
+
+from decimal import ROUND_HALF_EVEN
+from decimal import Decimal
+
+RATE_PLACES = 8
+RATE_SCALE = 10**RATE_PLACES
+
+
+def to_decimal(value):
+    # Floats go through their shortest repr: Decimal(0.1) has 55 places.
+    return Decimal(repr(value)) if isinstance(value, float) else Decimal(value)
+
+
+def to_minor(amount, exponent):
+    """``amount`` in minor units; raises ``ValueError`` when it has more
+    decimal places than the currency."""
+    units = to_decimal(amount).scaleb(exponent)
+    if units != units.to_integral_value():
+        msg = f"{amount} has more than {exponent} decimal places."
+        raise ValueError(msg)
+    return int(units)
+
+
+def from_minor(units, exponent):
+    return Decimal(units).scaleb(-exponent)
+
+
+def to_scaled_rate(rate):
+    """``rate`` as an integer of ``1 / RATE_SCALE`` units, rounded half to even."""
+    return int(to_decimal(rate).scaleb(RATE_PLACES).to_integral_value(ROUND_HALF_EVEN))
+
+
+def from_scaled_rate(scaled):
+    return Decimal(scaled).scaleb(-RATE_PLACES)
+
+
+def divide(numerator, denominator):
+    """``numerator / denominator`` rounded half to even, for a positive denominator."""
+    quotient, remainder = divmod(numerator, denominator)
+    twice = 2 * remainder
+    if twice > denominator or (twice == denominator and quotient % 2):
+        quotient += 1
+    return quotient
+
+
+def convert(units, scaled_rate, from_exponent, to_exponent):
+    """Convert ``units`` minor units at ``scaled_rate`` target units per source
+    unit into minor units of a currency with ``to_exponent``."""
+    numerator = units * scaled_rate
+    denominator = RATE_SCALE
+    if to_exponent >= from_exponent:
+        numerator *= 10 ** (to_exponent - from_exponent)
+    else:
+        denominator *= 10 ** (from_exponent - to_exponent)
+    return divide(numerator, denominator)
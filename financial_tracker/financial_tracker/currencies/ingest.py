@@ -0,0 +1,350 @@
+"""Write-behind buffering for bursts of exchange-rate ticks.
+
+Posted ticks are appended to a buffer instead of being saved one transaction
+at a time. ``flush`` reads a batch back, keeps only the last tick per currency
+per ``RATE_INGEST_COALESCE_SECONDS`` interval, and writes the rest with one
+``COPY`` in one transaction; the ``flush_rates`` command does so every
+``RATE_INGEST_FLUSH_INTERVAL`` seconds, which bounds how long a tick waits.
+A buffer holding ``RATE_INGEST_MAX_PENDING`` ticks refuses more until it has
+been flushed.
+
+``RATE_INGEST_BUFFER`` picks the buffer: ``"redis"``, a Redis stream shared
+by every process, or ``"local"``, a queue in the process that took the ticks,
+which flushes it itself once a flush is due or on a timer. Local needs no
+Redis, for development and tests; it loses what is queued when the process
+stops.
+
+A batch that cannot be written, for any reason but a lost database
+connection, is moved to the buffer's dead letters so the ticks behind it
+still drain; see ``drain``.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from decimal import Decimal
+from itertools import islice
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.db import InterfaceError
+from django.db import OperationalError
+from django.db import connections
+from django.db import transaction
+from django.utils import timezone
+
+from financial_tracker.core.db import copy_rows
+from financial_tracker.core.metrics import RATE_INGEST_TICKS
+from financial_tracker.core.response_cache import bump_version
+
+from .anomalies import RateMonitor
+from .fixedpoint import from_scaled_rate
+from .fixedpoint import to_scaled_rate
+from .models import Currency
+from .models import ExchangeRate
+from .models import RateAnomaly
+
+logger = logging.getLogger(__name__)
+
+STREAM_KEY = "currencies:rate-ingest"
+DEAD_LETTER_KEY = "currencies:rate-ingest:dead"
+
+
+class BufferFull(Exception):  # noqa: N818
+    """The buffer holds ``RATE_INGEST_MAX_PENDING`` ticks; retry once flushed."""
+
+
+class LocalBuffer:
+    """Ticks queued in this process, flushed by it as well: by ``enqueue``
+    once a flush is due, and ``flush_after`` seconds after the first tick
+    queued since the last flush by a timer, so the end of a burst is not left
+    waiting for the next one. Without ``flush_after``, only by ``enqueue``."""
+
+    flushes_inline = True
+
+    def __init__(self, flush_after=None):
+        # (id, tick, time.monotonic() when queued), oldest first.
+        self._entries: deque[tuple[int, dict, float]] = deque()
+        self._lock = threading.Lock()
+        self._flushing = threading.Lock()
+        self._last_id = 0
+        self.flush_after = flush_after
+        self._timer = None
+        self.dead_letters = []
+
+    def append(self, ticks, max_pending):
+        with self._lock:
+            if len(self._entries) + len(ticks) > max_pending:
+                raise BufferFull
+            queued_at = time.monotonic()
+            for tick in ticks:
+                self._last_id += 1
+                self._entries.append((self._last_id, tick, queued_at))
+            if self.flush_after and self._timer is None:
+                self._timer = threading.Timer(self.flush_after, self._flush_on_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush_pending(self):
+        """Drain the buffer; one flush at a time, or two could write the same
+        ticks."""
+        with self._flushing:
+            drain(self)
+
+    def _flush_on_timer(self):
+        with self._lock:
+            self._timer = None
+        try:
+            self.flush_pending()
+        except DatabaseError:
+            logger.exception("Could not flush buffered rate ticks")
+        finally:
+            # The timer thread's own connection.
+            connections.close_all()
+
+    def read(self, count):
+        with self._lock:
+            return [
+                (entry_id, tick) for entry_id, tick, _ in islice(self._entries, count)
+            ]
+
+    def ack(self, ids):
+        acked = set(ids)
+        with self._lock:
+            # Batches are read and acknowledged oldest first.
+            while self._entries and self._entries[0][0] in acked:
+                self._entries.popleft()
+
+    def pending(self):
+        return len(self._entries)
+
+    def dead_letter(self, ticks):
+        # Kept for inspection until the process stops.
+        self.dead_letters.extend(ticks)
+
+    def due(self):
+        """Whether a batch is full or the oldest tick has waited long enough."""
+        with self._lock:
+            if not self._entries:
+                return False
+            waited = time.monotonic() - self._entries[0][2]
+        return (
+            self.pending() >= settings.RATE_INGEST_BATCH_SIZE
+            or waited >= settings.RATE_INGEST_FLUSH_INTERVAL
+        )
+
+
+class RedisStreamBuffer:
+    """Ticks in a Redis stream, flushed by the ``flush_rates`` command. Run a
+    single flusher: entries are deleted once written rather than handed out
+    through a consumer group."""
+
+    flushes_inline = False
+
+    def __init__(self, url):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+
+    def append(self, ticks, max_pending):
+        # Checked, then appended: concurrent bursts may overshoot a little.
+        # redis-py types its replies as sync or async alike.
+        if self.client.xlen(STREAM_KEY) + len(ticks) > max_pending:  # type: ignore[operator]
+            raise BufferFull
+        pipeline = self.client.pipeline(transaction=False)
+        for tick in ticks:
+            pipeline.xadd(STREAM_KEY, {"tick": json.dumps(tick)})
+        pipeline.execute()
+
+    def read(self, count):
+        entries = self.client.xrange(STREAM_KEY, count=count)
+        return [(entry_id, json.loads(fields[b"tick"])) for entry_id, fields in entries]  # type: ignore[union-attr]
+
+    def ack(self, ids):
+        if ids:
+            self.client.xdel(STREAM_KEY, *ids)
+
+    def pending(self):
+        return self.client.xlen(STREAM_KEY)
+
+    def dead_letter(self, ticks):
+        pipeline = self.client.pipeline(transaction=False)
+        for tick in ticks:
+            pipeline.xadd(DEAD_LETTER_KEY, {"tick": json.dumps(tick)})
+        pipeline.execute()
+
+
+_buffers: dict[str, LocalBuffer | RedisStreamBuffer] = {}
+
+
+def get_buffer():
+    kind = settings.RATE_INGEST_BUFFER
+    if kind not in _buffers:
+        if kind == "local":
+            _buffers[kind] = LocalBuffer(
+                flush_after=settings.RATE_INGEST_FLUSH_INTERVAL,
+            )
+        elif kind == "redis":
+            _buffers[kind] = RedisStreamBuffer(settings.REDIS_URL)
+        else:
+            msg = f'Unknown RATE_INGEST_BUFFER {kind!r}; use "local" or "redis".'
+            raise ValueError(msg)
+    return _buffers[kind]
+
+
+def dead_letter(buffer, *, batch_size=None):
+    """Move the batch ``flush`` would write next to the buffer's dead
+    letters; returns how many ticks it held."""
+    entries = buffer.read(batch_size or settings.RATE_INGEST_BATCH_SIZE)
+    buffer.dead_letter([tick for _, tick in entries])
+    buffer.ack([entry_id for entry_id, _ in entries])
+    RATE_INGEST_TICKS.labels(outcome="dead_lettered").inc(len(entries))
+    return len(entries)
+
+
+def drain(buffer):
+    """Flush batch by batch until less than a batch is left; returns
+    ``(read, written)``.
+
+    A batch that fails is logged and dead-lettered, and draining goes on. A
+    lost connection is raised instead: the batch is fine and is retried by
+    the next drain.
+    """
+    read = written = 0
+    while True:
+        try:
+            batch_read, batch_written = flush(buffer)
+        except (InterfaceError, OperationalError):
+            raise
+        except Exception:
+            logger.exception(
+                "Could not write a batch of rate ticks; moving it to the dead letters",
+            )
+            batch_read, batch_written = dead_letter(buffer), 0
+        read += batch_read
+        written += batch_written
+        if batch_read < settings.RATE_INGEST_BATCH_SIZE:
+            return read, written
+
+
+def enqueue(ticks, user_id):
+    """Buffer ``ticks``, dicts of a ``currency`` code, a ``Decimal`` ``rate``
+    and optionally the aware datetime ``at`` it was quoted; ``at`` defaults to
+    now. Raises ``BufferFull`` when they do not fit."""
+    now = timezone.now()
+    buffer = get_buffer()
+    try:
+        buffer.append(
+            [
+                {
+                    "currency": tick["currency"],
+                    "rate": str(tick["rate"]),
+                    "at": (tick.get("at") or now).isoformat(),
+                    "user": user_id,
+                }
+                for tick in ticks
+            ],
+            settings.RATE_INGEST_MAX_PENDING,
+        )
+    except BufferFull:
+        RATE_INGEST_TICKS.labels(outcome="refused").inc(len(ticks))
+        raise
+    RATE_INGEST_TICKS.labels(outcome="queued").inc(len(ticks))
+    if buffer.flushes_inline and buffer.due():
+        # Once the caller's transaction commits: a flush commits on its own
+        # before it acknowledges its batch.
+        transaction.on_commit(buffer.flush_pending)
+
+
+def coalesce(ticks, interval):
+    """The last tick of each currency in each ``interval`` seconds, by ``at``
+    and then by arrival."""
+    latest: dict[tuple[str, int], tuple[datetime, dict]] = {}
+    for tick in ticks:
+        at = datetime.fromisoformat(tick["at"])
+        key = (tick["currency"], int(at.timestamp() // interval))
+        if key not in latest or at >= latest[key][0]:
+            latest[key] = (at, tick)
+    return list(latest.values())
+
+
+def flush(buffer=None, *, batch_size=None):
+    """Write one batch of buffered ticks; returns ``(read, written)``.
+
+    Ticks for currencies that are unknown or local by now are dropped with a
+    warning, and the rest are checked for anomalies; see ``anomalies``. The
+    batch is removed from the buffer only once it is committed.
+    """
+    buffer = buffer or get_buffer()
+    entries = buffer.read(batch_size or settings.RATE_INGEST_BATCH_SIZE)
+    if not entries:
+        return 0, 0
+    ticks = coalesce(
+        [tick for _, tick in entries],
+        settings.RATE_INGEST_COALESCE_SECONDS,
+    )
+    action = settings.RATE_ANOMALY_ACTION
+    with transaction.atomic():
+        foreign = set(
+            Currency.objects.filter(
+                code__in={tick["currency"] for _, tick in ticks},
+                is_local=False,
+            ).values_list("code", flat=True),
+        )
+        monitor = RateMonitor(foreign) if action != "off" else None
+        rows, anomalies = [], []
+        # Oldest first, as the statistics follow the rates in time.
+        for at, tick in sorted(ticks, key=lambda item: item[0]):
+            if tick["currency"] not in foreign:
+                logger.warning(
+                    "Dropping rate tick for unknown or local currency %s",
+                    tick["currency"],
+                )
+                continue
+            rate = to_scaled_rate(Decimal(tick["rate"]))
+            if monitor and (anomaly := monitor.check(tick["currency"], rate)):
+                z_score, expected = anomaly
+                logger.warning(
+                    "Rate %s for %s is %.1f deviations from %s",
+                    tick["rate"],
+                    tick["currency"],
+                    z_score,
+                    from_scaled_rate(expected),
+                )
+                anomalies.append(
+                    RateAnomaly(
+                        currency_id=tick["currency"],
+                        rate=from_scaled_rate(rate),
+                        quoted_at=at,
+                        expected=from_scaled_rate(expected),
+                        z_score=z_score,
+                        quarantined=action == "quarantine",
+                        created_by_id=tick["user"],
+                    ),
+                )
+                if action == "quarantine":
+                    continue
+            rows.append((tick["currency"], rate, tick["user"], at, at))
+
+        # COPY rather than bulk_create: one streamed statement per batch.
+        written = copy_rows(
+            ExchangeRate,
+            ["currency", "rate", "created_by", "created_at", "modified_at"],
+            rows,
+        )
+        RateAnomaly.objects.bulk_create(anomalies)
+        if monitor:
+            monitor.save()
+        # COPY sends no signals.
+        transaction.on_commit(lambda: bump_version(ExchangeRate))
+    buffer.ack([entry_id for entry_id, _ in entries])
+    held = sum(anomaly.quarantined for anomaly in anomalies)
+    RATE_INGEST_TICKS.labels(outcome="coalesced").inc(len(entries) - len(ticks))
+    RATE_INGEST_TICKS.labels(outcome="written").inc(written)
+    RATE_INGEST_TICKS.labels(outcome="flagged").inc(len(anomalies) - held)
+    RATE_INGEST_TICKS.labels(outcome="quarantined").inc(held)
+    RATE_INGEST_TICKS.labels(outcome="dropped").inc(len(ticks) - written - held)
+    return len(entries), written
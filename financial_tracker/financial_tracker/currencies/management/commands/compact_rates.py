@@ -0,0 +1,45 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from financial_tracker.currencies.compaction import compact
+from financial_tracker.currencies.compaction import retention_cutoff
+
+
+class Command(BaseCommand):
+    help = (
+        "Collapse exchange-rate ticks older than the retention window into daily "
+        "open/high/low/close rows. Commits batch by batch; rerun to resume."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--keep-days",
+            type=int,
+            default=settings.RATE_RETENTION_DAYS,
+            help="Days of ticks to keep at full resolution.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.RATE_COMPACTION_BATCH_SIZE,
+            help="Ticks of one currency per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = retention_cutoff(options["keep_days"])
+        started = time.monotonic()
+        total = 0
+        for code, first_day, last_day, count in compact(
+            cutoff,
+            batch_size=options["batch_size"],
+        ):
+            total += count
+            self.stdout.write(f"{code} {first_day} to {last_day}: {count} ticks.")
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Compacted {total} ticks before {cutoff:%Y-%m-%d} in {elapsed:.1f}s.",
+            ),
+        )
@@ -0,0 +1,53 @@
+import logging
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import InterfaceError
+from django.db import OperationalError
+from django.db import close_old_connections
+
+from financial_tracker.currencies.ingest import drain
+from financial_tracker.currencies.ingest import get_buffer
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Write buffered exchange-rate ticks to the database every "
+        "RATE_INGEST_FLUSH_INTERVAL seconds. Run one per deployment. A batch "
+        "that cannot be written is logged and moved to the dead letters."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Flush what is buffered now, then exit.",
+        )
+
+    def handle(self, *args, **options):
+        buffer = get_buffer()
+        while True:
+            started = time.monotonic()
+            try:
+                read, written = drain(buffer)
+            except (InterfaceError, OperationalError):
+                if options["once"]:
+                    raise
+                # The database is away; the ticks wait in the buffer.
+                logger.exception("Could not reach the database to write rate ticks")
+                read = written = 0
+            if read:
+                elapsed = time.monotonic() - started
+                self.stdout.write(f"Wrote {written} of {read} ticks in {elapsed:.2f}s.")
+            if options["once"]:
+                return
+            close_old_connections()
+            time.sleep(
+                max(
+                    0.0,
+                    settings.RATE_INGEST_FLUSH_INTERVAL - (time.monotonic() - started),
+                ),
+            )
@@ -0,0 +1,139 @@
+import shutil
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.db import close_old_connections
+
+from financial_tracker.currencies.reference_rates import INVALID_FILE_ERRORS
+from financial_tracker.currencies.reference_rates import RateLoader
+from financial_tracker.currencies.reference_rates import parse_file
+
+
+class Command(BaseCommand):
+    help = (
+        "Load reference-rate files, ECB XML or CSV, into exchange rates. With "
+        "--watch, load every file dropped into a folder, once it has stopped "
+        "changing, and move it to processed/ or failed/ beside it."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "files",
+            nargs="*",
+            type=Path,
+            help=".xml or .csv files to load.",
+        )
+        parser.add_argument(
+            "--watch",
+            type=Path,
+            nargs="?",
+            const=settings.REFERENCE_RATES_DROP_FOLDER or None,
+            help="Folder to poll for files; REFERENCE_RATES_DROP_FOLDER when no folder "
+            "is given.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=settings.REFERENCE_RATES_POLL_INTERVAL,
+            help="Seconds between polls of the watched folder.",
+        )
+        parser.add_argument(
+            "--base",
+            default="EUR",
+            help="Currency the files quote against.",
+        )
+        parser.add_argument(
+            "--user",
+            help="Username recorded as the creator; the first superuser by default.",
+        )
+        parser.add_argument(
+            "--chunk-days",
+            type=int,
+            default=500,
+            help="Days of rates per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        if not options["files"] and not options["watch"]:
+            msg = "Give files to load or a folder to --watch."
+            raise CommandError(msg)
+        users = get_user_model().objects.order_by("pk")
+        user = (
+            (
+                users.filter(username=options["user"])
+                if options["user"]
+                else users.filter(is_superuser=True)
+            )
+            .values_list("pk", flat=True)
+            .first()
+        )
+        if user is None:
+            msg = "No such user; pass --user."
+            raise CommandError(msg)
+        self.loader_options = {
+            "user_id": user,
+            "base": options["base"],
+            "chunk_days": options["chunk_days"],
+        }
+
+        for path in options["files"]:
+            try:
+                self.load(path)
+            except INVALID_FILE_ERRORS as error:
+                msg = f"{path.name}: {error}"
+                raise CommandError(msg) from error
+        if options["watch"]:
+            self.watch(options["watch"], options["interval"])
+
+    def load(self, path):
+        started = time.monotonic()
+        stats = RateLoader(**self.loader_options).load(parse_file(path))
+        summary = (
+            ", ".join(
+                f"{count} {what}" for what, count in sorted(stats.items()) if count
+            )
+            or "no rates"
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{path.name}: {summary} in {time.monotonic() - started:.1f}s.",
+            ),
+        )
+
+    def watch(self, folder, interval):
+        if not folder.is_dir():
+            msg = f"{folder} is not a folder."
+            raise CommandError(msg)
+        processed, failed = folder / "processed", folder / "failed"
+        processed.mkdir(exist_ok=True)
+        failed.mkdir(exist_ok=True)
+        self.stdout.write(f"Watching {folder} every {interval:g}s.")
+        # Size and modification time of each file at the previous poll: a
+        # file is loaded once they hold still between two polls, so one still
+        # being copied in is left alone. Writers that can should copy to a
+        # name such as rates.xml.tmp, which is ignored, and rename it.
+        sizes: dict[Path, tuple[int, int]] = {}
+        while True:
+            polled, sizes = sizes, {}
+            for path in sorted(folder.iterdir()):
+                if not path.is_file() or path.suffix.lower() not in (".xml", ".csv"):
+                    continue
+                stat = path.stat()
+                sizes[path] = (stat.st_size, stat.st_mtime_ns)
+                if polled.get(path) != sizes[path]:
+                    continue
+                try:
+                    self.load(path)
+                except INVALID_FILE_ERRORS as error:
+                    # Days before the error are committed; reloading a fixed
+                    # file rewrites only what differs.
+                    self.stderr.write(f"{path.name}: {error}")
+                    shutil.move(path, failed / path.name)
+                else:
+                    shutil.move(path, processed / path.name)
+            close_old_connections()
+            time.sleep(interval)
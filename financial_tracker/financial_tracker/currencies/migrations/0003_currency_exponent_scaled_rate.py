@@ -0,0 +1,91 @@
+import django.core.validators
+import financial_tracker.currencies.fields
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.migrations.exceptions import IrreversibleError
+from django.db.models import F
+from django.db.models.functions import Cast, Round
+
+from financial_tracker.currencies.fixedpoint import RATE_SCALE
+
+# Rates from here on round to 1,000,000.00, past the old rate column,
+# NUMERIC(8, 2).
+OLD_RATE_LIMIT = Decimal('999999.995')
+
+
+def scale_rates(apps, schema_editor):
+    ExchangeRate = apps.get_model('currencies', 'ExchangeRate')
+    ExchangeRate.objects.update(rate_scaled=Cast(F('rate') * RATE_SCALE, models.BigIntegerField()))
+
+
+def check_rates_fit(apps, schema_editor):
+    """Refuse to unapply while rates of 999999.995 or more, which round past
+    the old NUMERIC(8, 2) column, are stored; runs before any column is
+    touched."""
+    ExchangeRate = apps.get_model('currencies', 'ExchangeRate')
+    count = ExchangeRate.objects.filter(rate__gte=OLD_RATE_LIMIT).count()
+    if count:
+        raise IrreversibleError(
+            f'Cannot unapply currencies.0003: {count} exchange rates of 1,000,000 or more do not fit the old '
+            f'NUMERIC(8, 2) rate column. Correct or delete them first.'
+        )
+
+
+def unscale_rates(apps, schema_editor):
+    # Back to two decimal places: rates stored with more are rounded.
+    ExchangeRate = apps.get_model('currencies', 'ExchangeRate')
+    ExchangeRate.objects.update(
+        rate=Round(Cast(F('rate_scaled'), models.DecimalField(max_digits=20, decimal_places=0)) / RATE_SCALE, 2),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('currencies', '0002_alter_currency_created_by_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='currency',
+            name='exponent',
+            field=models.PositiveSmallIntegerField(default=2, validators=[django.core.validators.MaxValueValidator(4)]),
+        ),
+        migrations.AddField(
+            model_name='exchangerate',
+            name='rate_scaled',
+            field=financial_tracker.currencies.fields.RateField(null=True),
+        ),
+        # Nullable first, so that unapplying can add the column back before
+        # filling it.
+        migrations.AlterField(
+            model_name='exchangerate',
+            name='rate',
+            field=models.DecimalField(decimal_places=2, max_digits=8, null=True, validators=[django.core.validators.MinValueValidator(0.1)]),
+        ),
+        migrations.RunPython(scale_rates, unscale_rates),
+        migrations.RemoveIndex(
+            model_name='exchangerate',
+            name='currencies__rate_62a87f_idx',
+        ),
+        migrations.RemoveField(
+            model_name='exchangerate',
+            name='rate',
+        ),
+        migrations.RenameField(
+            model_name='exchangerate',
+            old_name='rate_scaled',
+            new_name='rate',
+        ),
+        migrations.AlterField(
+            model_name='exchangerate',
+            name='rate',
+            field=financial_tracker.currencies.fields.RateField(validators=[django.core.validators.MinValueValidator(0.1)]),
+        ),
+        migrations.AddIndex(
+            model_name='exchangerate',
+            index=models.Index(fields=['rate'], name='currencies__rate_62a87f_idx'),
+        ),
+        migrations.RunPython(migrations.RunPython.noop, check_rates_fit),
+    ]
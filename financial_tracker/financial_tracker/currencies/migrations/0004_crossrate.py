@@ -0,0 +1,38 @@
+# Generated by Django 5.0.10 on 2026-10-19 15:48
+
+import django.core.validators
+import django.db.models.deletion
+import financial_tracker.currencies.fields
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('currencies', '0003_currency_exponent_scaled_rate'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CrossRate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rate', financial_tracker.currencies.fields.RateField(validators=[django.core.validators.MinValueValidator(Decimal('1E-8'))])),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('modified_at', models.DateTimeField(auto_now=True)),
+                ('base', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='currencies.currency')),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('modified_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('quote', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='currencies.currency')),
+            ],
+            options={
+                'verbose_name': 'Cross Rate',
+                'verbose_name_plural': 'Cross Rates',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['base', 'quote', '-created_at'], name='currencies__base_id_617298_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.10 on 2026-10-19 15:51
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('currencies', '0004_crossrate'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='exchangerate',
+            index=models.Index(fields=['currency', 'created_at'], name='currencies__currenc_64f4fc_idx'),
+        ),
+    ]
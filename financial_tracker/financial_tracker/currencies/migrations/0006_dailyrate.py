@@ -0,0 +1,41 @@
+# Generated by Django 5.0.10 on 2026-10-19 15:52
+
+import django.db.models.deletion
+import financial_tracker.currencies.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('currencies', '0005_exchangerate_currency_created_at_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyRate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('open', financial_tracker.currencies.fields.RateField()),
+                ('high', financial_tracker.currencies.fields.RateField()),
+                ('low', financial_tracker.currencies.fields.RateField()),
+                ('close', financial_tracker.currencies.fields.RateField()),
+                ('mean', financial_tracker.currencies.fields.RateField()),
+                ('count', models.PositiveIntegerField()),
+                ('opened_at', models.DateTimeField()),
+                ('closed_at', models.DateTimeField()),
+                ('currency', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='currencies.currency')),
+            ],
+            options={
+                'verbose_name': 'Daily Rate',
+                'verbose_name_plural': 'Daily Rates',
+                'ordering': ['-date'],
+                'indexes': [models.Index(fields=['currency', 'closed_at'], name='currencies__currenc_71ec23_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dailyrate',
+            constraint=models.UniqueConstraint(fields=('currency', 'date'), name='unique_daily_rate'),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.0.10 on 2026-10-19 16:02
+
+import django.db.models.deletion
+import financial_tracker.currencies.fields
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('currencies', '0006_dailyrate'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RateStats',
+            fields=[
+                ('currency', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to='currencies.currency')),
+                ('mean', models.FloatField()),
+                ('variance', models.FloatField()),
+                ('count', models.PositiveIntegerField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Rate Statistics',
+                'verbose_name_plural': 'Rate Statistics',
+            },
+        ),
+        migrations.CreateModel(
+            name='RateAnomaly',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rate', financial_tracker.currencies.fields.RateField()),
+                ('quoted_at', models.DateTimeField()),
+                ('expected', financial_tracker.currencies.fields.RateField()),
+                ('z_score', models.FloatField()),
+                ('quarantined', models.BooleanField()),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('accepted', 'Accepted'), ('rejected', 'Rejected')], default='pending', max_length=8)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('reviewed_at', models.DateTimeField(blank=True, null=True)),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('currency', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='currencies.currency')),
+                ('reviewed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Rate Anomaly',
+                'verbose_name_plural': 'Rate Anomalies',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', '-created_at'], name='currencies__status_b55431_idx')],
+            },
+        ),
+    ]
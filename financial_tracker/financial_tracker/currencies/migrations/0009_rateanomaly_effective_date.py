@@ -0,0 +1,18 @@
+# Generated by Django 5.0.10 on 2026-10-19 16:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('currencies', '0008_exchangerate_effective_date'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rateanomaly',
+            name='effective_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.10 on 2026-10-19 16:43
+
+import django.core.validators
+import financial_tracker.currencies.fields
+from decimal import Decimal
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('currencies', '0009_rateanomaly_effective_date'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='exchangerate',
+            name='rate',
+            field=financial_tracker.currencies.fields.RateField(validators=[django.core.validators.MinValueValidator(Decimal('1E-8'))]),
+        ),
+    ]
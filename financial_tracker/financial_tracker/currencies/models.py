@@ -1,78 +1,159 @@
-from django.db import models
+from decimal import Decimal
+
+from django.conf import settings
 from django.core.exceptions import ValidationError
-from django.core.validators import RegexValidator
+from django.core.validators import MaxValueValidator
 from django.core.validators import MinValueValidator
-from django.conf import settings
-from decimal import Decimal
+from django.core.validators import RegexValidator
+from django.db import models
+from django.utils import timezone
+
+from .fields import RateField
+
 User = settings.AUTH_USER_MODEL
 
+
 # Create your models here.
 class Currency(models.Model):
     code = models.CharField(
         max_length=5,
         validators=[
-            RegexValidator(r"^[A-Z]{3}$", "Currency code must be 3 uppercase letters.")
+            RegexValidator(r"^[A-Z]{3}$", "Currency code must be 3 uppercase letters."),
         ],
-        primary_key=True
+        primary_key=True,
     )
     description = models.CharField(max_length=100, null=False, blank=False)
     is_local = models.BooleanField(null=False, blank=False)
+    # Decimal places of the minor unit (ISO 4217): 2 for cents, 0 for JPY.
+    exponent = models.PositiveSmallIntegerField(
+        default=2,
+        validators=[MaxValueValidator(4)],
+    )
     created_by = models.ForeignKey(
-        User, on_delete=models.PROTECT, related_name='ccreator', related_query_name='ccreator'
+        User,
+        on_delete=models.PROTECT,
+        related_name="ccreator",
+        related_query_name="ccreator",
     )
     created_at = models.DateTimeField(auto_now_add=True)
     modified_by = models.ForeignKey(
-        User, on_delete=models.PROTECT, related_name='cmodifier', related_query_name='cmodifier', blank=True, null=True
+        User,
+        on_delete=models.PROTECT,
+        related_name="cmodifier",
+        related_query_name="cmodifier",
+        blank=True,
+        null=True,
     )
     modified_at = models.DateTimeField(auto_now=True)
 
     def __str__(self) -> str:
-        return f'{self.code} - {self.description}'
+        return f"{self.code} - {self.description}"
 
     def clean(self):
-        if self.is_local and Currency.objects.exclude(pk=self.pk).filter(is_local=True).exists():
+        if (
+            self.is_local
+            and Currency.objects.exclude(pk=self.pk).filter(is_local=True).exists()
+        ):
             raise ValidationError("Only one local currency is allowed.")
         if not self.is_local and not Currency.objects.filter(is_local=True).exists():
-            raise ValidationError("Cannot set this currency as foreign; no local currency exists.")
+            raise ValidationError(
+                "Cannot set this currency as foreign; no local currency exists.",
+            )
+        if not self._state.adding and self.exponent_locked():
+            raise ValidationError(
+                {
+                    "exponent": "The exponent cannot change once amounts are "
+                    "stored in minor units of this currency.",
+                },
+            )
 
     def save(self, *args, **kwargs):
         self.full_clean()
         super().save(*args, **kwargs)
 
+    def exponent_locked(self):
+        """Whether ``exponent`` differs from the stored one while amounts in
+        minor units depend on it: incomes in this currency, or any income for
+        the local currency. Changing it would reprice them tenfold per step."""
+        stored = (
+            Currency.objects.filter(pk=self.pk)
+            .values_list("exponent", flat=True)
+            .first()
+        )
+        if stored is None or stored == self.exponent:
+            return False
+        for relation in self._meta.related_objects:  # type: ignore[attr-defined]
+            model = relation.related_model
+            if hasattr(model, "amount_minor"):
+                amounts = (
+                    model.objects.all()
+                    if self.is_local
+                    else model.objects.filter(**{relation.field.name: self})
+                )
+                if amounts.exists():
+                    return True
+        return False
+
     class Meta:
         constraints = [
             models.UniqueConstraint(
                 fields=["is_local"],
                 condition=models.Q(is_local=True),
-                name="unique_local_currency"
-            )
+                name="unique_local_currency",
+            ),
         ]
         indexes = [
             models.Index(fields=["is_local"]),
-            models.Index(fields=["code"])
+            models.Index(fields=["code"]),
         ]
         verbose_name_plural = "Currencies"
 
+
 class ExchangeRate(models.Model):
-    currency = models.ForeignKey(Currency, on_delete=models.PROTECT, related_name='currency', related_query_name='currency', blank=False, null=False)
-    rate = models.DecimalField(
-    max_digits=8,
-    decimal_places=2,
-    validators=[MinValueValidator(Decimal(0.1))])
-    created_by = models.ForeignKey(User, on_delete=models.PROTECT, related_name='ercreator', related_query_name='ercreator')
-    created_at = models.DateTimeField(auto_now_add=True)
-    modified_by = models.ForeignKey(User, on_delete=models.PROTECT, related_name='ermodifier', related_query_name='ermodifier', blank=True, null=True)
+    currency = models.ForeignKey(
+        Currency,
+        on_delete=models.PROTECT,
+        related_name="currency",
+        related_query_name="currency",
+        blank=False,
+        null=False,
+    )
+    # Local currency units per unit of ``currency``, with eight decimal places.
+    rate = RateField(validators=[MinValueValidator(Decimal("0.00000001"))])
+    # The day a dated rate, at most one per currency and day, is the rate for;
+    # ticks through the day have none.
+    effective_date = models.DateField(blank=True, null=True)
+    created_by = models.ForeignKey(
+        User,
+        on_delete=models.PROTECT,
+        related_name="ercreator",
+        related_query_name="ercreator",
+    )
+    # When the rate took effect. A default rather than auto_now_add, so that
+    # bulk upserts of dated rates can backdate it.
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+    modified_by = models.ForeignKey(
+        User,
+        on_delete=models.PROTECT,
+        related_name="ermodifier",
+        related_query_name="ermodifier",
+        blank=True,
+        null=True,
+    )
     modified_at = models.DateTimeField(auto_now=True)
-    
+
     # def __str__(self) -> str:
     #     return f"Exchange rate for {self.currency} as at {self.created_at.strftime('%I:%M:%S %p')} on {self.created_at.strftime('%B')}, {self.created_at.strftime('%d')}, {self.created_at.strftime('%Y')}"
-    
+
     def __str__(self) -> str:
         return f"Exchange rate for {self.currency.code} on {self.created_at:%B %d, %Y at %I:%M %p}"
+
     def clean(self):
         """Ensure that the currency is not local."""
         if self.currency.is_local:
-            raise ValidationError("Exchange rates cannot be assigned to a local currency.")
+            raise ValidationError(
+                "Exchange rates cannot be assigned to a local currency.",
+            )
 
     def save(self, *args, **kwargs):
         """Override save to run validation."""
@@ -80,10 +161,174 @@ class ExchangeRate(models.Model):
         super().save(*args, **kwargs)
 
     class Meta:
+        constraints = [
+            # NULLs are distinct, so ticks never conflict; a plain rather than
+            # partial constraint, so that ON CONFLICT can name its columns.
+            models.UniqueConstraint(
+                fields=["currency", "effective_date"],
+                name="unique_dated_exchange_rate",
+            ),
+        ]
         indexes = [
             models.Index(fields=["currency"]),
             models.Index(fields=["rate"]),
+            # Rates of one currency in time order: as-of lookups and series.
+            models.Index(fields=["currency", "created_at"]),
         ]
         ordering = ["-created_at"]
         verbose_name = "Exchange Rate"
-        verbose_name_plural = "Exchange Rates"
\ No newline at end of file
+        verbose_name_plural = "Exchange Rates"
+
+
+class CrossRate(models.Model):
+    """A rate between two currencies, for currencies with no rate against the
+    local currency; conversions are triangulated through these."""
+
+    base = models.ForeignKey(Currency, on_delete=models.PROTECT, related_name="+")
+    quote = models.ForeignKey(Currency, on_delete=models.PROTECT, related_name="+")
+    # Units of ``quote`` per unit of ``base``, with eight decimal places.
+    rate = RateField(validators=[MinValueValidator(Decimal("0.00000001"))])
+    created_by = models.ForeignKey(User, on_delete=models.PROTECT, related_name="+")
+    created_at = models.DateTimeField(auto_now_add=True)
+    modified_by = models.ForeignKey(
+        User,
+        on_delete=models.PROTECT,
+        related_name="+",
+        blank=True,
+        null=True,
+    )
+    modified_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["base", "quote", "-created_at"]),
+        ]
+        ordering = ["-created_at"]
+        verbose_name = "Cross Rate"
+        verbose_name_plural = "Cross Rates"
+
+    def __str__(self) -> str:
+        return (
+            f"Cross rate {self.base_id}/{self.quote_id} "
+            f"on {self.created_at:%B %d, %Y at %I:%M %p}"
+        )
+
+    def save(self, *args, **kwargs):
+        self.full_clean()
+        super().save(*args, **kwargs)
+
+    def clean(self):
+        if self.base_id == self.quote_id:
+            msg = "A cross rate needs two different currencies."
+            raise ValidationError(msg)
+
+
+class DailyRate(models.Model):
+    """A currency's rates on one day, summarised by ``compact_rates`` once the
+    ticks are past the retention window.
+
+    ``open`` was in effect from ``opened_at`` and ``close`` from ``closed_at``,
+    the times of the first and last ticks, which is what as-of lookups use.
+    """
+
+    currency = models.ForeignKey(Currency, on_delete=models.PROTECT, related_name="+")
+    date = models.DateField()
+    open = RateField()
+    high = RateField()
+    low = RateField()
+    close = RateField()
+    mean = RateField()
+    count = models.PositiveIntegerField()
+    opened_at = models.DateTimeField()
+    closed_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["currency", "date"],
+                name="unique_daily_rate",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["currency", "closed_at"]),
+        ]
+        ordering = ["-date"]
+        verbose_name = "Daily Rate"
+        verbose_name_plural = "Daily Rates"
+
+    def __str__(self) -> str:
+        return f"Rates for {self.currency_id} on {self.date:%B %d, %Y}"
+
+
+class RateStats(models.Model):
+    """Exponentially weighted mean and variance of a currency's log rate,
+    updated tick by tick as rates are ingested; see ``anomalies``."""
+
+    currency = models.OneToOneField(
+        Currency,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="+",
+    )
+    mean = models.FloatField()
+    variance = models.FloatField()
+    count = models.PositiveIntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Rate Statistics"
+        verbose_name_plural = "Rate Statistics"
+
+    def __str__(self) -> str:
+        return f"Rate statistics for {self.currency_id}"
+
+
+class RateAnomaly(models.Model):
+    """An ingested or posted rate too far from its currency's recent rates,
+    awaiting review. A quarantined rate is written only once accepted; a
+    flagged one was written and is deleted if rejected."""
+
+    PENDING = "pending"
+    ACCEPTED = "accepted"
+    REJECTED = "rejected"
+    STATUS_CHOICES = [
+        (PENDING, "Pending"),
+        (ACCEPTED, "Accepted"),
+        (REJECTED, "Rejected"),
+    ]
+
+    currency = models.ForeignKey(Currency, on_delete=models.PROTECT, related_name="+")
+    rate = RateField()
+    # When the rate was quoted, the ``created_at`` of its exchange rate.
+    quoted_at = models.DateTimeField()
+    # The day of a dated rate, set through the API.
+    effective_date = models.DateField(blank=True, null=True)
+    # The currency's weighted mean rate and the rate's z-score against it.
+    expected = RateField()
+    z_score = models.FloatField()
+    quarantined = models.BooleanField()
+    status = models.CharField(max_length=8, choices=STATUS_CHOICES, default=PENDING)
+    created_by = models.ForeignKey(User, on_delete=models.PROTECT, related_name="+")
+    created_at = models.DateTimeField(auto_now_add=True)
+    reviewed_by = models.ForeignKey(
+        User,
+        on_delete=models.PROTECT,
+        related_name="+",
+        blank=True,
+        null=True,
+    )
+    reviewed_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "-created_at"]),
+        ]
+        ordering = ["-created_at"]
+        verbose_name = "Rate Anomaly"
+        verbose_name_plural = "Rate Anomalies"
+
+    def __str__(self) -> str:
+        return (
+            f"{self.currency_id} at {self.rate} "
+            f"on {self.quoted_at:%B %d, %Y at %I:%M %p}"
+        )
@@ -0,0 +1,233 @@
+"""Load reference-rate files such as the ECB's into exchange rates.
+
+Files quote every currency against one base, e.g. units per euro. They are
+parsed as a stream, XML with defusedxml's ``iterparse``, which refuses
+entity expansion and external references, and CSV row by row, into one
+``(date, {code: units per base unit})`` pair per day, and written in chunks,
+so memory stays flat however long the history is.
+
+A day's rates are turned into local units per foreign unit when the base is
+the local currency or the file quotes the local currency that day. Otherwise
+they are kept as ``CrossRate`` rows from the base, for triangulation.
+Exchange rates are dated rates, upserted on their currency and
+``effective_date``, cross rates on their pair and day, and stamped like a
+dated ``PUT``, see ``series.dated_rate_at``: loading a file twice changes
+nothing, and only rates that differ are rewritten. Loaded rates are
+not screened for anomalies; see ``anomalies``.
+"""
+
+import csv
+import itertools
+from collections import Counter
+from datetime import timedelta
+from decimal import Decimal
+from decimal import InvalidOperation
+
+from defusedxml import ElementTree
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from financial_tracker.core.db import copy_rows
+from financial_tracker.core.response_cache import bump_version
+
+from .fixedpoint import RATE_SCALE
+from .fixedpoint import divide
+from .fixedpoint import from_scaled_rate
+from .fixedpoint import to_scaled_rate
+from .models import CrossRate
+from .models import Currency
+from .models import ExchangeRate
+from .series import dated_rate_at
+from .series import day_start
+
+ECB_NAMESPACE = "{http://www.ecb.int/vocabulary/2002-08-01/eurofxref}"
+MIN_RATE = to_scaled_rate(Decimal("0.00000001"))
+# What a malformed file raises while it is parsed; defusedxml's refusals are
+# ValueErrors.
+INVALID_FILE_ERRORS = (
+    ElementTree.ParseError,
+    InvalidOperation,
+    StopIteration,
+    TypeError,
+    ValueError,
+)
+
+
+def parse_ecb_xml(stream):
+    """``(date, {code: rate})`` per ``<Cube time="...">`` of an ECB file."""
+    for _, element in ElementTree.iterparse(stream, events=("end",)):
+        if element.tag != f"{ECB_NAMESPACE}Cube" or "time" not in element.attrib:
+            continue
+        rates = {cube.get("currency"): Decimal(cube.get("rate")) for cube in element}
+        yield parse_date(element.get("time")), rates
+        # Drop the day's elements, or the whole tree builds up.
+        element.clear()
+
+
+def parse_csv(stream):
+    """``(date, {code: rate})`` per day of a CSV file, either the ECB's wide
+    layout, ``Date,USD,JPY,...`` with ``N/A`` for missing rates, or a long
+    one, ``date,currency,rate``, with each day's rows together."""
+    reader = csv.reader(stream)
+    header = [column.strip() for column in next(reader)]
+    if [column.lower() for column in header] == ["date", "currency", "rate"]:
+        rows = (row for row in reader if row)
+        for day, day_rows in itertools.groupby(rows, key=lambda row: row[0].strip()):
+            yield (
+                parse_date(day),
+                {code.strip(): Decimal(rate) for _, code, rate in day_rows},
+            )
+        return
+    codes = header[1:]
+    for row in reader:
+        if not row:
+            continue
+        rates = {}
+        for code, raw in zip(codes, row[1:], strict=False):
+            value = raw.strip()
+            if code and value and value != "N/A":
+                rates[code] = Decimal(value)
+        yield parse_date(row[0].strip()), rates
+
+
+def parse_file(path):
+    """Parse ``path`` by its extension, ``.xml`` or ``.csv``."""
+    if path.suffix.lower() == ".xml":
+        with path.open("rb") as stream:
+            yield from parse_ecb_xml(stream)
+    elif path.suffix.lower() == ".csv":
+        with path.open(newline="", encoding="utf-8-sig") as stream:
+            yield from parse_csv(stream)
+    else:
+        msg = f"Expected an .xml or .csv file, not {path.name}."
+        raise ValueError(msg)
+
+
+class RateLoader:
+    """Upsert the days of a parsed file, ``chunk_days`` per transaction."""
+
+    def __init__(self, user_id, *, base="EUR", chunk_days=500):
+        self.user_id = user_id
+        self.base = base
+        self.chunk_days = chunk_days
+        self.local = Currency.objects.values_list("code", flat=True).get(is_local=True)
+        self.known = set(Currency.objects.values_list("code", flat=True))
+        self.stats: Counter[str] = Counter()
+
+    def load(self, days):
+        days = iter(days)
+        while chunk := list(itertools.islice(days, self.chunk_days)):
+            self.load_chunk(chunk)
+        return self.stats
+
+    def rows(self, day, rates):
+        """``(exchange rates, cross rates)`` of one day, keyed by their codes
+        and ``day``."""
+        quotes = {code: to_scaled_rate(rate) for code, rate in rates.items()}
+        quotes[self.base] = RATE_SCALE
+        exchange, cross = {}, {}
+        local_quote = quotes.get(self.local)
+        for code, quote in quotes.items():
+            if code == self.local:
+                continue
+            if code not in self.known:
+                self.stats["rates for unknown currencies"] += 1
+            elif local_quote is not None:
+                # Local units per unit of ``code``, through the base.
+                exchange[code, day] = divide(local_quote * RATE_SCALE, quote)
+            elif code != self.base and self.base in self.known:
+                cross[self.base, code, day] = quote
+        return exchange, cross
+
+    @transaction.atomic
+    def load_chunk(self, chunk):
+        exchange, cross = {}, {}
+        for day, rates in chunk:
+            day_exchange, day_cross = self.rows(day, rates)
+            exchange.update(day_exchange)
+            cross.update(day_cross)
+        for key, rate in list(exchange.items()):
+            if rate < MIN_RATE:
+                # Below the lowest rate ExchangeRate accepts.
+                self.stats["rates below the minimum"] += 1
+                del exchange[key]
+        if exchange:
+            days = [day for _, day in exchange]
+            # Dated rates, found through the (currency, effective_date) constraint.
+            existing = ExchangeRate.objects.filter(
+                currency__in={code for code, _ in exchange},
+                effective_date__range=(min(days), max(days)),
+            ).values_list("currency", "effective_date", "pk", "rate")
+            self.upsert(ExchangeRate, ["currency"], exchange, existing, dated=True)
+        if cross:
+            days = [day for *_, day in cross]
+            crossed = CrossRate.objects.filter(
+                base=self.base,
+                quote__in={code for _, code, _ in cross},
+                created_at__gte=day_start(min(days)),
+                created_at__lt=day_start(max(days) + timedelta(days=1)),
+            ).values_list("base", "quote", "created_at", "pk", "rate")
+            by_day = [
+                (base, quote, timezone.localdate(at), pk, rate)
+                for base, quote, at, pk, rate in crossed
+            ]
+            self.upsert(CrossRate, ["base", "quote"], cross, by_day)
+        # COPY sends no signals. Every chunk commits on its own, and cached
+        # responses must not hide it if a later one fails.
+        transaction.on_commit(
+            lambda: [bump_version(model) for model in (ExchangeRate, CrossRate)],
+        )
+
+    def upsert(self, model, pair_fields, rates, existing, *, dated=False):
+        """Write ``rates``, keyed by the codes of ``pair_fields`` and the day,
+        against the ``existing`` rows, ``(*key, pk, rate)``. Only ``dated``
+        rates store the day beyond their ``created_at``."""
+        stored = {tuple(key): (pk, to_scaled_rate(rate)) for *key, pk, rate in existing}
+        now = timezone.now()
+        inserts, updates = [], []
+        for key, rate in rates.items():
+            *pair, day = key
+            # Stamped like a dated PUT: a rewritten rate for today is the
+            # latest rate again.
+            created_at = dated_rate_at(day)
+            if key not in stored:
+                inserts.append(
+                    (
+                        *pair,
+                        *([day] if dated else []),
+                        rate,
+                        self.user_id,
+                        created_at,
+                        now,
+                    ),
+                )
+            elif stored[key][1] != rate:
+                updates.append(
+                    model(
+                        pk=stored[key][0],
+                        rate=from_scaled_rate(rate),
+                        created_at=created_at,
+                        modified_by_id=self.user_id,
+                        modified_at=now,
+                    ),
+                )
+            else:
+                self.stats[f"{model._meta.verbose_name.lower()}s unchanged"] += 1  # noqa: SLF001
+        fields = [
+            *pair_fields,
+            *(["effective_date"] if dated else []),
+            "rate",
+            "created_by",
+            "created_at",
+            "modified_at",
+        ]
+        copy_rows(model, fields, inserts)
+        model.objects.bulk_update(
+            updates,
+            ["rate", "created_at", "modified_by", "modified_at"],
+            batch_size=1000,
+        )
+        name = model._meta.verbose_name.lower()  # noqa: SLF001
+        self.stats[f"{name}s inserted"] += len(inserts)
+        self.stats[f"{name}s updated"] += len(updates)
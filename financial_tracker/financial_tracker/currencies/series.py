@@ -0,0 +1,188 @@
+"""Exchange rates downsampled into open/high/low/close buckets.
+
+The database does the work: window functions over the rates of one currency,
+partitioned by bucket, give every row its bucket's figures, and
+``DISTINCT ON`` keeps one row per bucket. The index on
+``(currency, created_at)`` serves the filter and the ordering, and only one
+row per bucket leaves the database however many rates it holds.
+
+Days compacted into ``DailyRate`` rows are bucketed the same way and merged
+with the buckets of the ticks still kept.
+"""
+
+from datetime import datetime
+from datetime import time
+from datetime import timedelta
+
+from django.db.models import Count
+from django.db.models import DateField
+from django.db.models import DecimalField
+from django.db.models import F
+from django.db.models import Max
+from django.db.models import Min
+from django.db.models import Sum
+from django.db.models import Window
+from django.db.models.functions import FirstValue
+from django.db.models.functions import Trunc
+from django.utils import timezone
+
+from .fields import RateField
+from .fixedpoint import divide
+from .fixedpoint import from_scaled_rate
+from .models import DailyRate
+from .models import ExchangeRate
+
+SERIES_INTERVALS = ("day", "week", "month")
+BUCKET_FIELDS = (
+    "bucket",
+    "open",
+    "high",
+    "low",
+    "close",
+    "total",
+    "count",
+    "opened_at",
+    "closed_at",
+)
+
+
+def day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def dated_rate_at(day):
+    """The ``created_at`` of a dated rate for ``day``: the start of a past
+    day, and now for today, so that writing today's rate supersedes the ticks
+    before it."""
+    return timezone.now() if day == timezone.localdate() else day_start(day)
+
+
+def tick_buckets(ticks, interval):
+    """``ticks`` of one currency summarised per ``interval``, oldest first, as
+    dicts of ``BUCKET_FIELDS``; ``total`` is the sum of the scaled rates."""
+    return (
+        ticks.annotate(bucket=Trunc("created_at", interval))
+        .annotate(
+            open=Window(
+                FirstValue("rate"),
+                order_by=[F("created_at").asc(), F("pk").asc()],
+                partition_by=F("bucket"),
+            ),
+            close=Window(
+                FirstValue("rate"),
+                order_by=[F("created_at").desc(), F("pk").desc()],
+                partition_by=F("bucket"),
+            ),
+            high=Window(
+                Max("rate", output_field=RateField()),
+                partition_by=F("bucket"),
+            ),
+            low=Window(Min("rate", output_field=RateField()), partition_by=F("bucket")),
+            total=Window(
+                Sum("rate", output_field=DecimalField()),
+                partition_by=F("bucket"),
+            ),
+            count=Window(Count("pk"), partition_by=F("bucket")),
+            opened_at=Window(Min("created_at"), partition_by=F("bucket")),
+            closed_at=Window(Max("created_at"), partition_by=F("bucket")),
+        )
+        .order_by("bucket")
+        .distinct("bucket")
+        .values(*BUCKET_FIELDS)
+    )
+
+
+def daily_buckets(days, interval):
+    """``DailyRate`` rows of one currency summarised like ``tick_buckets``,
+    except that ``bucket`` is a date."""
+    # Annotations may not shadow the model's fields, hence the names.
+    return (
+        days.annotate(bucket=Trunc("date", interval, output_field=DateField()))
+        .annotate(
+            bucket_open=Window(
+                FirstValue("open"),
+                order_by=F("date").asc(),
+                partition_by=F("bucket"),
+            ),
+            bucket_close=Window(
+                FirstValue("close"),
+                order_by=F("date").desc(),
+                partition_by=F("bucket"),
+            ),
+            bucket_high=Window(
+                Max("high", output_field=RateField()),
+                partition_by=F("bucket"),
+            ),
+            bucket_low=Window(
+                Min("low", output_field=RateField()),
+                partition_by=F("bucket"),
+            ),
+            bucket_total=Window(
+                Sum(F("mean") * F("count"), output_field=DecimalField()),
+                partition_by=F("bucket"),
+            ),
+            bucket_count=Window(Sum("count"), partition_by=F("bucket")),
+            bucket_opened_at=Window(Min("opened_at"), partition_by=F("bucket")),
+            bucket_closed_at=Window(Max("closed_at"), partition_by=F("bucket")),
+        )
+        .order_by("bucket")
+        .distinct("bucket")
+        .values_list("bucket", *(f"bucket_{field}" for field in BUCKET_FIELDS[1:]))
+    )
+
+
+def merge_buckets(first, second):
+    """One bucket from the summaries of two sets of rates in it."""
+    earlier = first if first["opened_at"] <= second["opened_at"] else second
+    later = first if first["closed_at"] >= second["closed_at"] else second
+    return {
+        "bucket": first["bucket"],
+        "open": earlier["open"],
+        "high": max(first["high"], second["high"]),
+        "low": min(first["low"], second["low"]),
+        "close": later["close"],
+        "total": first["total"] + second["total"],
+        "count": first["count"] + second["count"],
+        "opened_at": earlier["opened_at"],
+        "closed_at": later["closed_at"],
+    }
+
+
+async def rate_series(code, interval, start=None, end=None):
+    """``{start, open, high, low, close, mean, count}`` per ``interval`` bucket
+    of ``code``'s rates from the ``start`` to the ``end`` date, oldest first."""
+    ticks = ExchangeRate.objects.filter(currency=code)
+    days = DailyRate.objects.filter(currency=code)
+    # Bounds on created_at itself, not its date, so the index serves them.
+    if start is not None:
+        ticks, days = (
+            ticks.filter(created_at__gte=day_start(start)),
+            days.filter(date__gte=start),
+        )
+    if end is not None:
+        ticks, days = (
+            ticks.filter(created_at__lt=day_start(end + timedelta(days=1))),
+            days.filter(date__lte=end),
+        )
+
+    buckets = {}
+    async for values in daily_buckets(days, interval):
+        row = dict(zip(BUCKET_FIELDS, values, strict=False))
+        row["bucket"] = day_start(row["bucket"])
+        buckets[row["bucket"]] = row
+    async for row in tick_buckets(ticks, interval):
+        key = row["bucket"]
+        buckets[key] = merge_buckets(buckets[key], row) if key in buckets else row
+
+    return [
+        {
+            "start": row["bucket"],
+            "open": row["open"],
+            "high": row["high"],
+            "low": row["low"],
+            "close": row["close"],
+            "mean": from_scaled_rate(divide(int(row["total"]), row["count"])),
+            "count": row["count"],
+        }
+        for _, row in sorted(buckets.items())
+    ]
@@ -0,0 +1,34 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from financial_tracker.core.response_cache import bump_version_on_commit
+
+from .cache import LOCAL_CURRENCY_KEY
+from .cache import LOCAL_EXPONENT_KEY
+from .models import CrossRate
+from .models import Currency
+from .models import ExchangeRate
+
+
+@receiver([post_save, post_delete], sender=Currency)
+def clear_local_currency_cache(sender, **kwargs):
+    # After commit, so a concurrent read cannot cache the old code again.
+    transaction.on_commit(
+        lambda: cache.delete_many([LOCAL_CURRENCY_KEY, LOCAL_EXPONENT_KEY]),
+    )
+
+
+for model in (Currency, ExchangeRate, CrossRate):
+    post_save.connect(
+        bump_version_on_commit,
+        sender=model,
+        dispatch_uid=f"response-cache:{model._meta.label}:save",  # noqa: SLF001
+    )
+    post_delete.connect(
+        bump_version_on_commit,
+        sender=model,
+        dispatch_uid=f"response-cache:{model._meta.label}:delete",  # noqa: SLF001
+    )
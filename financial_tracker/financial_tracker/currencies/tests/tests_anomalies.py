@@ -0,0 +1,193 @@
+import math
+from datetime import UTC
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from financial_tracker.currencies import ingest
+from financial_tracker.currencies.anomalies import RateMonitor
+from financial_tracker.currencies.anomalies import accept
+from financial_tracker.currencies.anomalies import reject
+from financial_tracker.currencies.fixedpoint import to_scaled_rate
+from financial_tracker.currencies.ingest import LocalBuffer
+from financial_tracker.currencies.ingest import enqueue
+from financial_tracker.currencies.ingest import flush
+from financial_tracker.currencies.models import Currency
+from financial_tracker.currencies.models import ExchangeRate
+from financial_tracker.currencies.models import RateAnomaly
+from financial_tracker.currencies.models import RateStats
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def usd(user, monkeypatch):
+    monkeypatch.setitem(ingest._buffers, "local", LocalBuffer())  # noqa: SLF001
+    Currency.objects.create(
+        code="KES",
+        description="Kenyan Shilling",
+        is_local=True,
+        created_by=user,
+    )
+    Currency.objects.create(
+        code="USD",
+        description="US Dollar",
+        is_local=False,
+        created_by=user,
+    )
+    # Settled around 129 with a spread of about 0.5%.
+    RateStats.objects.create(
+        currency_id="USD",
+        mean=math.log(129),
+        variance=0.005**2,
+        count=50,
+    )
+
+
+def ingest_rates(user, *rates):
+    enqueue(
+        [
+            {
+                "currency": "USD",
+                "rate": Decimal(rate),
+                "at": datetime(2025, 1, 10, 9, minute, tzinfo=UTC),
+            }
+            for minute, rate in enumerate(rates)
+        ],
+        user.pk,
+    )
+    return flush()
+
+
+@pytest.fixture
+def api(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+def test_monitor_warms_up_then_flags(usd, settings):
+    settings.RATE_ANOMALY_MIN_OBSERVATIONS = 5
+    monitor = RateMonitor(["EUR"])
+    for rate in ["140", "141", "139.5", "140.5", "140"]:
+        assert monitor.check("EUR", to_scaled_rate(rate)) is None
+    stats = monitor.stats["EUR"]
+    z_score, expected = monitor.check("EUR", to_scaled_rate("1400"))
+    assert z_score > 100  # noqa: PLR2004
+    assert 139 < expected / 10**8 < 141  # noqa: PLR2004
+    # Anomalies stay out of the statistics.
+    assert monitor.stats["EUR"] == stats
+    assert monitor.check("EUR", to_scaled_rate("141.5")) is None
+    assert monitor.stats["EUR"][2] == 6  # noqa: PLR2004
+
+
+def test_quarantined_rate_waits_for_review(usd, user):
+    assert ingest_rates(user, "129.40", "1294.00", "129.10") == (3, 2)
+    assert sorted(ExchangeRate.objects.values_list("rate", flat=True)) == [
+        Decimal("129.10"),
+        Decimal("129.40"),
+    ]
+    anomaly = RateAnomaly.objects.get()
+    assert (anomaly.rate, anomaly.quarantined, anomaly.status) == (
+        Decimal("1294"),
+        True,
+        RateAnomaly.PENDING,
+    )
+    assert RateStats.objects.get().count == 52  # noqa: PLR2004
+
+    assert accept(RateAnomaly.objects.all(), user) == 1
+    written = ExchangeRate.objects.get(rate=Decimal("1294"))
+    assert written.created_at == anomaly.quoted_at
+    anomaly.refresh_from_db()
+    assert (anomaly.status, anomaly.reviewed_by) == (RateAnomaly.ACCEPTED, user)
+    # The accepted level is the new normal.
+    assert RateStats.objects.get().mean == pytest.approx(math.log(1294))
+    assert accept(RateAnomaly.objects.all(), user) == 0
+
+
+def test_flagged_rate_is_written_until_rejected(usd, user, settings):
+    settings.RATE_ANOMALY_ACTION = "flag"
+    assert ingest_rates(user, "12.94") == (1, 1)
+    assert RateAnomaly.objects.get().quarantined is False
+
+    assert reject(RateAnomaly.objects.all(), user) == 1
+    assert not ExchangeRate.objects.exists()
+    assert RateAnomaly.objects.get().status == RateAnomaly.REJECTED
+
+    settings.RATE_ANOMALY_ACTION = "off"
+    assert ingest_rates(user, "12.94") == (1, 1)
+    assert RateAnomaly.objects.count() == 1
+
+
+def test_api_writes_are_screened(usd, user, api):
+    url = reverse("api:currencies:exchangerate-list")
+    response = api.post(url, {"currency": "USD", "rate": "129.20"}, format="json")
+    assert response.status_code == status.HTTP_201_CREATED
+    assert "anomaly" not in response.data
+
+    response = api.post(url, {"currency": "USD", "rate": "1292.00"}, format="json")
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    anomaly = RateAnomaly.objects.get(pk=response.data["anomaly"]["id"])
+    assert (anomaly.rate, anomaly.quarantined) == (Decimal("1292"), True)
+    assert ExchangeRate.objects.count() == 1
+
+    detail = reverse(
+        "api:currencies:exchangerate-detail",
+        kwargs={"pk": ExchangeRate.objects.get().pk},
+    )
+    assert (
+        api.put(detail, {"currency": "USD", "rate": "12.92"}, format="json").status_code
+        == status.HTTP_202_ACCEPTED
+    )
+    assert ExchangeRate.objects.get().rate == Decimal("129.20")
+
+    dated = reverse(
+        "api:currencies:exchangerate-dated",
+        kwargs={"code": "USD", "effective_date": "2025-01-03"},
+    )
+    response = api.put(dated, {"rate": "1.29"}, format="json")
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert response.data["anomaly"]["effective_date"] == "2025-01-03"
+    assert not ExchangeRate.objects.filter(effective_date__isnull=False).exists()
+
+    # Accepting the dated rate writes it as that day's rate.
+    assert accept(RateAnomaly.objects.filter(effective_date__isnull=False), user) == 1
+    assert api.get(dated).data["rate"] == "1.29"
+
+
+def test_accepting_a_dated_rate_keeps_a_newer_one(usd, user, api):
+    dated = reverse(
+        "api:currencies:exchangerate-dated",
+        kwargs={"code": "USD", "effective_date": "2025-01-03"},
+    )
+    assert (
+        api.put(dated, {"rate": "1.29"}, format="json").status_code
+        == status.HTTP_202_ACCEPTED
+    )
+    # The corrected rate is put before the mistyped one is reviewed.
+    assert (
+        api.put(dated, {"rate": "129.30"}, format="json").status_code
+        == status.HTTP_200_OK
+    )
+
+    assert accept(RateAnomaly.objects.all(), user) == 1
+    assert api.get(dated).data["rate"] == "129.30"
+
+
+def test_api_writes_are_flagged(usd, user, api, settings):
+    settings.RATE_ANOMALY_ACTION = "flag"
+    response = api.post(
+        reverse("api:currencies:exchangerate-list"),
+        {"currency": "USD", "rate": "1292.00"},
+        format="json",
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.data["anomaly"]["quarantined"] is False
+    assert response.data["anomaly"]["expected"] == "129.00"
+
+    assert reject(RateAnomaly.objects.all(), user) == 1
+    assert not ExchangeRate.objects.exists()
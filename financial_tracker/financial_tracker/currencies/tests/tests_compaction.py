@@ -0,0 +1,121 @@
+from datetime import date
+from datetime import datetime
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.management import call_command
+from django.utils import timezone
+
+from financial_tracker.currencies.compaction import compact
+from financial_tracker.currencies.compaction import retention_cutoff
+from financial_tracker.currencies.conversion import convert_batch
+from financial_tracker.currencies.models import Currency
+from financial_tracker.currencies.models import DailyRate
+from financial_tracker.currencies.models import ExchangeRate
+from financial_tracker.currencies.series import rate_series
+
+pytestmark = pytest.mark.django_db
+
+
+def add_rate(currency, rate, created_at, user):
+    exchange_rate = ExchangeRate.objects.create(
+        currency=currency,
+        rate=Decimal(rate),
+        created_by=user,
+    )
+    ExchangeRate.objects.filter(pk=exchange_rate.pk).update(
+        created_at=timezone.make_aware(created_at),
+    )
+
+
+@pytest.fixture
+def usd(user):
+    Currency.objects.create(
+        code="KES",
+        description="Kenyan Shilling",
+        is_local=True,
+        created_by=user,
+    )
+    currency = Currency.objects.create(
+        code="USD",
+        description="US Dollar",
+        is_local=False,
+        created_by=user,
+    )
+    for day, rates in [
+        (1, ["128.00", "130.00", "129.00"]),
+        (2, ["131.00", "127.00"]),
+        (3, ["126.00"]),
+    ]:
+        for hour, rate in enumerate(rates, start=9):
+            add_rate(currency, rate, datetime(2025, 1, day, hour), user)  # noqa: DTZ001
+    add_rate(currency, "125.00", datetime(2025, 3, 1, 9), user)  # noqa: DTZ001
+    return currency
+
+
+def test_compact_rates(usd):
+    series = async_to_sync(rate_series)("USD", "week")
+    out = StringIO()
+    call_command(
+        "compact_rates",
+        keep_days=(timezone.localdate() - date(2025, 2, 1)).days,
+        batch_size=2,
+        stdout=out,
+    )
+
+    assert "Compacted 6 ticks" in out.getvalue()
+    assert list(ExchangeRate.objects.values_list("rate", flat=True)) == [
+        Decimal("125.00"),
+    ]
+    first = DailyRate.objects.get(date=date(2025, 1, 1))
+    assert (
+        first.open,
+        first.high,
+        first.low,
+        first.close,
+        first.mean,
+        first.count,
+    ) == (
+        Decimal("128"),
+        Decimal("130"),
+        Decimal("128"),
+        Decimal("129"),
+        Decimal("129"),
+        3,
+    )
+    assert DailyRate.objects.count() == 3  # noqa: PLR2004
+    # Buckets and as-of conversions read the same before and after.
+    assert async_to_sync(rate_series)("USD", "week") == series
+    assert convert_batch(
+        [
+            (1, "USD", date(2025, 1, 1)),
+            (1, "USD", datetime(2025, 1, 2, 9, 30)),  # noqa: DTZ001
+            (1, "USD", date(2025, 1, 31)),
+            (1, "USD", None),
+        ],
+    ) == [Decimal("129.00"), Decimal("131.00"), Decimal("126.00"), Decimal("125.00")]
+
+
+def test_compaction_keeps_latest_tick_and_merges_days(usd, user):
+    ExchangeRate.objects.filter(
+        created_at__gte=timezone.make_aware(datetime(2025, 3, 1)),  # noqa: DTZ001
+    ).delete()
+    cutoff = retention_cutoff(0) + timedelta(days=1)
+
+    # Windows of at most two ticks, the last one ending at the cutoff.
+    assert [count for *_, count in compact(cutoff, batch_size=2)] == [2, 2, 1]
+    assert ExchangeRate.objects.get().rate == Decimal("126.00")
+
+    # A late tick for a compacted day is merged into its row.
+    add_rate(usd, "132.00", datetime(2025, 1, 1, 18), user)  # noqa: DTZ001
+    assert [count for *_, count in compact(cutoff)] == [1]
+    merged = DailyRate.objects.get(date=date(2025, 1, 1))
+    assert (merged.high, merged.close, merged.mean, merged.count) == (
+        Decimal("132"),
+        Decimal("132"),
+        Decimal("129.75"),
+        4,
+    )
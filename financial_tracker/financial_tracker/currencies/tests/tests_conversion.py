@@ -0,0 +1,239 @@
+from datetime import date
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from financial_tracker.currencies.conversion import convert_batch
+from financial_tracker.currencies.models import CrossRate
+from financial_tracker.currencies.models import Currency
+from financial_tracker.currencies.models import ExchangeRate
+
+pytestmark = pytest.mark.django_db
+
+
+def add_rate(currency, rate, created_at, user):
+    exchange_rate = ExchangeRate.objects.create(
+        currency=currency,
+        rate=Decimal(rate),
+        created_by=user,
+    )
+    ExchangeRate.objects.filter(pk=exchange_rate.pk).update(
+        created_at=timezone.make_aware(created_at),
+    )
+
+
+@pytest.fixture
+def currencies(user):
+    Currency.objects.create(
+        code="KES",
+        description="Kenyan Shilling",
+        is_local=True,
+        created_by=user,
+    )
+    usd = Currency.objects.create(
+        code="USD",
+        description="US Dollar",
+        is_local=False,
+        created_by=user,
+    )
+    jpy = Currency.objects.create(
+        code="JPY",
+        description="Yen",
+        is_local=False,
+        exponent=0,
+        created_by=user,
+    )
+    add_rate(usd, "128.50", datetime(2025, 1, 10, 9), user)  # noqa: DTZ001
+    add_rate(usd, "129.00", datetime(2025, 1, 20, 9), user)  # noqa: DTZ001
+    add_rate(jpy, "0.86123456", datetime(2025, 1, 10, 9), user)  # noqa: DTZ001
+
+
+def test_convert_batch(currencies, django_assert_num_queries):
+    items = [
+        ("100.00", "USD", None),
+        ("100.00", "USD", date(2025, 1, 15)),
+        (1000, "JPY", None),
+        ("12.34", "KES", date(2020, 1, 1)),
+        ("100.00", "USD", date(2025, 1, 20)),
+    ]
+    # Currencies, the local currency, every rate and every compacted day.
+    with django_assert_num_queries(4):
+        results = convert_batch(items)
+
+    assert results == [
+        Decimal("12900.00"),
+        Decimal("12850.00"),
+        Decimal("861.23"),
+        Decimal("12.34"),
+        Decimal("12900.00"),
+    ]
+
+
+def test_convert_batch_errors_by_index(currencies):
+    items = [
+        ("1.00", "USD", None),
+        ("1.00", "EUR", None),
+        ("1.5", "JPY", None),
+        ("1.00", "USD", date(2024, 12, 31)),
+    ]
+    with pytest.raises(ValidationError) as excinfo:
+        convert_batch(items)
+
+    assert sorted(excinfo.value.message_dict) == ["1", "2", "3"]
+
+
+def test_convert_batch_triangulates_latest(currencies, user):
+    ngn = Currency.objects.create(
+        code="NGN",
+        description="Naira",
+        is_local=False,
+        created_by=user,
+    )
+    CrossRate.objects.create(
+        base_id="USD",
+        quote=ngn,
+        rate=Decimal("1600"),
+        created_by=user,
+    )
+
+    assert convert_batch([("1600.00", "NGN", None)]) == [Decimal("129.00")]
+    # Paths use the latest rates, so past conversions need a rate of their own.
+    with pytest.raises(ValidationError) as excinfo:
+        convert_batch([("1600.00", "NGN", date(2025, 1, 15))])
+    assert "No exchange rate for NGN" in excinfo.value.message_dict["0"][0]
+
+
+def test_convert_batch_endpoint(currencies, user):
+    client = APIClient()
+    url = reverse("api:currencies:convert-batch")
+    items = [
+        {"amount": "100.00", "currency": "USD", "as_of": "2025-01-15"},
+        {"amount": "1000", "currency": "JPY"},
+    ]
+
+    assert (
+        client.post(url, {"items": items}, format="json").status_code
+        == status.HTTP_403_FORBIDDEN
+    )
+
+    client.force_authenticate(user=user)
+    response = client.post(url, {"items": items}, format="json")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"results": ["12850.00", "861.23"]}
+
+    response = client.post(
+        url,
+        {"items": [{"amount": "1", "currency": "USD", "as_of": "soon"}]},
+        format="json",
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "0" in response.json()
+
+
+def test_cross_rates(
+    client,
+    currencies,
+    user,
+    django_assert_num_queries,
+    django_capture_on_commit_callbacks,
+):
+    url = reverse("api:currencies:crossrates")
+    response = client.get(url)
+
+    assert response.status_code == status.HTTP_200_OK
+    body = response.json()
+    assert body["codes"] == ["JPY", "KES", "USD"]
+    assert body["rates"]["USD"]["KES"] == "129.00000000"
+    assert body["rates"]["KES"]["USD"] == "0.00775194"
+    assert body["rates"]["USD"]["JPY"] == "149.78497844"
+    assert body["rates"]["JPY"]["JPY"] == "1.00000000"
+
+    with django_assert_num_queries(0):
+        assert client.get(url).json() == body
+
+    with django_capture_on_commit_callbacks(execute=True):
+        ExchangeRate.objects.create(
+            currency_id="USD",
+            rate=Decimal("130"),
+            created_by=user,
+        )
+    assert client.get(url).json()["rates"]["USD"]["KES"] == "130.00000000"
+
+
+def test_cross_rates_for_codes(client, currencies):
+    url = reverse("api:currencies:crossrates")
+
+    response = client.get(url, {"codes": "usd,KES"})
+    assert response.json() == {
+        "codes": ["USD", "KES"],
+        "rates": {
+            "USD": {"USD": "1.00000000", "KES": "129.00000000"},
+            "KES": {"USD": "0.00775194", "KES": "1.00000000"},
+        },
+    }
+
+    response = client.get(url, {"codes": "USD,EUR"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "EUR" in response.json()["codes"][0]
+
+
+def test_rate_series(client, currencies, user, django_assert_max_num_queries):
+    usd = Currency.objects.get(code="USD")
+    add_rate(usd, "128.00", datetime(2025, 1, 10, 12), user)  # noqa: DTZ001
+    add_rate(usd, "131.00", datetime(2025, 1, 10, 15), user)  # noqa: DTZ001
+    url = reverse("api:currencies:exchangerate-series", kwargs={"code": "USD"})
+
+    with django_assert_max_num_queries(3):
+        response = client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["buckets"] == [
+        {
+            "start": "2025-01-10T00:00:00+03:00",
+            "open": "128.50",
+            "high": "131.00",
+            "low": "128.00",
+            "close": "131.00",
+            "mean": "129.16666667",
+            "count": 3,
+        },
+        {
+            "start": "2025-01-20T00:00:00+03:00",
+            "open": "129.00",
+            "high": "129.00",
+            "low": "129.00",
+            "close": "129.00",
+            "mean": "129.00",
+            "count": 1,
+        },
+    ]
+
+    monthly = client.get(url, {"interval": "month", "start": "2025-01-11"}).json()[
+        "buckets"
+    ]
+    assert [(bucket["open"], bucket["count"]) for bucket in monthly] == [("129.00", 1)]
+    with CaptureQueriesContext(connection) as queries:
+        bounded = client.get(url, {"end": "2025-01-10"}).json()["buckets"]
+    assert [bucket["count"] for bucket in bounded] == [3]
+    # Bounds on created_at itself, which the (currency, created_at) index serves.
+    filters = [
+        query["sql"].partition(" WHERE ")[2] for query in queries.captured_queries
+    ]
+    assert not any("AT TIME ZONE" in where for where in filters)
+
+    assert (
+        client.get(url, {"interval": "hour"}).status_code == status.HTTP_400_BAD_REQUEST
+    )
+    assert (
+        client.get(
+            reverse("api:currencies:exchangerate-series", kwargs={"code": "EUR"}),
+        ).status_code
+        == status.HTTP_404_NOT_FOUND
+    )
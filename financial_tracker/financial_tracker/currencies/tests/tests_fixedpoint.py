@@ -0,0 +1,73 @@
+from decimal import Decimal
+
+import pytest
+
+from financial_tracker.currencies.api.serializers import ExchangeRateSerializer
+from financial_tracker.currencies.fixedpoint import convert
+from financial_tracker.currencies.fixedpoint import divide
+from financial_tracker.currencies.fixedpoint import from_minor
+from financial_tracker.currencies.fixedpoint import to_minor
+from financial_tracker.currencies.fixedpoint import to_scaled_rate
+from financial_tracker.currencies.models import ExchangeRate
+
+
+def test_minor_units_round_trip():
+    assert to_minor(Decimal("1234.56"), 2) == 123456  # noqa: PLR2004
+    assert to_minor(1500, 0) == 1500  # noqa: PLR2004
+    assert to_minor(0.1, 2) == 10  # noqa: PLR2004
+    assert from_minor(123456, 2) == Decimal("1234.56")
+    assert str(from_minor(1500, 0)) == "1500"
+
+
+def test_to_minor_rejects_extra_places():
+    with pytest.raises(ValueError, match="more than 2 decimal places"):
+        to_minor(Decimal("1.005"), 2)
+    with pytest.raises(ValueError, match="more than 0 decimal places"):
+        to_minor(Decimal("0.5"), 0)
+
+
+@pytest.mark.parametrize(
+    ("numerator", "expected"),
+    [(5, 0), (15, 2), (25, 2), (14, 1), (16, 2), (-15, -2)],
+)
+def test_divide_rounds_half_to_even(numerator, expected):
+    assert divide(numerator, 10) == expected
+
+
+def test_convert_between_exponents():
+    rate = to_scaled_rate(Decimal("0.86123456"))  # KES per JPY
+    assert convert(1000, rate, 0, 2) == 86123  # 1000 JPY -> 861.23 KES  # noqa: PLR2004
+    assert convert(100, to_scaled_rate(Decimal("129.37")), 2, 2) == 12937  # noqa: PLR2004
+    # 0.05 * 0.5 = 0.025, which rounds to the even 0.02.
+    assert convert(5, to_scaled_rate(Decimal("0.5")), 2, 2) == 2  # noqa: PLR2004
+
+
+def test_to_scaled_rate_rounds_half_to_even():
+    assert to_scaled_rate(Decimal("1.000000005")) == 100000000  # noqa: PLR2004
+    assert to_scaled_rate(Decimal("1.000000015")) == 100000002  # noqa: PLR2004
+    assert to_scaled_rate(1.25) == 125000000  # noqa: PLR2004
+
+
+@pytest.mark.django_db
+def test_rate_keeps_eight_places(currency_factory, user):
+    currency_factory(is_local=True)
+    currency = currency_factory(is_local=False)
+    ExchangeRate.objects.create(
+        currency=currency,
+        rate=Decimal("129.12345678"),
+        created_by=user,
+    )
+
+    rate = ExchangeRate.objects.get()
+    assert rate.rate == Decimal("129.12345678")
+    assert ExchangeRate.objects.filter(rate__gt=Decimal("129.12345677")).exists()
+    assert ExchangeRateSerializer(rate).data["rate"] == "129.12345678"
+
+
+@pytest.mark.django_db
+def test_rate_shown_with_at_least_two_places(currency_factory, user):
+    currency_factory(is_local=True)
+    currency = currency_factory(is_local=False)
+    ExchangeRate.objects.create(currency=currency, rate=Decimal("150"), created_by=user)
+
+    assert ExchangeRateSerializer(ExchangeRate.objects.get()).data["rate"] == "150.00"
@@ -0,0 +1,191 @@
+import threading
+from datetime import UTC
+from datetime import datetime
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from financial_tracker.currencies import ingest
+from financial_tracker.currencies.ingest import BufferFull
+from financial_tracker.currencies.ingest import LocalBuffer
+from financial_tracker.currencies.ingest import coalesce
+from financial_tracker.currencies.ingest import flush
+from financial_tracker.currencies.models import Currency
+from financial_tracker.currencies.models import ExchangeRate
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def buffer(monkeypatch):
+    buffer = LocalBuffer()
+    monkeypatch.setitem(ingest._buffers, "local", buffer)  # noqa: SLF001
+    return buffer
+
+
+@pytest.fixture
+def api_client(user):
+    Currency.objects.create(
+        code="KES",
+        description="Kenyan Shilling",
+        is_local=True,
+        created_by=user,
+    )
+    Currency.objects.create(
+        code="USD",
+        description="US Dollar",
+        is_local=False,
+        created_by=user,
+    )
+    Currency.objects.create(
+        code="EUR",
+        description="Euro",
+        is_local=False,
+        created_by=user,
+    )
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+def tick(currency, rate, second):
+    return {
+        "currency": currency,
+        "rate": rate,
+        "at": f"2025-01-10T09:00:{second:02d}+00:00",
+    }
+
+
+def test_coalesce_keeps_last_tick_per_interval():
+    ticks = [
+        tick("USD", "1", 1),
+        tick("USD", "3", 9),
+        tick("USD", "2", 5),
+        tick("USD", "4", 10),
+        tick("EUR", "5", 2),
+    ]
+    assert [t["rate"] for _, t in coalesce(ticks, 10)] == ["3", "4", "5"]
+
+
+def test_ingest_coalesces_and_writes_in_bulk(
+    api_client,
+    buffer,
+    django_assert_max_num_queries,
+):
+    url = reverse("api:currencies:exchangerate-ingest")
+    for second, rate in [(1, "129.10"), (4, "129.20"), (12, "129.30")]:
+        response = api_client.post(
+            url,
+            [tick("USD", rate, second), tick("EUR", "140", second)],
+            format="json",
+        )
+        assert response.status_code == status.HTTP_202_ACCEPTED
+    assert buffer.pending() == 6  # noqa: PLR2004
+    assert not ExchangeRate.objects.exists()
+
+    # In a savepoint: the currencies, their rate statistics, the COPY and the
+    # statistics written back.
+    with django_assert_max_num_queries(5):
+        assert flush(buffer) == (6, 4)
+    assert buffer.pending() == 0
+    rates = ExchangeRate.objects.filter(currency="USD").order_by("created_at")
+    assert [(rate.rate, rate.created_at) for rate in rates] == [
+        (Decimal("129.20"), datetime(2025, 1, 10, 9, 0, 4, tzinfo=UTC)),
+        (Decimal("129.30"), datetime(2025, 1, 10, 9, 0, 12, tzinfo=UTC)),
+    ]
+
+
+def test_ingest_validation_and_back_pressure(api_client, buffer, settings):
+    url = reverse("api:currencies:exchangerate-ingest")
+    assert (
+        api_client.post(url, [tick("KES", "1", 1)], format="json").status_code
+        == status.HTTP_400_BAD_REQUEST
+    )
+    assert (
+        api_client.post(url, [tick("USD", "0", 1)], format="json").status_code
+        == status.HTTP_400_BAD_REQUEST
+    )
+
+    settings.RATE_INGEST_MAX_PENDING = 2
+    response = api_client.post(
+        url,
+        [tick("USD", "129", second) for second in range(3)],
+        format="json",
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert (
+        api_client.post(
+            url,
+            [tick("USD", "129", 1), tick("EUR", "140", 1)],
+            format="json",
+        ).status_code
+        == status.HTTP_202_ACCEPTED
+    )
+    response = api_client.post(url, [tick("USD", "130", 2)], format="json")
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response["Retry-After"] == "1"
+    with pytest.raises(BufferFull):
+        buffer.append([{}], 2)
+
+    out = StringIO()
+    call_command("flush_rates", once=True, stdout=out)
+    assert "Wrote 2 of 2 ticks" in out.getvalue()
+    assert (
+        api_client.post(url, [tick("USD", "130", 2)], format="json").status_code
+        == status.HTTP_202_ACCEPTED
+    )
+
+
+def test_local_buffer_flushes_once_due(
+    api_client,
+    buffer,
+    settings,
+    django_capture_on_commit_callbacks,
+):
+    settings.RATE_INGEST_BATCH_SIZE = 2
+    url = reverse("api:currencies:exchangerate-ingest")
+    with django_capture_on_commit_callbacks(execute=True):
+        api_client.post(url, [tick("USD", "129", 1)], format="json")
+    assert not ExchangeRate.objects.exists()
+
+    # Flushed once the request's transaction commits.
+    with django_capture_on_commit_callbacks(execute=True):
+        api_client.post(url, [tick("EUR", "140", 1)], format="json")
+        assert not ExchangeRate.objects.exists()
+    assert ExchangeRate.objects.count() == 2  # noqa: PLR2004
+
+
+def test_failing_batch_is_dead_lettered(api_client, buffer, settings, user):
+    settings.RATE_INGEST_BATCH_SIZE = 2
+    bad = {**tick("USD", "NaN", 1), "user": user.pk}
+    good = [{**tick("EUR", "140", second), "user": user.pk} for second in (0, 20, 40)]
+    buffer.append([bad, *good], 10)
+
+    out = StringIO()
+    call_command("flush_rates", once=True, stdout=out)
+    # The bad tick's batch is set aside, and the rest still drain.
+    assert buffer.dead_letters == [bad, good[0]]
+    assert buffer.pending() == 0
+    assert ExchangeRate.objects.count() == 2  # noqa: PLR2004
+
+
+def test_local_buffer_flushes_on_timer(monkeypatch):
+    buffer = LocalBuffer(flush_after=0.01)
+    flushed = threading.Event()
+
+    def fake_flush(flushed_buffer):
+        entries = flushed_buffer.read(10)
+        flushed_buffer.ack([entry_id for entry_id, _ in entries])
+        flushed.set()
+        return len(entries), len(entries)
+
+    monkeypatch.setattr(ingest, "flush", fake_flush)
+    buffer.append([tick("USD", "129", 1)], 10)
+    # Nothing else is enqueued, yet the tick is flushed.
+    assert flushed.wait(5)
+    assert buffer.pending() == 0
@@ -0,0 +1,195 @@
+from datetime import date
+from datetime import datetime
+from datetime import timedelta
+from decimal import Decimal
+from io import BytesIO
+from io import StringIO
+
+import pytest
+from defusedxml import EntitiesForbidden
+from django.core.management import CommandError
+from django.core.management import call_command
+from django.utils import timezone
+
+from financial_tracker.currencies.models import CrossRate
+from financial_tracker.currencies.models import Currency
+from financial_tracker.currencies.models import ExchangeRate
+from financial_tracker.currencies.reference_rates import INVALID_FILE_ERRORS
+from financial_tracker.currencies.reference_rates import RateLoader
+from financial_tracker.currencies.reference_rates import parse_csv
+from financial_tracker.currencies.reference_rates import parse_ecb_xml
+from financial_tracker.currencies.series import day_start
+
+pytestmark = pytest.mark.django_db
+
+ECB_XML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<gesmes:Envelope xmlns:gesmes="http://www.gesmes.org/xml/2002-08-01" xmlns="http://www.ecb.int/vocabulary/2002-08-01/eurofxref">
+  <gesmes:subject>Reference rates</gesmes:subject>
+  <Cube>
+    <Cube time="2025-01-03">
+      <Cube currency="USD" rate="1.0321"/>
+      <Cube currency="JPY" rate="162.63"/>
+      <Cube currency="KES" rate="133.52"/>
+    </Cube>
+    <Cube time="2025-01-02">
+      <Cube currency="USD" rate="1.0299"/>
+      <Cube currency="JPY" rate="163.05"/>
+    </Cube>
+  </Cube>
+</gesmes:Envelope>
+"""
+
+
+@pytest.fixture
+def currencies(user):
+    Currency.objects.create(
+        code="KES",
+        description="Kenyan Shilling",
+        is_local=True,
+        created_by=user,
+    )
+    Currency.objects.create(
+        code="USD",
+        description="US Dollar",
+        is_local=False,
+        created_by=user,
+    )
+    Currency.objects.create(
+        code="EUR",
+        description="Euro",
+        is_local=False,
+        created_by=user,
+    )
+
+
+def at(day):
+    # Past days are stamped at their start, like a dated PUT.
+    return timezone.make_aware(datetime(2025, 1, day))  # noqa: DTZ001
+
+
+def test_parsers():
+    assert list(parse_ecb_xml(BytesIO(ECB_XML))) == [
+        (
+            date(2025, 1, 3),
+            {
+                "USD": Decimal("1.0321"),
+                "JPY": Decimal("162.63"),
+                "KES": Decimal("133.52"),
+            },
+        ),
+        (date(2025, 1, 2), {"USD": Decimal("1.0299"), "JPY": Decimal("163.05")}),
+    ]
+    wide = "Date,USD,JPY,\n2025-01-03,1.0321,N/A,\n2025-01-02,1.0299,163.05,\n"
+    assert list(parse_csv(StringIO(wide))) == [
+        (date(2025, 1, 3), {"USD": Decimal("1.0321")}),
+        (date(2025, 1, 2), {"USD": Decimal("1.0299"), "JPY": Decimal("163.05")}),
+    ]
+    long = (
+        "date,currency,rate\n"
+        "2025-01-03,USD,1.0321\n2025-01-03,KES,133.52\n2025-01-02,USD,1.0299\n"
+    )
+    assert list(parse_csv(StringIO(long))) == [
+        (date(2025, 1, 3), {"USD": Decimal("1.0321"), "KES": Decimal("133.52")}),
+        (date(2025, 1, 2), {"USD": Decimal("1.0299")}),
+    ]
+
+    entities = (
+        b'<!DOCTYPE lol [<!ENTITY lol "lol">]><Cube time="2025-01-03">&lol;</Cube>'
+    )
+    with pytest.raises(EntitiesForbidden) as excinfo:
+        list(parse_ecb_xml(BytesIO(entities)))
+    assert isinstance(excinfo.value, INVALID_FILE_ERRORS)
+
+
+def test_loader_bumps_versions_per_chunk(
+    currencies,
+    user,
+    django_capture_on_commit_callbacks,
+):
+    days = list(parse_ecb_xml(BytesIO(ECB_XML)))
+    with django_capture_on_commit_callbacks() as callbacks:
+        RateLoader(user.pk, chunk_days=1).load(days)
+
+    assert len(callbacks) == 2  # noqa: PLR2004
+
+
+def test_loader_upserts_and_skips_unchanged(currencies, user):
+    days = list(parse_ecb_xml(BytesIO(ECB_XML)))
+    stats = RateLoader(user.pk, chunk_days=1).load(days)
+
+    # Quoted against local units where the day quotes KES, else kept as cross rates.
+    assert stats["exchange rates inserted"] == 2  # noqa: PLR2004
+    assert stats["cross rates inserted"] == 1
+    assert stats["rates for unknown currencies"] == 2  # noqa: PLR2004
+    assert {
+        (rate.currency_id, rate.created_at, rate.rate)
+        for rate in ExchangeRate.objects.all()
+    } == {
+        ("EUR", at(3), Decimal("133.52")),
+        ("USD", at(3), Decimal("129.36730937")),
+    }
+    assert CrossRate.objects.values_list(
+        "base",
+        "quote",
+        "created_at",
+        "rate",
+    ).get() == (
+        "EUR",
+        "USD",
+        at(2),
+        Decimal("1.0299"),
+    )
+
+    stats = RateLoader(user.pk).load(days)
+    assert stats["exchange rates unchanged"] == 2  # noqa: PLR2004
+    assert stats["cross rates unchanged"] == 1
+    assert stats["exchange rates inserted"] == 0
+
+    days[0][1]["USD"] = Decimal("1.05")
+    stats = RateLoader(user.pk).load(days)
+    assert (stats["exchange rates updated"], stats["exchange rates unchanged"]) == (
+        1,
+        1,
+    )
+    assert ExchangeRate.objects.get(currency="USD").rate == Decimal("127.16190476")
+    assert ExchangeRate.objects.count() == 2  # noqa: PLR2004
+
+
+def test_todays_rate_is_stamped_like_a_dated_put(currencies, user):
+    today = timezone.localdate()
+    before = timezone.now()
+    RateLoader(user.pk).load(
+        [
+            (
+                today - timedelta(days=1),
+                {"USD": Decimal("1.03"), "KES": Decimal("133.5")},
+            ),
+            (today, {"USD": Decimal("1.04"), "KES": Decimal("133.5")}),
+        ],
+    )
+
+    # From now, so it supersedes today's earlier ticks.
+    assert (
+        ExchangeRate.objects.get(currency="USD", effective_date=today).created_at
+        >= before
+    )
+    yesterday = ExchangeRate.objects.get(
+        currency="USD",
+        effective_date=today - timedelta(days=1),
+    )
+    assert yesterday.created_at == day_start(today - timedelta(days=1))
+
+
+def test_load_rates_command(currencies, user, tmp_path):
+    user.is_superuser = True
+    user.save()
+    path = tmp_path / "eurofxref-hist.csv"
+    path.write_text("Date,USD,KES,\n2025-01-03,1.0321,133.52,\n")
+    out = StringIO()
+    call_command("load_rates", str(path), stdout=out)
+    assert "2 exchange rates inserted" in out.getvalue()
+    assert ExchangeRate.objects.count() == 2  # noqa: PLR2004
+
+    path.write_text("Date,USD,\nyesterday,1.0321,\n")
+    with pytest.raises(CommandError, match="eurofxref-hist.csv"):
+        call_command("load_rates", str(path), stdout=out)
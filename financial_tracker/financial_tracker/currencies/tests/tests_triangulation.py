@@ -0,0 +1,83 @@
+from decimal import Decimal
+
+import pytest
+
+from financial_tracker.core.response_cache import bump_version
+from financial_tracker.currencies.fixedpoint import RATE_SCALE
+from financial_tracker.currencies.fixedpoint import to_scaled_rate
+from financial_tracker.currencies.models import CrossRate
+from financial_tracker.currencies.models import Currency
+from financial_tracker.currencies.models import ExchangeRate
+from financial_tracker.currencies.triangulation import conversion_path
+from financial_tracker.currencies.triangulation import find_path
+
+
+def edge(rate):
+    return to_scaled_rate(Decimal(rate)), RATE_SCALE
+
+
+GRAPH = {
+    "NGN": {"USD": edge("0.00065"), "ZAR": edge("0.012")},
+    "USD": {"KES": edge("129")},
+    "ZAR": {"KES": edge("7"), "EUR": edge("0.05")},
+    "EUR": {"KES": edge("140")},
+}
+
+
+def test_find_path_prefers_fewest_conversions():
+    assert find_path(GRAPH, "EUR", "KES") == (("EUR", "KES"), to_scaled_rate(140))
+
+
+def test_find_path_breaks_ties_with_preferred_currencies():
+    codes, rate = find_path(GRAPH, "NGN", "KES", preferred={"USD"})
+    assert codes == ("NGN", "USD", "KES")
+    assert rate == to_scaled_rate(Decimal("0.08385"))
+
+    codes, _ = find_path(GRAPH, "NGN", "KES", preferred={"ZAR"})
+    assert codes == ("NGN", "ZAR", "KES")
+
+
+def test_find_path_max_hops():
+    graph = {
+        "AAA": {"BBB": edge("2")},
+        "BBB": {"CCC": edge("3")},
+        "CCC": {"KES": edge("5")},
+    }
+    assert find_path(graph, "AAA", "KES", max_hops=3)[1] == to_scaled_rate(30)
+    assert find_path(graph, "AAA", "KES", max_hops=2) is None
+
+
+@pytest.mark.django_db
+def test_conversion_path_through_inverse_cross_rate(user):
+    Currency.objects.create(
+        code="KES",
+        description="Kenyan Shilling",
+        is_local=True,
+        created_by=user,
+    )
+    usd = Currency.objects.create(
+        code="USD",
+        description="US Dollar",
+        is_local=False,
+        created_by=user,
+    )
+    ngn = Currency.objects.create(
+        code="NGN",
+        description="Naira",
+        is_local=False,
+        created_by=user,
+    )
+    ExchangeRate.objects.create(currency=usd, rate=Decimal("129"), created_by=user)
+    # Quoted the other way round: naira per dollar.
+    CrossRate.objects.create(base=usd, quote=ngn, rate=Decimal("1600"), created_by=user)
+
+    assert conversion_path("NGN") == (
+        ("NGN", "USD", "KES"),
+        to_scaled_rate(Decimal("0.080625")),
+    )
+
+    ExchangeRate.objects.create(currency=ngn, rate=Decimal("0.5"), created_by=user)
+    # Cached until a rate write commits and bumps the version.
+    assert conversion_path("NGN")[0] == ("NGN", "USD", "KES")
+    bump_version(ExchangeRate)
+    assert conversion_path("NGN") == (("NGN", "KES"), to_scaled_rate(Decimal("0.5")))
@@ -1,8 +1,11 @@
 import pytest
 from django.urls import reverse
-from rest_framework.test import APIClient
+from django.utils import timezone
 from rest_framework import status
-from ..models import Currency, ExchangeRate
+from rest_framework.test import APIClient
+
+from financial_tracker.currencies.models import Currency
+from financial_tracker.currencies.models import ExchangeRate
 
 
 @pytest.fixture
@@ -13,8 +16,8 @@ def api_client():
 @pytest.mark.django_db
 def test_currency_list(api_client, currency_factory, user):
     # Arrange: Create a local currency first to satisfy validation
-    
-    api_client.force_authenticate(user=user) # Login for session-based auth
+
+    api_client.force_authenticate(user=user)  # Login for session-based auth
     local_currency = currency_factory(is_local=True)
     # Then create additional foreign currencies
     foreign_currencies = currency_factory.create_batch(2, is_local=False)
@@ -33,7 +36,7 @@ def test_currency_list(api_client, currency_factory, user):
 
 @pytest.mark.django_db
 def test_currency_create(api_client, user):
-    api_client.force_authenticate(user=user) # Login for session-based auth
+    api_client.force_authenticate(user=user)  # Login for session-based auth
     # Arrange: New currency data
     url = reverse("api:currencies:currency-list")
     data = {"code": "USD", "description": "US Dollar", "is_local": True}
@@ -48,7 +51,7 @@ def test_currency_create(api_client, user):
 
 @pytest.mark.django_db
 def test_currency_filter_by_is_local(api_client, currency_factory, user):
-    api_client.force_authenticate(user=user) # Login for session-based auth
+    api_client.force_authenticate(user=user)  # Login for session-based auth
     # Arrange: Create local and foreign currencies
     currency_factory(is_local=True)
     currency_factory(is_local=False)
@@ -65,11 +68,11 @@ def test_currency_filter_by_is_local(api_client, currency_factory, user):
 
 @pytest.mark.django_db
 def test_exchange_rate_list(api_client, exchange_rate_factory, currency_factory, user):
-    api_client.force_authenticate(user=user) # Login for session-based auth
+    api_client.force_authenticate(user=user)  # Login for session-based auth
     # Arrange: Create a local currency first to satisfy validation
     local_currency = currency_factory(is_local=True)
 
-        # Create foreign currencies
+    # Create foreign currencies
     foreign_currencies = currency_factory.create_batch(2, is_local=False)
 
     # Create exchange rates for foreign currencies
@@ -87,7 +90,7 @@ def test_exchange_rate_list(api_client, exchange_rate_factory, currency_factory,
 
 @pytest.mark.django_db
 def test_exchange_rate_create(api_client, currency_factory, user):
-    api_client.force_authenticate(user=user) # Login for session-based auth
+    api_client.force_authenticate(user=user)  # Login for session-based auth
     # Arrange: Create a currency and prepare exchange rate data
     local_currency = currency_factory(is_local=True)
     foreign_currency = currency_factory()
@@ -104,11 +107,11 @@ def test_exchange_rate_create(api_client, currency_factory, user):
 
 @pytest.mark.django_db
 def test_get_local_currency(api_client, currency_factory, user):
-    api_client.force_authenticate(user=user) # Login for session-based auth
+    api_client.force_authenticate(user=user)  # Login for session-based auth
     # Arrange: Create a local currency
     currency = currency_factory(is_local=True)
-    
-     # Debug: Print the created currency and all currencies in the database
+
+    # Debug: Print the created currency and all currencies in the database
     print(f"Created Currency: {currency}")
     print(f"Local Currency: {Currency.objects.filter(is_local=True)}")
 
@@ -134,37 +137,149 @@ def test_get_local_currency_not_found(api_client, user):
     assert response.status_code == status.HTTP_404_NOT_FOUND
     assert "detail" in response.data
 
+
 @pytest.mark.django_db
 def test_create_exchange_rate_with_local_currency(api_client, currency_factory, user):
-    api_client.force_authenticate(user=user) # Login for session-based auth
+    api_client.force_authenticate(user=user)  # Login for session-based auth
     # Create a local currency
     local_currency = currency_factory(is_local=True)
-    
+
     # Attempt to create an exchange rate for the local currency
     response = api_client.post(
         "/api/currencies/currencies/exchangerates/",
         {"currency": local_currency.code, "rate": "1.50"},
         format="json",
     )
-    
+
     # Assert that the response returns a 400 Bad Request
     assert response.status_code == status.HTTP_400_BAD_REQUEST
-    assert "Exchange rates cannot be assigned to local currencies." in response.data["non_field_errors"]
+    assert (
+        "Exchange rates cannot be assigned to local currencies."
+        in response.data["non_field_errors"]
+    )
+
 
 @pytest.mark.django_db
 def test_create_exchange_rate_with_foreign_currency(api_client, currency_factory, user):
-    api_client.force_authenticate(user=user) # Login for session-based auth
+    api_client.force_authenticate(user=user)  # Login for session-based auth
     local_currency = currency_factory(is_local=True)
     # Create a foreign currency
     foreign_currency = currency_factory(is_local=False)
-    
+
     # Create an exchange rate for the foreign currency
     response = api_client.post(
         "/api/currencies/currencies/exchangerates/",
         {"currency": foreign_currency.code, "rate": "1.50"},
         format="json",
     )
-    
+
     # Assert that the response is successful
     assert response.status_code == status.HTTP_201_CREATED
-    assert response.data["currency"]["code"] == foreign_currency.code
\ No newline at end of file
+    assert response.data["currency"]["code"] == foreign_currency.code
+
+
+@pytest.mark.django_db
+def test_get_local_currency_is_cached(
+    api_client,
+    currency_factory,
+    user,
+    django_assert_num_queries,
+    django_capture_on_commit_callbacks,
+):
+    api_client.force_authenticate(user=user)
+    currency = currency_factory(is_local=True)
+    url = reverse("api:currencies:get-localcurrency")
+    api_client.get(url)
+
+    # Served from the cache without touching the database.
+    with django_assert_num_queries(0):
+        response = api_client.get(url)
+    assert response.data["local_currency_code"] == currency.code
+
+    # Saving a currency clears the cached code once the transaction commits.
+    with django_capture_on_commit_callbacks(execute=True):
+        currency.delete()
+    assert api_client.get(url).status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_exchange_rate_list_query_count(
+    api_client,
+    exchange_rate_factory,
+    currency_factory,
+    user,
+    django_assert_num_queries,
+):
+    api_client.force_authenticate(user=user)
+    currency_factory(is_local=True)
+    for foreign_currency in currency_factory.create_batch(3, is_local=False):
+        exchange_rate_factory(currency=foreign_currency)
+
+    # The validator aggregate and the rows, regardless of the number of rates.
+    with django_assert_num_queries(2):
+        response = api_client.get(reverse("api:currencies:exchangerate-list"))
+    assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+def test_dated_exchange_rate_upsert(
+    api_client,
+    user,
+    django_capture_on_commit_callbacks,
+):
+    Currency.objects.create(
+        code="KES",
+        description="Kenyan Shilling",
+        is_local=True,
+        created_by=user,
+    )
+    Currency.objects.create(
+        code="USD",
+        description="US Dollar",
+        is_local=False,
+        created_by=user,
+    )
+    url = reverse(
+        "api:currencies:exchangerate-dated",
+        kwargs={"code": "USD", "effective_date": "2025-01-03"},
+    )
+    assert (
+        api_client.put(url, {"rate": "129.10"}, format="json").status_code
+        == status.HTTP_403_FORBIDDEN
+    )
+
+    api_client.force_authenticate(user=user)
+    with django_capture_on_commit_callbacks(execute=True):
+        for rate in ["129.10", "129.25", "129.25"]:
+            response = api_client.put(url, {"rate": rate}, format="json")
+            assert response.status_code == status.HTTP_200_OK
+    assert (response.data["rate"], response.data["effective_date"]) == (
+        "129.25",
+        "2025-01-03",
+    )
+    exchange_rate = ExchangeRate.objects.get()
+    assert (
+        timezone.localtime(exchange_rate.created_at).isoformat()
+        == "2025-01-03T00:00:00+03:00"
+    )
+    assert api_client.get(url).data["rate"] == "129.25"
+
+    # Ticks through the day are not dated, so they never conflict.
+    ExchangeRate.objects.create(currency_id="USD", rate="129.40", created_by=user)
+    ExchangeRate.objects.create(currency_id="USD", rate="129.50", created_by=user)
+    assert ExchangeRate.objects.count() == 3  # noqa: PLR2004
+
+    for code, day, expected in [
+        ("KES", "2025-01-03", status.HTTP_400_BAD_REQUEST),
+        ("GBP", "2025-01-03", status.HTTP_404_NOT_FOUND),
+        ("USD", "2025-02-30", status.HTTP_400_BAD_REQUEST),
+        ("USD", "2999-01-01", status.HTTP_400_BAD_REQUEST),
+    ]:
+        url = reverse(
+            "api:currencies:exchangerate-dated",
+            kwargs={"code": code, "effective_date": day},
+        )
+        assert (
+            api_client.put(url, {"rate": "129.10"}, format="json").status_code
+            == expected
+        )
@@ -0,0 +1,117 @@
+"""Convert currencies with no rate against the local currency through others.
+
+Known rates form a graph: each currency's latest ``ExchangeRate`` links it to
+the local currency and each pair's latest ``CrossRate`` links the pair, both
+ways since the inverse of a rate converts back. ``find_path`` runs Dijkstra
+over it. A path costs its number of conversions first and then its number of
+intermediate currencies outside ``TRIANGULATION_PREFERRED_CURRENCIES``, so
+the shortest path wins and preferred currencies break ties.
+
+Rates along a path are multiplied as exact fractions and rounded once, to the
+eight places of a stored rate. Paths are cached per currency together with
+the versions of the rate models, so any committed rate write invalidates them.
+"""
+
+import heapq
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+
+from financial_tracker.core.response_cache import get_versions
+
+from .fixedpoint import RATE_SCALE
+from .fixedpoint import divide
+from .fixedpoint import to_scaled_rate
+from .models import CrossRate
+from .models import Currency
+from .models import ExchangeRate
+
+PATH_KEY = "currencies:conversion-path:{}"
+PATH_TIMEOUT = 60 * 60
+PATH_MODELS = (Currency, ExchangeRate, CrossRate)
+
+
+def load_graph():
+    """``(local code, {code: {neighbour: (numerator, denominator)}})``: one
+    unit of ``code`` is ``numerator / denominator`` units of ``neighbour``.
+
+    Raises ``Currency.DoesNotExist`` when no local currency is set.
+    """
+    local = Currency.objects.values_list("code", flat=True).get(is_local=True)
+    rates = (
+        ExchangeRate.objects.order_by("currency", "-created_at", "-pk")
+        .distinct("currency")
+        .values_list("currency", "rate")
+    )
+    cross_rates = (
+        CrossRate.objects.order_by("base", "quote", "-created_at", "-pk")
+        .distinct("base", "quote")
+        .values_list("base", "quote", "rate")
+    )
+    edges = [(code, local, to_scaled_rate(rate)) for code, rate in rates]
+    edges += [(base, quote, to_scaled_rate(rate)) for base, quote, rate in cross_rates]
+
+    graph: defaultdict[str, dict[str, tuple[int, int]]] = defaultdict(dict)
+    for base, quote, rate in edges:
+        graph[base][quote] = (rate, RATE_SCALE)
+    # Inverses only where there is no rate quoted that way round.
+    for base, quote, rate in edges:
+        graph[quote].setdefault(base, (RATE_SCALE, rate))
+    return local, graph
+
+
+def find_path(graph, source, target, *, preferred=(), max_hops=3):
+    """``(codes, scaled rate)`` of the cheapest path from ``source`` to
+    ``target`` with at most ``max_hops`` conversions, or ``None``."""
+    queue = [((0, 0), source, (source,), 1, 1)]
+    settled = set()
+    while queue:
+        (hops, detours), code, path, numerator, denominator = heapq.heappop(queue)
+        if code == target:
+            return path, divide(numerator * RATE_SCALE, denominator)
+        if code in settled:
+            continue
+        settled.add(code)
+        if hops == max_hops:
+            continue
+        detour = 0 if code == source or code in preferred else 1
+        for neighbour, (rate_numerator, rate_denominator) in graph.get(
+            code,
+            {},
+        ).items():
+            if neighbour not in settled:
+                heapq.heappush(
+                    queue,
+                    (
+                        (hops + 1, detours + detour),
+                        neighbour,
+                        (*path, neighbour),
+                        numerator * rate_numerator,
+                        denominator * rate_denominator,
+                    ),
+                )
+    return None
+
+
+def conversion_path(code):
+    """``(codes, scaled rate)`` converting ``code`` into the local currency
+    through other currencies, or ``None`` when the known rates do not connect
+    them. Cached until a currency or rate changes.
+    """
+    key = PATH_KEY.format(code)
+    versions = get_versions(PATH_MODELS)
+    entry = cache.get(key)
+    if entry is not None and entry[0] == versions:
+        return entry[1]
+
+    local, graph = load_graph()
+    path = find_path(
+        graph,
+        code,
+        local,
+        preferred=set(settings.TRIANGULATION_PREFERRED_CURRENCIES),
+        max_hops=settings.TRIANGULATION_MAX_HOPS,
+    )
+    cache.set(key, (versions, path), PATH_TIMEOUT)
+    return path
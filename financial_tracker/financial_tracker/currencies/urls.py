@@ -1,24 +1,33 @@
-from rest_framework.routers import DefaultRouter
 from django.urls import path
-from .api.views import CurrencyViewSet, ExchangeRateViewSet, GetLocalCurrencyAPIView
+from rest_framework.routers import DefaultRouter
+
+from .api.views import ConvertBatchAPIView
+from .api.views import CrossRatesAPIView
+from .api.views import CurrencyViewSet
+from .api.views import ExchangeRateViewSet
+from .api.views import GetLocalCurrencyAPIView
 
 router = DefaultRouter()
-#router.register('', CurrencyViewSet, basename='currency')
-router.register('currencies', CurrencyViewSet, basename='currency')
-router.register('exchangerates', ExchangeRateViewSet, basename='exchangerate')
-#router.register('currencies/exchangerates', ExchangeRateViewSet, basename='exchangerate')
+# router.register('', CurrencyViewSet, basename='currency')
+router.register("currencies", CurrencyViewSet, basename="currency")
+router.register("exchangerates", ExchangeRateViewSet, basename="exchangerate")
+# router.register('currencies/exchangerates', ExchangeRateViewSet, basename='exchangerate')
 app_name = "currencies"
 
 urlpatterns = router.urls
 
 urlpatterns = [
     *router.urls,  # Include URLs generated by the router
-    path('get-localcurrency/', GetLocalCurrencyAPIView.as_view(), name='get-localcurrency'),
+    path(
+        "get-localcurrency/",
+        GetLocalCurrencyAPIView.as_view(),
+        name="get-localcurrency",
+    ),
+    path("crossrates/", CrossRatesAPIView.as_view(), name="crossrates"),
+    path("convert/batch/", ConvertBatchAPIView.as_view(), name="convert-batch"),
 ]
 
 
-
-
 # urlpatterns = [
 #     *router.urls,
 #     path('currencies/get-localcurrency/', GetLocalCurrencyAPIView.as_view(), name='get-localcurrency'),
@@ -1,14 +1,30 @@
 from rest_framework import serializers
-from ..models import EarnedIncome, PortfolioIncome, PassiveIncome
+
+from financial_tracker.currencies.fixedpoint import to_minor
+from financial_tracker.income.models import EarnedIncome
+from financial_tracker.income.models import PassiveIncome
+from financial_tracker.income.models import PortfolioIncome
+
 
 class BaseIncomeSerializer(serializers.ModelSerializer):
-    created_by = serializers.ReadOnlyField(source='created_by.username')
-    modified_by = serializers.ReadOnlyField(source='modified_by.username')
-    #currency_symbol = serializers.SerializerMethodField()
+    # Stored in minor units; shown in units of the currency with its decimal places.
+    # 18 digits always fit the BIGINT column.
+    amount = serializers.DecimalField(max_digits=18, decimal_places=None)
+    created_by = serializers.ReadOnlyField(source="created_by.username")
+    modified_by = serializers.ReadOnlyField(source="modified_by.username")
+    # currency_symbol = serializers.SerializerMethodField()
 
     class Meta:
         fields = [
-            'id',  'income_name', 'currency', 'amount', 'notes', 'created_by', 'created_at', 'modified_by', 'modified_at', 
+            "id",
+            "income_name",
+            "currency",
+            "amount",
+            "notes",
+            "created_by",
+            "created_at",
+            "modified_by",
+            "modified_at",
         ]
 
     # def get_currency_symbol(self, obj):
@@ -17,9 +33,24 @@ class BaseIncomeSerializer(serializers.ModelSerializer):
 
     def validate(self, data):
         # Validate non-negative amount and amount_lcy
-        if data.get('amount') < 0:
+        # A partial update keeps the amount, which must then fit a new currency.
+        # Not data.get(): there is no instance to fall back on when creating.
+        amount = data["amount"] if "amount" in data else self.instance.amount  # type: ignore[union-attr]  # noqa: SIM401
+        if amount < 0:
             raise serializers.ValidationError("Amount must be non-negative.")
+        currency = data.get("currency") or self.instance.currency  # type: ignore[union-attr]
+        try:
+            to_minor(amount, currency.exponent)
+        except ValueError as err:
+            raise serializers.ValidationError(
+                {
+                    "amount": f"{currency.code} amounts have at most "
+                    f"{currency.exponent} decimal places.",
+                },
+            ) from err
         return data
+
+
 class EarnedIncomeSerializer(BaseIncomeSerializer):
     class Meta(BaseIncomeSerializer.Meta):
         model = EarnedIncome
@@ -33,4 +64,6 @@ class PortfolioIncomeSerializer(BaseIncomeSerializer):
 class PassiveIncomeSerializer(BaseIncomeSerializer):
     class Meta(BaseIncomeSerializer.Meta):
         model = PassiveIncome
-#'url','currency_symbol'
\ No newline at end of file
+
+
+#'url','currency_symbol'
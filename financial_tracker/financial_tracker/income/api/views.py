@@ -1,68 +1,95 @@
-from rest_framework import viewsets, filters, status
-from rest_framework.permissions import IsAuthenticated, AllowAny, IsAuthenticatedOrReadOnly
-from ..models import EarnedIncome, PortfolioIncome, PassiveIncome
-from . serializers import EarnedIncomeSerializer, PortfolioIncomeSerializer, PassiveIncomeSerializer
-from rest_framework.views import APIView
+from django.db.models import F
 from django.db.models import Sum
+from django.db.models.functions import Power
+from rest_framework import filters
+from rest_framework import status
+from rest_framework import viewsets
+from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
 
+from financial_tracker.core.api.views import AsyncAPIView
+from financial_tracker.core.api.views import ConditionalGetMixin
+from financial_tracker.core.response_cache import cache_response
+from financial_tracker.currencies.fixedpoint import from_minor
+from financial_tracker.income.models import EarnedIncome
+from financial_tracker.income.models import PassiveIncome
+from financial_tracker.income.models import PortfolioIncome
+
+from .serializers import EarnedIncomeSerializer
+from .serializers import PassiveIncomeSerializer
+from .serializers import PortfolioIncomeSerializer
+
+
+def income_queryset(model):
+    # ``amount`` is a property over minor units; the alias keeps ?ordering=amount
+    # working, in units of each row's currency.
+    return model.objects.select_related("currency").alias(
+        amount=F("amount_minor") / Power(10, "currency__exponent"),
+    )
+
+
 # Create your views here.
-class EarnedIncomeViewSet(viewsets.ModelViewSet):
-    queryset = EarnedIncome.objects.all()
+class EarnedIncomeViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
+    queryset = income_queryset(EarnedIncome)
     serializer_class = EarnedIncomeSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
     filter_backends = [filters.OrderingFilter, filters.SearchFilter]
-    search_fields = ['income_name', 'currency__symbol']
-    ordering_fields = ['created_at', 'amount']
-    ordering = ['-created_at']
+    search_fields = ["income_name", "currency__symbol"]
+    ordering_fields = ["created_at", "amount"]
+    ordering = ["-created_at"]
+
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
+
     def perform_update(self, serializer):
         serializer.save(modified_by=self.request.user)
 
-class PortfolioIncomeViewSet(viewsets.ModelViewSet):
-    queryset = PortfolioIncome.objects.all()
+
+class PortfolioIncomeViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
+    queryset = income_queryset(PortfolioIncome)
     serializer_class = PortfolioIncomeSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
     filter_backends = [filters.OrderingFilter, filters.SearchFilter]
-    search_fields = ['income_name', 'currency__symbol']
-    ordering_fields = ['created_at', 'amount']
-    ordering = ['-created_at']
+    search_fields = ["income_name", "currency__symbol"]
+    ordering_fields = ["created_at", "amount"]
+    ordering = ["-created_at"]
+
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
+
     def perform_update(self, serializer):
         serializer.save(modified_by=self.request.user)
 
-class PassiveIncomeViewSet(viewsets.ModelViewSet):
-    queryset = PassiveIncome.objects.all()
+
+class PassiveIncomeViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
+    queryset = income_queryset(PassiveIncome)
     serializer_class = PassiveIncomeSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
     filter_backends = [filters.OrderingFilter, filters.SearchFilter]
-    search_fields = ['income_name', 'currency__symbol']
-    ordering_fields = ['created_at', 'amount']
-    ordering = ['-created_at']
+    search_fields = ["income_name", "currency__symbol"]
+    ordering_fields = ["created_at", "amount"]
+    ordering = ["-created_at"]
+
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
+
     def perform_update(self, serializer):
         serializer.save(modified_by=self.request.user)
 
-class TotalIncomeAPIView(APIView):
-    
-    def calculate_total_income(self):
-                # Annotate the total sum of 'amount' for each queryset
-        earned_income_queryset = EarnedIncome.objects.annotate(total_amount=Sum('amount'))
-        portfolio_income_queryset = PortfolioIncome.objects.annotate(total_amount=Sum('amount'))
-        passive_income_queryset = PassiveIncome.objects.annotate(total_amount=Sum('amount'))
-
-        # Sum the 'total_amount' from all the querysets
-        earned_income_total = earned_income_queryset.aggregate(total=Sum('total_amount'))['total'] or 0
-        portfolio_income_total = portfolio_income_queryset.aggregate(total=Sum('total_amount'))['total'] or 0
-        passive_income_total = passive_income_queryset.aggregate(total=Sum('total_amount'))['total'] or 0
-
-        # Calculate the total income
-        total_income = earned_income_total + portfolio_income_total + passive_income_total
+
+class TotalIncomeAPIView(AsyncAPIView):
+    async def calculate_total_income(self):
+        total_income = 0
+        for model in (EarnedIncome, PortfolioIncome, PassiveIncome):
+            # Minor units only add up within an exponent.
+            totals = model.objects.values_list("currency__exponent").annotate(
+                total=Sum("amount_minor"),
+            )
+            async for exponent, total in totals:
+                total_income += from_minor(total, exponent)
         return total_income
 
-    def get(self, request):
-        total_income = self.calculate_total_income()
-        return Response({"total_income": total_income}, status=status.HTTP_200_OK)
\ No newline at end of file
+    @cache_response(EarnedIncome, PortfolioIncome, PassiveIncome)
+    async def get(self, request):
+        total_income = await self.calculate_total_income()
+        return Response({"total_income": total_income}, status=status.HTTP_200_OK)
@@ -0,0 +1,399 @@
+import math
+import multiprocessing
+import random
+import time
+from bisect import bisect_right
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db import connections
+from django.utils import timezone
+
+from financial_tracker.core.db import copy_rows
+from financial_tracker.core.response_cache import bump_version
+from financial_tracker.currencies.fixedpoint import convert
+from financial_tracker.currencies.fixedpoint import to_scaled_rate
+from financial_tracker.currencies.models import Currency
+from financial_tracker.currencies.models import ExchangeRate
+from financial_tracker.income.models import EarnedIncome
+from financial_tracker.income.models import PassiveIncome
+from financial_tracker.income.models import PortfolioIncome
+
+User = get_user_model()
+
+MIN_RATE = to_scaled_rate(Decimal("0.10"))
+# Most income is earned in the local currency; some of it carries notes.
+LOCAL_SHARE = 0.6
+NOTES_SHARE = 0.1
+
+# (code, description, units per US dollar), roughly ordered by how often they
+# show up in a ledger; the order drives the currency popularity skew.
+CURRENCIES = [
+    ("USD", "US Dollar", 1.0),
+    ("EUR", "Euro", 0.92),
+    ("GBP", "Pound Sterling", 0.79),
+    ("KES", "Kenyan Shilling", 129.0),
+    ("JPY", "Japanese Yen", 150.0),
+    ("CHF", "Swiss Franc", 0.88),
+    ("CAD", "Canadian Dollar", 1.36),
+    ("AUD", "Australian Dollar", 1.52),
+    ("ZAR", "South African Rand", 18.6),
+    ("UGX", "Ugandan Shilling", 3800.0),
+    ("TZS", "Tanzanian Shilling", 2600.0),
+    ("INR", "Indian Rupee", 83.0),
+    ("CNY", "Yuan Renminbi", 7.2),
+    ("AED", "UAE Dirham", 3.67),
+    ("SEK", "Swedish Krona", 10.5),
+    ("NOK", "Norwegian Krone", 10.6),
+    ("DKK", "Danish Krone", 6.9),
+    ("NZD", "New Zealand Dollar", 1.64),
+    ("SGD", "Singapore Dollar", 1.34),
+    ("HKD", "Hong Kong Dollar", 7.8),
+    ("NGN", "Naira", 1500.0),
+    ("GHS", "Ghana Cedi", 15.0),
+    ("EGP", "Egyptian Pound", 48.0),
+    ("MAD", "Moroccan Dirham", 10.0),
+    ("BRL", "Brazilian Real", 5.0),
+    ("MXN", "Mexican Peso", 17.0),
+    ("PLN", "Zloty", 4.0),
+    ("CZK", "Czech Koruna", 23.0),
+    ("TRY", "Turkish Lira", 32.0),
+    ("SAR", "Saudi Riyal", 3.75),
+    ("QAR", "Qatari Rial", 3.64),
+    ("RWF", "Rwanda Franc", 1300.0),
+    ("ETB", "Ethiopian Birr", 57.0),
+    ("THB", "Baht", 36.0),
+    ("MYR", "Malaysian Ringgit", 4.7),
+    ("PHP", "Philippine Peso", 56.0),
+    ("KRW", "Won", 1330.0),
+    ("ILS", "New Israeli Sheqel", 3.7),
+    ("HUF", "Forint", 360.0),
+    ("BWP", "Pula", 13.6),
+]
+PER_USD = {code: per_usd for code, _, per_usd in CURRENCIES}
+# ISO 4217 minor units of the currencies above that have no cents.
+EXPONENTS = {"JPY": 0, "KRW": 0, "RWF": 0, "UGX": 0}
+
+# model, share of all income rows, (median in USD, sigma) of the log-normal
+# amount distribution, and typical income names.
+INCOME_TYPES = [
+    (
+        EarnedIncome,
+        0.55,
+        (1800.0, 0.9),
+        [
+            "Salary",
+            "Bonus",
+            "Overtime",
+            "Freelance project",
+            "Consulting fee",
+            "Side hustle",
+            "Commission",
+            "Contract work",
+        ],
+    ),
+    (
+        PortfolioIncome,
+        0.30,
+        (250.0, 1.4),
+        [
+            "Dividends",
+            "Bond coupon",
+            "Capital gains",
+            "Stock sale",
+            "Fund distribution",
+            "Crypto gains",
+        ],
+    ),
+    (
+        PassiveIncome,
+        0.15,
+        (120.0, 1.2),
+        [
+            "Rent",
+            "Royalties",
+            "Savings interest",
+            "Affiliate payout",
+            "Owner equity draw",
+            "Licensing fee",
+        ],
+    ),
+]
+
+# Shared with forked worker processes; see Command.load_income.
+_context: dict = {}
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a reproducible dataset of users, currencies, exchange rate time "
+        "series and income for load tests and benchmarks. Rows are written with "
+        "PostgreSQL COPY from several processes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument(
+            "--currencies",
+            type=int,
+            default=30,
+            help="Foreign currencies to create.",
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=365,
+            help="Length of the rate and income history.",
+        )
+        parser.add_argument("--rates-per-day", type=int, default=4)
+        parser.add_argument(
+            "--incomes",
+            type=int,
+            default=100_000,
+            help="Income rows across all three types.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=50_000,
+            help="Income rows per COPY.",
+        )
+        parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            msg = "seed_dataset uses COPY and needs a PostgreSQL database."
+            raise CommandError(msg)
+        # Seeded for a reproducible dataset, not for secrecy.
+        rng = random.Random(options["seed"])  # noqa: S311
+        end = timezone.now().replace(microsecond=0)
+        start = end - timedelta(days=options["days"])
+
+        started = time.monotonic()
+        user_ids = self.create_users(options["users"])
+        local, foreign = self.create_currencies(options["currencies"], user_ids[0])
+        rates = self.create_rates(rng, local, foreign, user_ids, start, options)
+        self.load_income(options, local, foreign, rates, user_ids, start, end)
+
+        loaded = [ExchangeRate, *(income_type[0] for income_type in INCOME_TYPES)]
+        with connection.cursor() as cursor:
+            for model in loaded:
+                cursor.execute(
+                    f"ANALYZE {connection.ops.quote_name(model._meta.db_table)}",  # noqa: SLF001
+                )
+        # COPY and bulk_create send no signals, so cached responses are
+        # invalidated here.
+        for model in [Currency, *loaded]:
+            bump_version(model)
+        self.stdout.write(
+            self.style.SUCCESS(f"Dataset ready in {time.monotonic() - started:.1f}s."),
+        )
+
+    def create_users(self, count):
+        password = make_password(None)
+        User.objects.bulk_create(
+            [
+                User(username=f"seed-{i}", name=f"Seed User {i}", password=password)
+                for i in range(count)
+            ],
+            batch_size=5000,
+            ignore_conflicts=True,
+        )
+        user_ids = list(
+            User.objects.filter(username__startswith="seed-")
+            .order_by("pk")
+            .values_list("pk", flat=True)[:count],
+        )
+        self.stdout.write(f"{len(user_ids)} users.")
+        return user_ids
+
+    def create_currencies(self, count, creator_id):
+        local = Currency.objects.filter(is_local=True).first()
+        if local is None:
+            code, description, _ = CURRENCIES[3]
+            local = Currency.objects.create(
+                code=code,
+                description=description,
+                is_local=True,
+                exponent=EXPONENTS.get(code, 2),
+                created_by_id=creator_id,
+            )
+        local_per_usd = PER_USD.get(local.code, 1.0)
+
+        foreign = []
+        for code, description, per_usd in CURRENCIES:
+            if code == local.code:
+                continue
+            # Rates are quoted as local units per foreign unit.
+            rate = local_per_usd / per_usd
+            if to_scaled_rate(rate) >= MIN_RATE * 2:
+                foreign.append(
+                    (code, description, per_usd, rate, EXPONENTS.get(code, 2)),
+                )
+        foreign = foreign[:count]
+        Currency.objects.bulk_create(
+            [
+                Currency(
+                    code=code,
+                    description=description,
+                    is_local=False,
+                    exponent=exponent,
+                    created_by_id=creator_id,
+                )
+                for code, description, _, _, exponent in foreign
+            ],
+            ignore_conflicts=True,
+        )
+        self.stdout.write(
+            f"Local currency {local.code}, {len(foreign)} foreign currencies.",
+        )
+        return local, foreign
+
+    def create_rates(self, rng, local, foreign, user_ids, start, options):  # noqa: PLR0913
+        """Write a geometric random walk of ticks per currency and return the
+        series as ``{code: (timestamps, scaled rates)}`` for as-of lookups."""
+        days, per_day = options["days"], options["rates_per_day"]
+        series = {}
+        rows = []
+        for code, _, _, rate, _ in foreign:
+            log_rate = math.log(rate)
+            timestamps, values = [], []
+            for day in range(days + 1):
+                # Daily drift-free log return with ~0.6% volatility, plus
+                # smaller intraday noise between ticks.
+                log_rate += rng.gauss(0, 0.006)
+                offsets = sorted(rng.uniform(0, 86400) for _ in range(per_day))
+                for offset in offsets:
+                    value = max(
+                        to_scaled_rate(math.exp(log_rate + rng.gauss(0, 0.001))),
+                        MIN_RATE,
+                    )
+                    stamp = start + timedelta(days=day, seconds=offset)
+                    timestamps.append(stamp)
+                    values.append(value)
+                    rows.append((code, value, rng.choice(user_ids), stamp, None, stamp))
+            series[code] = (timestamps, values)
+        written = copy_rows(
+            ExchangeRate,
+            [
+                "currency",
+                "rate",
+                "created_by",
+                "created_at",
+                "modified_by",
+                "modified_at",
+            ],
+            rows,
+        )
+        self.stdout.write(f"{written} exchange rates.")
+        return series
+
+    def load_income(self, options, local, foreign, rates, user_ids, start, end):  # noqa: PLR0913
+        total, batch_size = options["incomes"], options["batch_size"]
+        counts = [round(total * share) for _, share, _, _ in INCOME_TYPES]
+        counts[0] += total - sum(counts)
+        tasks = []
+        for index, rows in enumerate(counts):
+            for chunk, offset in enumerate(range(0, rows, batch_size)):
+                tasks.append((index, chunk, min(batch_size, rows - offset)))
+
+        _context.update(
+            seed=options["seed"],
+            local=(local.code, PER_USD.get(local.code, 1.0), local.exponent),
+            foreign=foreign,
+            rates=rates,
+            user_ids=user_ids,
+            start=start,
+            span=(end - start).total_seconds(),
+        )
+        workers = max(1, min(options["workers"], len(tasks)))
+        written = 0
+        if workers == 1:
+            for task in tasks:
+                written += load_income_chunk(task)
+        else:
+            # Forked children must not share the parent's database socket.
+            connections.close_all()
+            with multiprocessing.get_context("fork").Pool(workers) as pool:
+                for count in pool.imap_unordered(load_income_chunk, tasks):
+                    written += count
+                    self.stdout.write(f"  {written}/{total} income rows", ending="\r")
+        self.stdout.write(f"{written} income rows with {workers} workers.")
+
+
+def rate_as_of(rates, code, when):
+    timestamps, values = rates[code]
+    index = bisect_right(timestamps, when) - 1
+    return values[max(index, 0)]
+
+
+def load_income_chunk(task):
+    """Generate and COPY one chunk of income rows.
+
+    Each chunk has its own RNG derived from the seed, so the dataset does not
+    depend on how chunks are spread over worker processes.
+    """
+    index, chunk, count = task
+    model, _, (median_usd, sigma), names = INCOME_TYPES[index]
+    ctx = _context
+    rng = random.Random(f"{ctx['seed']}:{index}:{chunk}")  # noqa: S311
+    foreign = ctx["foreign"]
+    # Zipf-like popularity over the foreign currencies.
+    weights = [1 / (rank + 1) for rank in range(len(foreign))]
+    mu = math.log(median_usd)
+    local_exponent = ctx["local"][2]
+
+    def rows():
+        for _ in range(count):
+            is_local = not foreign or rng.random() < LOCAL_SHARE
+            if is_local:
+                code, per_usd, exponent = ctx["local"]
+            else:
+                code, _, per_usd, _, exponent = rng.choices(foreign, weights)[0]
+            created_at = ctx["start"] + timedelta(seconds=rng.uniform(0, ctx["span"]))
+            amount = round(rng.lognormvariate(mu, sigma) * per_usd * 10**exponent)
+            if is_local:
+                amount_lcy = amount
+            else:
+                amount_lcy = convert(
+                    amount,
+                    rate_as_of(ctx["rates"], code, created_at),
+                    exponent,
+                    local_exponent,
+                )
+            notes = "Generated by seed_dataset" if rng.random() < NOTES_SHARE else None
+            yield (
+                rng.choice(names),
+                code,
+                amount,
+                amount_lcy,
+                "",
+                notes,
+                rng.choice(ctx["user_ids"]),
+                created_at,
+                None,
+                created_at,
+            )
+
+    return copy_rows(
+        model,
+        [
+            "income_name",
+            "currency",
+            "amount_minor",
+            "amount_lcy_minor",
+            "lcy_conversion_path",
+            "notes",
+            "created_by",
+            "created_at",
+            "modified_by",
+            "modified_at",
+        ],
+        rows(),
+    )
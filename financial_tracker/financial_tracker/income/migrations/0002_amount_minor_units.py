@@ -0,0 +1,131 @@
+from django.db import migrations, models
+from django.db.migrations.exceptions import IrreversibleError
+from django.db.models import F
+from django.db.models.functions import Cast
+
+INCOME_MODELS = ['earnedincome', 'portfolioincome', 'passiveincome']
+# Integer digits of the old amount column, NUMERIC(8, 2).
+OLD_AMOUNT_DIGITS = 6
+
+
+def exponents(apps):
+    Currency = apps.get_model('currencies', 'Currency')
+    local = Currency.objects.filter(is_local=True).values_list('exponent', flat=True).first()
+    return Currency.objects.values_list('exponent', flat=True).distinct(), 2 if local is None else local
+
+
+def to_minor_units(apps, schema_editor):
+    currency_exponents, local_exponent = exponents(apps)
+    for model_name in INCOME_MODELS:
+        model = apps.get_model('income', model_name)
+        for exponent in currency_exponents:
+            model.objects.filter(currency__exponent=exponent).update(
+                amount_minor=Cast(F('amount') * 10 ** exponent, models.BigIntegerField()),
+                amount_lcy_minor=Cast(F('amount_lcy') * 10 ** local_exponent, models.BigIntegerField()),
+            )
+
+
+def check_amounts_fit(apps, schema_editor):
+    """Refuse to unapply while amounts over 999999.99, allowed since, would
+    overflow the old column; runs before any column is touched."""
+    currency_exponents, _ = exponents(apps)
+    oversized = []
+    for model_name in INCOME_MODELS:
+        model = apps.get_model('income', model_name)
+        count = sum(
+            model.objects.filter(
+                currency__exponent=exponent, amount_minor__gte=10 ** (OLD_AMOUNT_DIGITS + exponent),
+            ).count()
+            for exponent in currency_exponents
+        )
+        if count:
+            oversized.append(f'{model._meta.verbose_name_plural}: {count}')
+    if oversized:
+        raise IrreversibleError(
+            f'Cannot unapply income.0002: amounts of 1,000,000 or more do not fit the old NUMERIC(8, 2) amount '
+            f'column ({", ".join(oversized)}). Reduce or delete them first.'
+        )
+
+
+def from_minor_units(apps, schema_editor):
+    currency_exponents, local_exponent = exponents(apps)
+    as_decimal = models.DecimalField(max_digits=20, decimal_places=0)
+    for model_name in INCOME_MODELS:
+        model = apps.get_model('income', model_name)
+        for exponent in currency_exponents:
+            model.objects.filter(currency__exponent=exponent).update(
+                amount=Cast(F('amount_minor'), as_decimal) / 10 ** exponent,
+                amount_lcy=Cast(F('amount_lcy_minor'), as_decimal) / 10 ** local_exponent,
+            )
+
+
+def add_minor_unit_fields(model_name):
+    return [
+        migrations.AddField(
+            model_name=model_name,
+            name='amount_minor',
+            field=models.BigIntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name=model_name,
+            name='amount_lcy_minor',
+            field=models.BigIntegerField(default=0),
+        ),
+        # Nullable first, so that unapplying can add the column back before
+        # filling it.
+        migrations.AlterField(
+            model_name=model_name,
+            name='amount',
+            field=models.DecimalField(decimal_places=2, max_digits=8, null=True),
+        ),
+    ]
+
+
+def remove_decimal_fields(model_name):
+    return [
+        migrations.RemoveConstraint(
+            model_name=model_name,
+            name=f'{model_name}_amount_gte_zero',
+        ),
+        migrations.RemoveConstraint(
+            model_name=model_name,
+            name=f'{model_name}_amount_lcy_gte_zero',
+        ),
+        migrations.RemoveField(
+            model_name=model_name,
+            name='amount',
+        ),
+        migrations.RemoveField(
+            model_name=model_name,
+            name='amount_lcy',
+        ),
+        migrations.AlterField(
+            model_name=model_name,
+            name='amount_minor',
+            field=models.BigIntegerField(),
+        ),
+        migrations.AddConstraint(
+            model_name=model_name,
+            constraint=models.CheckConstraint(check=models.Q(('amount_minor__gte', 0)), name=f'{model_name}_amount_gte_zero'),
+        ),
+        migrations.AddConstraint(
+            model_name=model_name,
+            constraint=models.CheckConstraint(check=models.Q(('amount_lcy_minor__gte', 0)), name=f'{model_name}_amount_lcy_gte_zero'),
+        ),
+    ]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('currencies', '0003_currency_exponent_scaled_rate'),
+        ('income', '0001_initial'),
+    ]
+
+    operations = [
+        *[operation for model_name in INCOME_MODELS for operation in add_minor_unit_fields(model_name)],
+        migrations.RunPython(to_minor_units, from_minor_units),
+        *[operation for model_name in INCOME_MODELS for operation in remove_decimal_fields(model_name)],
+        # Last, so that unapplying checks first.
+        migrations.RunPython(migrations.RunPython.noop, check_amounts_fit),
+    ]
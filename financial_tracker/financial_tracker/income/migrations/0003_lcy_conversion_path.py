@@ -0,0 +1,28 @@
+# Generated by Django 5.0.10 on 2026-10-19 15:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('income', '0002_amount_minor_units'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='earnedincome',
+            name='lcy_conversion_path',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+        migrations.AddField(
+            model_name='passiveincome',
+            name='lcy_conversion_path',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+        migrations.AddField(
+            model_name='portfolioincome',
+            name='lcy_conversion_path',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+    ]
@@ -1,9 +1,24 @@
-from financial_tracker.currencies.models import ExchangeRate
-from django.core.exceptions import ObjectDoesNotExist, ValidationError
 import logging
+from typing import Any
+
+from django.core.exceptions import ValidationError
+
+from financial_tracker.core.metrics import CURRENCY_CONVERSIONS
+from financial_tracker.currencies.cache import get_local_currency_exponent
+from financial_tracker.currencies.fixedpoint import convert
+from financial_tracker.currencies.fixedpoint import from_minor
+from financial_tracker.currencies.fixedpoint import to_minor
+from financial_tracker.currencies.fixedpoint import to_scaled_rate
+from financial_tracker.currencies.models import ExchangeRate
+from financial_tracker.currencies.triangulation import conversion_path
+
 logger = logging.getLogger(__name__)
 
+
 class CurrencyConversionMixin:
+    # Set by convert_minor_to_lcy; a model field on the models using this.
+    lcy_conversion_path: Any
+
     def convert_to_lcy(self, amount, currency):
         """
         Converts the given amount to the local currency using the exchange rate.
@@ -12,15 +27,59 @@ class CurrencyConversionMixin:
         :param currency: Currency object, the foreign currency.
         :return: Decimal, converted amount in local currency.
         """
+        units = self.convert_minor_to_lcy(to_minor(amount, currency.exponent), currency)
+        return from_minor(
+            units,
+            currency.exponent if currency.is_local else get_local_currency_exponent(),
+        )
+
+    def convert_minor_to_lcy(self, units, currency):
+        """
+        Like ``convert_to_lcy``, for an amount in minor units of ``currency``.
+        Without a direct rate, converts through other currencies and records
+        the path taken in ``lcy_conversion_path``, e.g. ``"NGN>USD>KES"``.
+        :return: int, minor units of the local currency, rounded half to even.
+        """
+        self.lcy_conversion_path = ""
         if currency.is_local:
             # If the currency is local, no conversion is needed
-            return amount
-        else:
-            try:
-                exchange_rate = ExchangeRate.objects.get(currency=currency)
-                return amount * exchange_rate.rate
-            except ObjectDoesNotExist:
-                # Log the error and raise a ValidationError
-                logger.error(f"Missing exchange rate for currency {currency}")
-                raise ValidationError({"currency": f"No exchange rate found for currency {currency}"})
-
+            CURRENCY_CONVERSIONS.labels(currency=currency.code, outcome="local").inc()
+            return units
+        # The latest rate, dated or not: one probe of the (currency, created_at) index.
+        # A dated rate counts from the start of its day, or from when it was
+        # last put for today, so it and the ticks supersede each other in time.
+        rate = (
+            ExchangeRate.objects.filter(currency=currency)
+            .order_by("-created_at", "-pk")
+            .values_list("rate", flat=True)
+            .first()
+        )
+        if rate is not None:
+            CURRENCY_CONVERSIONS.labels(
+                currency=currency.code,
+                outcome="converted",
+            ).inc()
+            return convert(
+                units,
+                to_scaled_rate(rate),
+                currency.exponent,
+                get_local_currency_exponent(),
+            )
+        path = conversion_path(currency.code)
+        if path is None:
+            # Log the error and raise a ValidationError
+            CURRENCY_CONVERSIONS.labels(
+                currency=currency.code,
+                outcome="missing_rate",
+            ).inc()
+            logger.error("Missing exchange rate for currency %s", currency)
+            raise ValidationError(
+                {"currency": f"No exchange rate found for currency {currency}"},
+            )
+        codes, rate = path
+        CURRENCY_CONVERSIONS.labels(
+            currency=currency.code,
+            outcome="triangulated",
+        ).inc()
+        self.lcy_conversion_path = ">".join(codes)
+        return convert(units, rate, currency.exponent, get_local_currency_exponent())
@@ -1,20 +1,48 @@
-from django.db import models
-from financial_tracker.currencies.models import Currency, ExchangeRate
 from django.conf import settings
-from django.core.exceptions import ValidationError, ObjectDoesNotExist
+from django.core.exceptions import ValidationError
+from django.db import models
+
+from financial_tracker.currencies.cache import get_local_currency_exponent
+from financial_tracker.currencies.fixedpoint import from_minor
+from financial_tracker.currencies.fixedpoint import to_decimal
+from financial_tracker.currencies.fixedpoint import to_minor
+from financial_tracker.currencies.models import Currency
+
 from .mixins import CurrencyConversionMixin
+
 User = settings.AUTH_USER_MODEL
 
+
 # Create your models here.
 class BaseIncome(models.Model, CurrencyConversionMixin):
     income_name = models.CharField(max_length=100, null=False, blank=False)
-    currency = models.ForeignKey(Currency, on_delete=models.PROTECT, null=False, blank=False)
-    amount = models.DecimalField(max_digits=8, decimal_places=2)
-    amount_lcy = models.DecimalField(max_digits=20, decimal_places=2, default=0.00)
+    currency = models.ForeignKey(
+        Currency,
+        on_delete=models.PROTECT,
+        null=False,
+        blank=False,
+    )
+    # Minor units of ``currency`` and of the local currency; see ``amount``.
+    amount_minor = models.BigIntegerField()
+    amount_lcy_minor = models.BigIntegerField(default=0)
+    # Currencies converted through when there was no direct rate, e.g. "NGN>USD>KES".
+    lcy_conversion_path = models.CharField(max_length=100, blank=True, default="")
     notes = models.TextField(blank=True, null=True)
-    created_by = models.ForeignKey(User, on_delete=models.PROTECT, related_name="%(class)s_created_by", null=True, blank=True)
+    created_by = models.ForeignKey(
+        User,
+        on_delete=models.PROTECT,
+        related_name="%(class)s_created_by",
+        null=True,
+        blank=True,
+    )
     created_at = models.DateTimeField(auto_now_add=True)
-    modified_by = models.ForeignKey(User, on_delete=models.PROTECT, related_name="%(class)s_modified_by", null=True, blank=True)
+    modified_by = models.ForeignKey(
+        User,
+        on_delete=models.PROTECT,
+        related_name="%(class)s_modified_by",
+        null=True,
+        blank=True,
+    )
     modified_at = models.DateTimeField(auto_now=True)
 
     class Meta:
@@ -25,11 +53,57 @@ class BaseIncome(models.Model, CurrencyConversionMixin):
         ]
         # CheckConstraint for non-negative amounts
         constraints = [
-            models.CheckConstraint(check=models.Q(amount__gte=0), name="%(class)s_amount_gte_zero"),
-            models.CheckConstraint(check=models.Q(amount_lcy__gte=0), name="%(class)s_amount_lcy_gte_zero"),
+            models.CheckConstraint(
+                check=models.Q(amount_minor__gte=0),
+                name="%(class)s_amount_gte_zero",
+            ),
+            models.CheckConstraint(
+                check=models.Q(amount_lcy_minor__gte=0),
+                name="%(class)s_amount_lcy_gte_zero",
+            ),
         ]
         ordering = ["-created_at"]
-        get_latest_by = ['-created_at']
+        get_latest_by = ["-created_at"]
+
+    # An amount assigned through ``amount``, until save() stores it in minor units.
+    _amount = None
+    # The currency ``amount_minor`` was stored in; assigning another
+    # ``currency`` leaves the amount as it was until save().
+    _stored_currency_id = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._stored_currency_id = instance.__dict__.get("currency_id")  # noqa: SLF001
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None):  # type: ignore[override]
+        super().refresh_from_db(using, fields)
+        if fields is None:
+            self._amount = None
+            self._stored_currency_id = self.currency_id
+
+    @property
+    def amount(self):
+        """The amount as a ``Decimal`` in units of ``currency``."""
+        if self._amount is not None:
+            return self._amount
+        if self.amount_minor is None:
+            return None
+        if self._stored_currency_id in (None, self.currency_id):
+            return from_minor(self.amount_minor, self.currency.exponent)
+        stored_exponent = Currency.objects.values_list("exponent", flat=True).get(
+            pk=self._stored_currency_id,
+        )
+        return from_minor(self.amount_minor, stored_exponent)
+
+    @amount.setter
+    def amount(self, value):
+        self._amount = None if value is None else to_decimal(value)
+
+    @property
+    def amount_lcy(self):
+        return from_minor(self.amount_lcy_minor, get_local_currency_exponent())
 
     def clean(self):
         super().clean()
@@ -50,15 +124,39 @@ class BaseIncome(models.Model, CurrencyConversionMixin):
         #     raise ValidationError({"currency": f"No exchange rate found for currency {self.currency}"})
 
     def save(self, *args, **kwargs):
-        self.amount_lcy = self.convert_to_lcy(self.amount, self.currency)
+        if self._amount is None and self._stored_currency_id not in (
+            None,
+            self.currency_id,
+        ):
+            # Same amount in another currency: its minor units are recomputed.
+            self._amount = self.amount
+        if self._amount is not None:
+            try:
+                self.amount_minor = to_minor(self._amount, self.currency.exponent)
+            except ValueError as err:
+                raise ValidationError(
+                    {
+                        "amount": f"{self.currency.code} amounts have at most "
+                        f"{self.currency.exponent} decimal places.",
+                    },
+                ) from err
+        self.amount_lcy_minor = self.convert_minor_to_lcy(
+            self.amount_minor,
+            self.currency,
+        )
         self.full_clean()  # Perform validation before saving
         super().save(*args, **kwargs)
+        self._amount = None
+        self._stored_currency_id = self.currency_id
+
 
 class EarnedIncome(BaseIncome):
     # salaries, side hustle, income from services offered, freelancing income
     class Meta(BaseIncome.Meta):
         verbose_name = "Earned Income"
         verbose_name_plural = "Earned Income"
+
+
 class PortfolioIncome(BaseIncome):
     # amount of money that you get from your investment asset
     # income from stocks, dividends, bonds, and capital gains is categorized as portfolio income
@@ -68,7 +166,7 @@ class PortfolioIncome(BaseIncome):
 
 
 class PassiveIncome(BaseIncome):
-     # money that you earn with minimal effort from the resources that you have invested in
+    # money that you earn with minimal effort from the resources that you have invested in
     # examples:music royalties, owner’s equity, interest from savings accounts, and rent from your personal properties
     class Meta(BaseIncome.Meta):
         verbose_name = "Passive Income"
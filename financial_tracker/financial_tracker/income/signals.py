@@ -0,0 +1,20 @@
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+
+from financial_tracker.core.response_cache import bump_version_on_commit
+
+from .models import EarnedIncome
+from .models import PassiveIncome
+from .models import PortfolioIncome
+
+for model in (EarnedIncome, PortfolioIncome, PassiveIncome):
+    post_save.connect(
+        bump_version_on_commit,
+        sender=model,
+        dispatch_uid=f"response-cache:{model._meta.label}:save",  # noqa: SLF001
+    )
+    post_delete.connect(
+        bump_version_on_commit,
+        sender=model,
+        dispatch_uid=f"response-cache:{model._meta.label}:delete",  # noqa: SLF001
+    )
@@ -0,0 +1,280 @@
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.core.exceptions import ValidationError
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from financial_tracker.currencies.models import CrossRate
+from financial_tracker.currencies.models import Currency
+from financial_tracker.currencies.models import ExchangeRate
+from financial_tracker.income.models import EarnedIncome
+from financial_tracker.income.models import PassiveIncome
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def kes(user):
+    return Currency.objects.create(
+        code="KES",
+        description="Kenyan Shilling",
+        is_local=True,
+        created_by=user,
+    )
+
+
+@pytest.fixture
+def jpy(kes, user):
+    currency = Currency.objects.create(
+        code="JPY",
+        description="Yen",
+        is_local=False,
+        exponent=0,
+        created_by=user,
+    )
+    ExchangeRate.objects.create(
+        currency=currency,
+        rate=Decimal("0.86123456"),
+        created_by=user,
+    )
+    return currency
+
+
+@pytest.fixture
+def api_client(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+def test_amounts_stored_in_minor_units(kes, jpy, user):
+    local = EarnedIncome.objects.create(  # type: ignore[misc]
+        income_name="Salary",
+        currency=kes,
+        amount=Decimal("12345678.90"),
+        created_by=user,
+    )
+    foreign = EarnedIncome.objects.create(  # type: ignore[misc]
+        income_name="Bonus",
+        currency=jpy,
+        amount=1000,
+        created_by=user,
+    )
+
+    local.refresh_from_db()
+    foreign.refresh_from_db()
+    assert (local.amount_minor, local.amount_lcy_minor) == (1234567890, 1234567890)
+    assert local.amount == Decimal("12345678.90")
+    # 1000 JPY at 0.86123456 is 861.23456 KES.
+    assert (foreign.amount_minor, foreign.amount_lcy_minor) == (1000, 86123)
+    assert foreign.amount_lcy == Decimal("861.23")
+
+
+def test_api_amount_uses_currency_places(api_client, jpy):
+    url = reverse("api:income:earnedincome-list")
+
+    rejected = api_client.post(
+        url,
+        {"income_name": "Bonus", "currency": "JPY", "amount": "100.5"},
+    )
+    assert rejected.status_code == status.HTTP_400_BAD_REQUEST
+    assert "amount" in rejected.json()
+
+    created = api_client.post(
+        url,
+        {"income_name": "Bonus", "currency": "JPY", "amount": "100"},
+    )
+    assert created.status_code == status.HTTP_201_CREATED
+    assert created.json()["amount"] == "100"
+    assert api_client.get(url).json()[0]["amount"] == "100"
+
+
+def test_currency_change_keeps_amount(api_client, kes, jpy, user):
+    income = EarnedIncome.objects.create(  # type: ignore[misc]
+        income_name="Bonus",
+        currency=jpy,
+        amount=1000,
+        created_by=user,
+    )
+    url = reverse("api:income:earnedincome-detail", kwargs={"pk": income.pk})
+
+    response = api_client.patch(url, {"currency": "KES"})
+    assert response.status_code == status.HTTP_200_OK
+    income.refresh_from_db()
+    # 1000 JPY became 1000 KES, that is 100000 cents, not 10 KES.
+    assert (income.amount, income.amount_minor, income.amount_lcy_minor) == (
+        Decimal("1000"),
+        100000,
+        100000,
+    )
+
+    income.amount = Decimal("10.50")
+    income.save()
+    assert (
+        api_client.patch(url, {"currency": "JPY"}).status_code
+        == status.HTTP_400_BAD_REQUEST
+    )
+
+
+def test_exponent_locked_once_amounts_stored(api_client, kes, jpy, user):
+    usd = Currency.objects.create(
+        code="USD",
+        description="US Dollar",
+        is_local=False,
+        created_by=user,
+    )
+    usd.exponent = 3
+    usd.save()
+    EarnedIncome.objects.create(  # type: ignore[misc]
+        income_name="Bonus",
+        currency=jpy,
+        amount=1000,
+        created_by=user,
+    )
+
+    # Incomes in JPY, and in any currency for the local one, depend on theirs.
+    for currency in (jpy, kes):
+        url = reverse("api:currencies:currency-detail", kwargs={"pk": currency.code})
+        response = api_client.patch(url, {"exponent": 3})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "exponent" in response.json()
+        currency.exponent = 3
+        with pytest.raises(ValidationError):
+            currency.save()
+
+
+def test_total_income_adds_across_exponents(api_client, kes, jpy, user):
+    EarnedIncome.objects.create(  # type: ignore[misc]
+        income_name="Salary",
+        currency=kes,
+        amount=Decimal("10.25"),
+        created_by=user,
+    )
+    PassiveIncome.objects.create(  # type: ignore[misc]
+        income_name="Rent",
+        currency=jpy,
+        amount=5,
+        created_by=user,
+    )
+
+    total = api_client.get(reverse("api:income:totalincome")).json()["total_income"]
+    assert Decimal(str(total)) == Decimal("15.25")
+
+
+def test_ordering_by_amount(api_client, kes, jpy, user):
+    EarnedIncome.objects.create(  # type: ignore[misc]
+        income_name="Small",
+        currency=kes,
+        amount=Decimal("50.00"),
+        created_by=user,
+    )
+    EarnedIncome.objects.create(  # type: ignore[misc]
+        income_name="Large",
+        currency=jpy,
+        amount=100,
+        created_by=user,
+    )
+
+    response = api_client.get(
+        reverse("api:income:earnedincome-list"),
+        {"ordering": "amount"},
+    )
+    assert [income["income_name"] for income in response.json()] == ["Small", "Large"]
+
+
+def test_triangulated_conversion_records_path(kes, user):
+    usd = Currency.objects.create(
+        code="USD",
+        description="US Dollar",
+        is_local=False,
+        created_by=user,
+    )
+    ngn = Currency.objects.create(
+        code="NGN",
+        description="Naira",
+        is_local=False,
+        created_by=user,
+    )
+    ExchangeRate.objects.create(currency=usd, rate=Decimal("129"), created_by=user)
+    CrossRate.objects.create(
+        base=ngn,
+        quote=usd,
+        rate=Decimal("0.000625"),
+        created_by=user,
+    )
+
+    income = EarnedIncome.objects.create(  # type: ignore[misc]
+        income_name="Royalties",
+        currency=ngn,
+        amount=Decimal("10000"),
+        created_by=user,
+    )
+    assert (income.amount_lcy, income.lcy_conversion_path) == (
+        Decimal("806.25"),
+        "NGN>USD>KES",
+    )
+
+    direct = EarnedIncome.objects.create(  # type: ignore[misc]
+        income_name="Salary",
+        currency=usd,
+        amount=Decimal("1"),
+        created_by=user,
+    )
+    assert direct.lcy_conversion_path == ""
+
+
+def test_conversion_uses_latest_of_several_rates(kes, jpy, user):
+    # A dated rate for yesterday and a newer tick: the tick applies.
+    ExchangeRate.objects.create(
+        currency=jpy,
+        rate=Decimal("0.9"),
+        effective_date=timezone.localdate() - timedelta(days=1),
+        created_at=timezone.now() - timedelta(days=1),
+        created_by=user,
+    )
+    ExchangeRate.objects.create(currency=jpy, rate=Decimal("0.95"), created_by=user)
+
+    income = EarnedIncome.objects.create(  # type: ignore[misc]
+        income_name="Bonus",
+        currency=jpy,
+        amount=1000,
+        created_by=user,
+    )
+    assert income.amount_lcy == Decimal("950.00")
+
+
+def test_dated_rate_for_today_supersedes_earlier_ticks(kes, jpy, user):
+    api_client = APIClient()
+    api_client.force_authenticate(user=user)
+    url = reverse(
+        "api:currencies:exchangerate-dated",
+        kwargs={"code": "JPY", "effective_date": timezone.localdate()},
+    )
+    ExchangeRate.objects.create(currency=jpy, rate=Decimal("0.95"), created_by=user)
+
+    for rate, expected in [("0.97", Decimal("970.00")), ("0.96", Decimal("960.00"))]:
+        assert (
+            api_client.put(url, {"rate": rate}, format="json").status_code
+            == status.HTTP_200_OK
+        )
+        income = EarnedIncome.objects.create(  # type: ignore[misc]
+            income_name="Bonus",
+            currency=jpy,
+            amount=1000,
+            created_by=user,
+        )
+        assert income.amount_lcy == expected
+
+    # A later tick supersedes it in turn.
+    ExchangeRate.objects.create(currency=jpy, rate=Decimal("0.98"), created_by=user)
+    income = EarnedIncome.objects.create(  # type: ignore[misc]
+        income_name="Bonus",
+        currency=jpy,
+        amount=1000,
+        created_by=user,
+    )
+    assert income.amount_lcy == Decimal("980.00")
@@ -0,0 +1,68 @@
+import pytest
+from django.core.management import call_command
+from django.db.models import Sum
+
+from financial_tracker.currencies.models import Currency
+from financial_tracker.currencies.models import ExchangeRate
+from financial_tracker.income.models import EarnedIncome
+from financial_tracker.income.models import PassiveIncome
+from financial_tracker.income.models import PortfolioIncome
+
+
+def seed(**options):
+    defaults = {
+        "users": 5,
+        "currencies": 4,
+        "days": 10,
+        "rates_per_day": 2,
+        "incomes": 300,
+        "batch_size": 100,
+        "workers": 1,
+    }
+    call_command("seed_dataset", **{**defaults, **options})
+
+
+@pytest.mark.django_db
+def test_seed_dataset_creates_all_tables():
+    seed()
+
+    assert Currency.objects.filter(is_local=True).count() == 1
+    assert Currency.objects.filter(is_local=False).count() == 4  # noqa: PLR2004
+    assert ExchangeRate.objects.count() == 4 * 11 * 2
+    assert (
+        EarnedIncome.objects.count()
+        + PortfolioIncome.objects.count()
+        + PassiveIncome.objects.count()
+        == 300  # noqa: PLR2004
+    )
+    # Local-currency income is stored at face value.
+    local_income = EarnedIncome.objects.filter(currency__is_local=True)
+    totals = local_income.aggregate(
+        amount=Sum("amount_minor"),
+        amount_lcy=Sum("amount_lcy_minor"),
+    )
+    assert totals["amount"] == totals["amount_lcy"]
+
+
+@pytest.mark.django_db
+def test_seed_dataset_is_reproducible():
+    seed(seed=7)
+    first = list(
+        EarnedIncome.objects.order_by("pk").values_list(
+            "income_name",
+            "currency",
+            "amount_minor",
+        ),
+    )
+    EarnedIncome.objects.all().delete()
+
+    seed(seed=7)
+    second = list(
+        EarnedIncome.objects.order_by("pk").values_list(
+            "income_name",
+            "currency",
+            "amount_minor",
+        ),
+    )
+    assert first
+    assert first == second
@@ -49,7 +49,7 @@ class BaseIncomeModelTests(TestCase):
 
     def test_valid_income_creation(self):
         # Create a valid EarnedIncome instance
-        income = EarnedIncome.objects.create(
+        income = EarnedIncome.objects.create(  # type: ignore[misc]
             income_name="Salary",
             currency=self.currency,
             amount=500,
@@ -59,7 +59,7 @@ class BaseIncomeModelTests(TestCase):
 
     def test_negative_amount_validation(self):
         with self.assertRaises(ValidationError):
-            income = EarnedIncome(
+            income = EarnedIncome(  # type: ignore[misc]
                 income_name="Invalid Income",
                 currency=self.currency,
                 amount=-100,
@@ -69,7 +69,7 @@ class BaseIncomeModelTests(TestCase):
 
     def test_missing_currency_validation(self):
         with self.assertRaises(ValidationError):
-            income = EarnedIncome(
+            income = EarnedIncome(  # type: ignore[misc]
                 income_name="No Currency Income",
                 amount=500,
                 created_by=self.user
@@ -80,7 +80,7 @@ class BaseIncomeModelTests(TestCase):
         # Create a currency without an exchange rate
         new_currency = Currency.objects.create(code="EUR", name="Euro")
         with self.assertRaises(ValidationError):
-            income = EarnedIncome(
+            income = EarnedIncome(  # type: ignore[misc]
                 income_name="No Exchange Rate",
                 currency=new_currency,
                 amount=500,
@@ -91,7 +91,7 @@ class BaseIncomeModelTests(TestCase):
     def test_amount_constraint(self):
         # Test that CheckConstraint prevents negative amounts
         with self.assertRaises(ValidationError):
-            income = EarnedIncome(
+            income = EarnedIncome(  # type: ignore[misc]
                 income_name="Negative Amount",
                 currency=self.currency,
                 amount=-500,
@@ -102,13 +102,13 @@ class BaseIncomeModelTests(TestCase):
     def test_amount_lcy_constraint(self):
         # Test that CheckConstraint prevents negative amount_lcy
         with self.assertRaises(ValidationError):
-            income = EarnedIncome(
+            income = EarnedIncome(  # type: ignore[misc]
                 income_name="Negative LCY",
                 currency=self.currency,
                 amount=500,
                 created_by=self.user
             )
-            income.amount_lcy = -100
+            income.amount_lcy = -100  # type: ignore[misc]
             income.full_clean()
 class ConcreteIncomeModelTests(TestCase):
     @classmethod
@@ -118,7 +118,7 @@ class ConcreteIncomeModelTests(TestCase):
         cls.exchange_rate = ExchangeRate.objects.create(currency=cls.currency, rate=100.00)
 
     def test_earned_income_creation(self):
-        income = EarnedIncome.objects.create(
+        income = EarnedIncome.objects.create(  # type: ignore[misc]
             income_name="Freelance Work",
             currency=self.currency,
             amount=200,
@@ -129,7 +129,7 @@ class ConcreteIncomeModelTests(TestCase):
         self.assertEqual(income._meta.verbose_name_plural, "Earned Income")
 
     def test_portfolio_income_creation(self):
-        income = PortfolioIncome.objects.create(
+        income = PortfolioIncome.objects.create(  # type: ignore[misc]
             income_name="Stock Dividends",
             currency=self.currency,
             amount=300,
@@ -140,7 +140,7 @@ class ConcreteIncomeModelTests(TestCase):
         self.assertEqual(income._meta.verbose_name_plural, "Portfolio Income")
 
     def test_passive_income_creation(self):
-        income = PassiveIncome.objects.create(
+        income = PassiveIncome.objects.create(  # type: ignore[misc]
             income_name="Rental Income",
             currency=self.currency,
             amount=400,
@@ -0,0 +1,53 @@
+"""Gunicorn configuration for production.
+
+The app is loaded and warmed up once in the master and then forked, so workers
+share its memory copy-on-write. The cyclic garbage collector would dirty those
+shared pages by touching every object's header, so it is held off while the app
+loads and everything allocated by then is frozen out of its reach.
+
+Settings can be overridden with environment variables:
+
+    WEB_CONCURRENCY         number of workers (default: 2 per CPU + 1)
+    GUNICORN_WORKER_CLASS   default: "sync", or "gthread", serving config.wsgi;
+                            uvicorn_worker.UvicornWorker serves config.asgi
+    GUNICORN_THREADS        threads per worker for the gthread worker class
+"""
+
+import gc
+import multiprocessing
+import os
+import shutil
+from pathlib import Path
+
+gc.disable()
+
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "sync")
+wsgi_app = (
+    "config.asgi:application"
+    if "uvicorn" in worker_class.lower()
+    else "config.wsgi:application"
+)
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get("GUNICORN_THREADS", "1"))
+preload_app = True
+
+# Shared store for Prometheus metrics. It is read when the app is imported, so
+# it has to be set up here rather than in a server hook, and must start empty.
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/prometheus")  # noqa: S108
+shutil.rmtree(os.environ["PROMETHEUS_MULTIPROC_DIR"], ignore_errors=True)
+Path(os.environ["PROMETHEUS_MULTIPROC_DIR"]).mkdir(parents=True)
+
+
+def when_ready(server):
+    from financial_tracker.core.warmup import warm_up
+
+    warm_up()
+    gc.freeze()
+    gc.enable()
+    server.log.info("Froze %d objects before forking workers", gc.get_freeze_count())
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,384 @@
+"""HTTP load generator for the Financial Tracker API.
+
+Drives a running server with a configurable read/write mix over the real URL
+set and reports throughput and p50/p95/p99 latency per endpoint. It only uses
+the standard library: each virtual user is an asyncio task holding one
+keep-alive HTTP/1.1 connection.
+
+    $ python loadtest.py --base-url http://127.0.0.1:8000 \\
+        --username loadtest --password secret \\
+        --users 50 --duration 60 --write-ratio 0.1 --json loadtest.json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from dataclasses import field
+from urllib.parse import urlsplit
+
+READS = [
+    # Label, relative weight and path of each read.
+    ("currency-list", 10, "/api/currencies/currencies/"),
+    ("exchangerate-list", 8, "/api/currencies/exchangerates/"),
+    (
+        "exchangerate-list?currency",
+        6,
+        "/api/currencies/exchangerates/?currency={foreign}",
+    ),
+    ("get-localcurrency", 12, "/api/currencies/get-localcurrency/"),
+    ("earnedincome-list", 10, "/api/income/earnedincome/"),
+    ("portfolioincome-list", 6, "/api/income/portfolioincome/"),
+    ("passiveincome-list", 4, "/api/income/passiveincome/"),
+    ("totalincome", 10, "/api/income/totalincome/"),
+]
+WRITES = [
+    ("earnedincome-create", 6, "/api/income/earnedincome/"),
+    ("portfolioincome-create", 2, "/api/income/portfolioincome/"),
+    ("passiveincome-create", 2, "/api/income/passiveincome/"),
+    ("exchangerate-create", 3, "/api/currencies/exchangerates/"),
+    ("auth-token", 1, "/api/auth-token/"),
+]
+
+
+class ConnectionClosedError(Exception):
+    pass
+
+
+@dataclass
+class Response:
+    status: int
+    headers: dict[str, str]
+    body: bytes
+
+    def json(self):
+        return json.loads(self.body)
+
+
+class Connection:
+    """A single keep-alive HTTP/1.1 connection."""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.reader: asyncio.StreamReader | None = None
+        self.writer: asyncio.StreamWriter | None = None
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.reader = self.writer = None
+
+    async def request(self, method, path, headers=None, body=b"") -> Response:
+        # A server may drop an idle keep-alive connection (gunicorn's sync
+        # workers close after every response), so retry once on a fresh one.
+        reused = self.writer is not None
+        if not reused:
+            self.reader, self.writer = await asyncio.open_connection(
+                self.host,
+                self.port,
+            )
+        try:
+            return await self._send(method, path, headers or {}, body)
+        except (ConnectionClosedError, ConnectionError):
+            await self.close()
+            if not reused:
+                raise
+        return await self.request(method, path, headers, body)
+
+    async def _send(self, method, path, headers, body):
+        reader, writer = self.reader, self.writer
+        if reader is None or writer is None:
+            raise ConnectionClosedError
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {self.host}:{self.port}"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        lines.append(f"Content-Length: {len(body)}")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode() + body)
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionClosedError
+        status = int(status_line.split()[1])
+        response_headers = {}
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+
+        if response_headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while size := int((await reader.readline()).split(b";")[0], 16):
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+            await reader.readline()
+            content = b"".join(chunks)
+        elif "content-length" in response_headers:
+            content = await reader.readexactly(
+                int(response_headers["content-length"]),
+            )
+        else:
+            content = await reader.read()
+            await self.close()
+        if response_headers.get("connection", "").lower() == "close":
+            await self.close()
+        return Response(status, response_headers, content)
+
+
+@dataclass
+class Stats:
+    latencies: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    errors: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+    def record(self, label: str, seconds: float, *, ok: bool):
+        self.latencies[label].append(seconds)
+        if not ok:
+            self.errors[label] += 1
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Linearly interpolated percentile of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (
+        position - lower
+    )
+
+
+def summarize(stats: Stats, elapsed: float) -> dict:
+    endpoints = {}
+    for label, samples in sorted(stats.latencies.items()):
+        values = sorted(samples)
+        endpoints[label] = {
+            "requests": len(values),
+            "errors": stats.errors.get(label, 0),
+            "rps": len(values) / elapsed,
+            "p50_ms": percentile(values, 0.50) * 1000,
+            "p95_ms": percentile(values, 0.95) * 1000,
+            "p99_ms": percentile(values, 0.99) * 1000,
+            "max_ms": values[-1] * 1000,
+        }
+    total = sum(endpoint["requests"] for endpoint in endpoints.values())
+    return {
+        "elapsed_s": elapsed,
+        "requests": total,
+        "errors": sum(endpoint["errors"] for endpoint in endpoints.values()),
+        "rps": total / elapsed if elapsed else 0.0,
+        "endpoints": endpoints,
+    }
+
+
+def format_report(summary: dict) -> str:
+    header = (
+        f"{'endpoint':<28}{'reqs':>8}{'errs':>7}{'rps':>9}"
+        f"{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}"
+    )
+    rows = [header, "-" * len(header)]
+    for label, endpoint in summary["endpoints"].items():
+        rows.append(
+            f"{label:<28}{endpoint['requests']:>8}{endpoint['errors']:>7}"
+            f"{endpoint['rps']:>9.1f}"
+            f"{endpoint['p50_ms']:>9.1f}{endpoint['p95_ms']:>9.1f}"
+            f"{endpoint['p99_ms']:>9.1f}{endpoint['max_ms']:>9.1f}",
+        )
+    rows.append("-" * len(header))
+    rows.append(
+        f"{summary['requests']} requests, {summary['errors']} errors "
+        f"in {summary['elapsed_s']:.1f}s "
+        f"({summary['rps']:.1f} req/s); latencies in ms",
+    )
+    return "\n".join(rows)
+
+
+class Scenario:
+    """Chooses the next request for a virtual user."""
+
+    def __init__(
+        self,
+        rng,
+        write_ratio,
+        credentials,
+        local_currency,
+        foreign_currencies,
+    ):
+        self.rng = rng
+        self.write_ratio = write_ratio
+        self.credentials = credentials
+        self.local = local_currency
+        self.foreign = foreign_currencies
+        self.reads = [
+            op for op in READS if foreign_currencies or "{foreign}" not in op[2]
+        ]
+        self.writes = [
+            op
+            for op in WRITES
+            if (foreign_currencies or op[0] != "exchangerate-create")
+            and (credentials or op[0] != "auth-token")
+        ]
+
+    def next_request(self):
+        operations = self.writes if self.rng.random() < self.write_ratio else self.reads
+        label, _, path = self.rng.choices(operations, [op[1] for op in operations])[0]
+        if "{foreign}" in path:
+            path = path.format(foreign=self.rng.choice(self.foreign))
+        if label.endswith("income-create"):
+            return (
+                label,
+                "POST",
+                path,
+                {
+                    "income_name": "Load test",
+                    # Local currency avoids depending on exchange rates being present.
+                    "currency": self.local,
+                    "amount": f"{self.rng.uniform(1, 5000):.2f}",
+                },
+            )
+        if label == "exchangerate-create":
+            return (
+                label,
+                "POST",
+                path,
+                {
+                    "currency": self.rng.choice(self.foreign),
+                    "rate": f"{self.rng.uniform(1, 200):.2f}",
+                },
+            )
+        if label == "auth-token":
+            return label, "POST", path, self.credentials
+        return label, "GET", path, None
+
+
+async def obtain_token(connection, username, password):
+    body = json.dumps({"username": username, "password": password}).encode()
+    response = await connection.request(
+        "POST",
+        "/api/auth-token/",
+        {"Content-Type": "application/json"},
+        body,
+    )
+    if response.status != 200:  # noqa: PLR2004
+        sys.exit(
+            f"Could not obtain a token: HTTP {response.status} {response.body[:200]!r}",
+        )
+    return response.json()["token"]
+
+
+async def virtual_user(host, port, token, scenario, stats, deadline):  # noqa: PLR0913
+    connection = Connection(host, port)
+    headers = {"Authorization": f"Token {token}", "Accept": "application/json"}
+    try:
+        while time.monotonic() < deadline:
+            label, method, path, payload = scenario.next_request()
+            request_headers = dict(headers)
+            body = b""
+            if payload is not None:
+                body = json.dumps(payload).encode()
+                request_headers["Content-Type"] = "application/json"
+            start = time.perf_counter()
+            try:
+                response = await connection.request(method, path, request_headers, body)
+                ok = response.status < 400  # noqa: PLR2004
+            except (
+                OSError,
+                ConnectionClosedError,
+                asyncio.IncompleteReadError,
+                ValueError,
+            ):
+                ok = False
+            stats.record(label, time.perf_counter() - start, ok=ok)
+    finally:
+        await connection.close()
+
+
+async def run(args) -> dict:
+    url = urlsplit(args.base_url)
+    host, port = url.hostname, url.port or 80
+    setup = Connection(host, port)
+    token = args.token or await obtain_token(setup, args.username, args.password)
+    auth = {"Authorization": f"Token {token}", "Accept": "application/json"}
+    local = (
+        await setup.request("GET", "/api/currencies/get-localcurrency/", auth)
+    ).json()
+    currencies = (
+        await setup.request("GET", "/api/currencies/currencies/", auth)
+    ).json()
+    await setup.close()
+    if "local_currency_code" not in local:
+        sys.exit("The server has no local currency; create one before load testing.")
+    foreign = [currency["code"] for currency in currencies if not currency["is_local"]]
+
+    stats = Stats()
+    started = time.monotonic()
+    deadline = started + args.duration
+    await asyncio.gather(
+        *(
+            virtual_user(
+                host,
+                port,
+                token,
+                Scenario(
+                    random.Random(args.seed + number),  # noqa: S311
+                    args.write_ratio,
+                    {"username": args.username, "password": args.password}
+                    if args.username
+                    else None,
+                    local["local_currency_code"],
+                    foreign,
+                ),
+                stats,
+                deadline,
+            )
+            for number in range(args.users)
+        ),
+    )
+    return summarize(stats, time.monotonic() - started)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--username", default="")
+    parser.add_argument("--password", default="")
+    parser.add_argument(
+        "--token",
+        default="",
+        help="Use an existing DRF token instead of logging in.",
+    )
+    parser.add_argument(
+        "--users",
+        type=int,
+        default=20,
+        help="Concurrent virtual users.",
+    )
+    parser.add_argument("--duration", type=float, default=30, help="Seconds to run.")
+    parser.add_argument(
+        "--write-ratio",
+        type=float,
+        default=0.1,
+        help="Share of requests that write.",
+    )
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--json",
+        dest="json_path",
+        help="Also write the summary to this file.",
+    )
+    args = parser.parse_args(argv)
+    if not args.token and not (args.username and args.password):
+        parser.error("either --token or --username and --password are required")
+    return args
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    result = asyncio.run(run(arguments))
+    print(format_report(result))  # noqa: T201
+    if arguments.json_path:
+        with open(arguments.json_path, "w") as output:  # noqa: PTH123
+            json.dump(result, output, indent=2)
@@ -0,0 +1,126 @@
+import asyncio
+import random
+
+import pytest
+
+from loadtest import READS
+from loadtest import Connection
+from loadtest import Scenario
+from loadtest import Stats
+from loadtest import format_report
+from loadtest import parse_args
+from loadtest import percentile
+from loadtest import summarize
+
+
+@pytest.mark.parametrize(
+    ("values", "q", "expected"),
+    [
+        ([], 0.5, 0.0),
+        ([3.0], 0.99, 3.0),
+        ([1.0, 2.0, 3.0, 4.0], 0.5, 2.5),
+        ([1.0, 2.0, 3.0, 4.0, 5.0], 0.95, 4.8),
+        ([1.0, 2.0], 1.0, 2.0),
+    ],
+)
+def test_percentile(values: list[float], q: float, expected: float):
+    assert percentile(values, q) == pytest.approx(expected)
+
+
+def test_summarize_and_report():
+    stats = Stats()
+    for value in [0.010, 0.020, 0.030, 0.040]:
+        stats.record("currency-list", value, ok=True)
+    stats.record("totalincome", 0.5, ok=False)
+
+    summary = summarize(stats, elapsed=2.0)
+
+    assert summary["requests"] == 5  # noqa: PLR2004
+    assert summary["errors"] == 1
+    assert summary["rps"] == 2.5  # noqa: PLR2004
+    assert summary["endpoints"]["currency-list"]["p50_ms"] == pytest.approx(25.0)
+    assert summary["endpoints"]["totalincome"]["errors"] == 1
+    report = format_report(summary)
+    assert "currency-list" in report
+    assert "5 requests, 1 errors in 2.0s" in report
+
+
+def test_scenario_without_foreign_currencies_or_credentials():
+    scenario = Scenario(random.Random(1), 0.5, None, "KES", [])  # noqa: S311
+
+    requests = [scenario.next_request() for _ in range(500)]
+
+    labels = {label for label, *_ in requests}
+    assert "exchangerate-create" not in labels
+    assert "auth-token" not in labels
+    assert "exchangerate-list?currency" not in labels
+    assert {"earnedincome-create", "currency-list"} <= labels
+    assert len(scenario.reads) == len(READS) - 1
+
+
+def test_scenario_write_ratio():
+    scenario = Scenario(random.Random(1), 0.0, None, "KES", ["USD"])  # noqa: S311
+
+    assert all(
+        method == "GET"
+        for _, method, _, _ in (scenario.next_request() for _ in range(200))
+    )
+
+
+def test_parse_args_requires_credentials():
+    with pytest.raises(SystemExit):
+        parse_args([])
+    assert parse_args(["--token", "abc"]).token == "abc"  # noqa: S105
+
+
+async def serve(responses):
+    """Start a server answering each request with the next canned response."""
+    pending = list(responses)
+
+    async def handle(reader, writer):
+        while pending:
+            request = await reader.readuntil(b"\r\n\r\n")
+            length = next(
+                (
+                    int(line.split(b":")[1])
+                    for line in request.split(b"\r\n")
+                    if line.lower().startswith(b"content-length")
+                ),
+                0,
+            )
+            await reader.readexactly(length)
+            writer.write(pending.pop(0))
+            await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return server, server.sockets[0].getsockname()[1]
+
+
+def test_connection_reads_content_length_and_chunked_bodies():
+    async def scenario():
+        server, port = await serve(
+            [
+                b'HTTP/1.1 200 OK\r\nContent-Length: 12\r\n\r\n{"ok": true}',
+                b"HTTP/1.1 201 Created\r\nTransfer-Encoding: chunked\r\n\r\n"
+                b"3\r\nabc\r\n2\r\nde\r\n0\r\n\r\n",
+            ],
+        )
+        async with server:
+            connection = Connection("127.0.0.1", port)
+            first = await connection.request("GET", "/")
+            second = await connection.request(
+                "POST",
+                "/",
+                {"Content-Type": "application/json"},
+                b"{}",
+            )
+            await connection.close()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert first.status == 200  # noqa: PLR2004
+    assert first.json() == {"ok": True}
+    assert second.status == 201  # noqa: PLR2004
+    assert second.body == b"abcde"